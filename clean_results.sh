@@ -31,6 +31,12 @@ clean_directory "walk_forward_results" "Walk Forward Results"
 # Clean plot files
 clean_directory "user_data/plot" "Plot Files"
 
+# Clean hyperopt result cache
+clean_directory "user_data/hyperopt_cache" "Hyperopt Cache"
+
+# Clean parallel walk workspaces
+clean_directory "user_data/walk_forward_workspaces" "Parallel Walk Workspaces"
+
 echo ""
 echo "🎉 All results directories have been cleaned!"
 echo ""
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+CPU Budget Scheduler
+Shares the machine's cores between the freqtrade jobs of every walk and experiment running at once.
+
+Hyperopt is started with `-j -1`, which claims every core, so N parallel walks or experiments
+each start one hyperopt worker per core and thrash the machine. Every freqtrade job instead
+registers in a ledger file shared by all processes on the machine:
+
+- a hyperopt gets a core allotment and its `-j` is rewritten to match
+- backtests, plots and other single core jobs take one core and start right away, alongside hyperopts
+- orchestrators declare how many jobs they run concurrently (declare_slots); a hyperopt gets its
+  fair share of the cores when it starts
+
+An allotment is fixed for the life of the hyperopt: freqtrade cannot change the worker count of
+a running hyperopt, so cores freed by finished jobs go to the hyperopts that start afterwards.
+
+The budget defaults to the cores this process may run on and can be set with the
+FREQTRADE_CPU_BUDGET environment variable (0 disables scheduling).
+"""
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # No flock on this platform; jobs keep the -j they were given
+    fcntl = None
+
+DEFAULT_LEDGER_DIR = "user_data/cpu_budget"
+BUDGET_ENV = "FREQTRADE_CPU_BUDGET"
+POLL_SECONDS = 2.0
+
+MULTI_CORE_COMMANDS = ("hyperopt",)
+JOB_WORKER_FLAGS = ("-j", "--job-workers")
+
+
+def available_cores():
+    """Cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def budget_from_env():
+    """Core budget from FREQTRADE_CPU_BUDGET, or every available core"""
+    value = os.environ.get(BUDGET_ENV, "").strip()
+    if value:
+        try:
+            return max(0, int(value))
+        except ValueError:
+            print(f"⚠️ Ignoring invalid {BUDGET_ENV}={value!r}")
+    return available_cores()
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def with_job_workers(args, cores):
+    """Freqtrade arguments with -j/--job-workers set to cores"""
+    args = list(args)
+    for i, arg in enumerate(args[:-1]):
+        if arg in JOB_WORKER_FLAGS:
+            args[i + 1] = str(cores)
+            return args
+    return args + ["-j", str(cores)]
+
+
+class CpuBudget:
+    def __init__(self, ledger_dir=DEFAULT_LEDGER_DIR, total_cores=None, poll_seconds=POLL_SECONDS):
+        self.ledger_dir = Path(ledger_dir)
+        self.total_cores = budget_from_env() if total_cores is None else total_cores
+        self.poll_seconds = poll_seconds
+
+    @property
+    def enabled(self):
+        return fcntl is not None and self.total_cores > 0
+
+    @contextmanager
+    def _ledger(self):
+        """Exclusive access to the ledger; yields its state and saves it on exit"""
+        self.ledger_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.ledger_dir / "ledger.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                ledger_file = self.ledger_dir / "ledger.json"
+                try:
+                    with open(ledger_file, 'r') as f:
+                        state = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    state = {}
+                state.setdefault('jobs', {})
+                state.setdefault('slots', {})
+
+                # Jobs and orchestrators of processes that died without cleaning up free their cores
+                state['jobs'] = {job_id: job for job_id, job in state['jobs'].items() if pid_alive(job['pid'])}
+                state['slots'] = {pid: slots for pid, slots in state['slots'].items() if pid_alive(int(pid))}
+
+                yield state
+
+                tmp_file = ledger_file.with_name(f".{ledger_file.name}.tmp")
+                with open(tmp_file, 'w') as f:
+                    json.dump(state, f)
+                os.replace(tmp_file, ledger_file)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def declare_slots(self, slots):
+        """Declare how many jobs this orchestrator runs concurrently right now (0 when done)"""
+        if not self.enabled:
+            return
+        with self._ledger() as state:
+            if slots > 0:
+                state['slots'][str(os.getpid())] = int(slots)
+            else:
+                state['slots'].pop(str(os.getpid()), None)
+
+    def has_jobs(self, pid):
+        """Whether a process runs freqtrade jobs that got their cores"""
+        if not self.enabled:
+            return False
+        with self._ledger() as state:
+            return any(job['pid'] == pid for job in state['jobs'].values())
+
+    def hyperopt_allotment(self, state):
+        """Cores for a hyperopt starting now, or None when it should wait for running jobs to finish"""
+        jobs = state['jobs'].values()
+        free = self.total_cores - sum(job['cores'] for job in jobs)
+        hyperopts = sum(1 for job in jobs if job['command'] in MULTI_CORE_COMMANDS)
+
+        # Without a declared orchestrator the running hyperopts plus this one share the machine
+        slots = max(sum(state['slots'].values()), hyperopts + 1)
+        fair_share = max(1, self.total_cores // slots)
+        # Keep a fair share back for every slot that may start a hyperopt later
+        idle_slots = slots - hyperopts - 1
+        cores = min(free, max(fair_share, free - idle_slots * fair_share))
+
+        if cores >= fair_share or (hyperopts == 0 and cores >= 1):
+            return cores
+        return None
+
+    @contextmanager
+    def job(self, args):
+        """
+        Run a freqtrade job within the budget. Yields the arguments to run it with: hyperopts
+        wait for their allotment and get -j rewritten, all other commands take one core.
+        """
+        args = [str(arg) for arg in args]
+        if not self.enabled or not args:
+            yield args
+            return
+
+        command = args[0]
+        job_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        waiting_since = None
+        while True:
+            with self._ledger() as state:
+                cores = self.hyperopt_allotment(state) if command in MULTI_CORE_COMMANDS else 1
+                if cores is not None:
+                    state['jobs'][job_id] = {'pid': os.getpid(), 'command': command, 'cores': cores}
+                    break
+            if waiting_since is None:
+                waiting_since = time.time()
+                print(f"⏳ Waiting for free cores to start {command} ({self.total_cores} core budget)")
+            time.sleep(self.poll_seconds)
+
+        if command in MULTI_CORE_COMMANDS:
+            args = with_job_workers(args, cores)
+            waited = f" after waiting {time.time() - waiting_since:.0f}s" if waiting_since else ""
+            print(f"🧮 {command} runs with {cores}/{self.total_cores} cores{waited}")
+        try:
+            yield args
+        finally:
+            with self._ledger() as state:
+                state['jobs'].pop(job_id, None)
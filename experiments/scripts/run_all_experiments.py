@@ -6,15 +6,33 @@ Replaces the bash run_all_experiments.sh for better control and reliability.
 
 import os
 import sys
+import shutil
 import subprocess
 import csv
 import re
 import argparse
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# The runner backends live at the repository root next to walk_forward_test.py
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from cpu_budget import CpuBudget
+from freqtrade_runner import RUNNER_BACKENDS
+
 # Configuration
 CONFIG_FILE = "experiments/experiments.conf"
 SUMMARY_CSV = "experiments/outputs/summary.csv"
+# Per-experiment freqtrade user data directories (only used with --workers > 1)
+WORKSPACE_ROOT = "user_data/experiment_workspaces"
+
+# Experiments finish in any order with --workers, so rows are appended one experiment at a time
+summary_lock = threading.Lock()
+
+# Seconds an experiment may run, counted from its first freqtrade job that got cores
+EXPERIMENT_TIMEOUT = 3600
 
 def create_summary_csv_if_needed():
     """Create summary.csv with headers if it doesn't exist"""
@@ -52,7 +70,32 @@ def parse_experiment_line(line):
         'loss_function': parts[8]
     }
 
-def run_experiment(experiment, verbose=False):
+def run_with_timeout(cmd, capture_output=True):
+    """
+    subprocess.run for an experiment script, with EXPERIMENT_TIMEOUT starting once one of its
+    freqtrade jobs got cores, so time spent queued in the CPU budget behind other experiments
+    does not count against it
+    """
+    cpu_budget = CpuBudget()
+    pipe = subprocess.PIPE if capture_output else None
+    with subprocess.Popen(cmd, stdout=pipe, stderr=pipe, text=True) as process:
+        started = None if cpu_budget.enabled else time.time()
+        try:
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=cpu_budget.poll_seconds)
+                    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+                except subprocess.TimeoutExpired:
+                    pass
+                if started is None and cpu_budget.has_jobs(process.pid):
+                    started = time.time()
+                if started is not None and time.time() - started > EXPERIMENT_TIMEOUT:
+                    raise subprocess.TimeoutExpired(cmd, EXPERIMENT_TIMEOUT)
+        except BaseException:
+            process.kill()
+            raise
+
+def run_experiment(experiment, verbose=False, runner="docker", use_cache=True, workspace=None):
     """Run a single experiment and return CSV output"""
     strategy = experiment['strategy']
     pair = experiment['pair']
@@ -78,13 +121,15 @@ def run_experiment(experiment, verbose=False):
         if verbose:
             cmd.append("--verbose")
         
+        cmd.extend(["--runner", runner])
+        if not use_cache:
+            cmd.append("--no-cache")
+        if workspace:
+            cmd.extend(["--workspace", str(workspace)])
+        
         if verbose:
             # In verbose mode, don't capture output so commands are visible
-            result = subprocess.run(
-                cmd,
-                text=True,
-                timeout=3600  # 1 hour timeout
-            )
+            result = run_with_timeout(cmd, capture_output=False)
             # For verbose mode, we need to find the latest experiment directory and get CSV
             exp_index = experiment['index']
             strategy_base = Path(f"experiments/outputs/{exp_index}.{experiment['strategy']}")
@@ -109,12 +154,7 @@ def run_experiment(experiment, verbose=False):
                 csv_output = ""
         else:
             # Normal mode - capture output as before
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=3600  # 1 hour timeout
-            )
+            result = run_with_timeout(cmd)
             csv_output = result.stdout
         
         # Extract CSV lines from output
@@ -140,7 +180,7 @@ def run_experiment(experiment, verbose=False):
             return []
             
     except subprocess.TimeoutExpired:
-        print(f"❌ Failed: {strategy} (timeout after 1 hour)")
+        print(f"❌ Failed: {strategy} (timeout after {EXPERIMENT_TIMEOUT // 60} minutes of running)")
         return []
     except Exception as e:
         print(f"❌ Failed: {strategy} (error: {e})")
@@ -151,9 +191,9 @@ def append_csv_rows(csv_lines):
     if not csv_lines:
         return
     
-    with open(SUMMARY_CSV, 'a', newline='') as f:
-        for line in csv_lines:
-            f.write(line + '\n')
+    with summary_lock:
+        with open(SUMMARY_CSV, 'a', newline='') as f:
+            f.write(''.join(line + '\n' for line in csv_lines))
 
 def main():
     """Main orchestrator function"""
@@ -161,7 +201,14 @@ def main():
     parser = argparse.ArgumentParser(description="Run all freqtrade experiments")
     parser.add_argument("--verbose", action="store_true", 
                         help="Print full commands for hyperopt and backtest calls")
+    parser.add_argument("--runner", choices=RUNNER_BACKENDS, default="docker",
+                        help="How freqtrade is executed by each experiment (default: docker)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always run hyperopt instead of reusing cached results for identical experiments")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of experiments to run concurrently, each in its own freqtrade user data directory (default: 1)")
     args = parser.parse_args()
+    workers = max(1, args.workers)
     
     print("🚀 Starting Python experiment orchestrator...")
     if args.verbose:
@@ -188,24 +235,56 @@ def main():
     
     print(f"Found {len(experiments)} experiments to run")
     
+    # Add experiment index to experiment data
+    for i, experiment in enumerate(experiments, 1):
+        experiment['index'] = i
+    
     # Process each experiment
     successful = 0
     failed = 0
     
-    for i, experiment in enumerate(experiments, 1):
-        print(f"\n--- Processing experiment {i}/{len(experiments)} ---")
-        
-        # Add experiment index to experiment data
-        experiment['index'] = i
-        csv_lines = run_experiment(experiment, verbose=args.verbose)
+    if workers > 1:
+        workspace_root = Path(WORKSPACE_ROOT) / datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        print(f"Running up to {workers} experiments in parallel (workspaces in {workspace_root})")
         
-        if csv_lines:
+        def run_in_workspace(experiment):
+            workspace = workspace_root / f"exp_{experiment['index']}"
+            csv_lines = run_experiment(experiment, verbose=args.verbose, runner=args.runner,
+                                       use_cache=not args.no_cache, workspace=workspace)
+            # Rows land in summary.csv as soon as the experiment is done, not when the whole batch is
             append_csv_rows(csv_lines)
-            successful += 1
-        else:
-            failed += 1
+            return csv_lines
+        
+        # Hyperopts of concurrent experiments split the CPU budget; ones started when fewer are left get more
+        cpu_budget = CpuBudget()
+        cpu_budget.declare_slots(min(workers, len(experiments)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_in_workspace, experiment): experiment for experiment in experiments}
+            for future in as_completed(futures):
+                experiment = futures[future]
+                print(f"--- Finished experiment {experiment['index']}/{len(experiments)} ---")
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
+                cpu_budget.declare_slots(min(workers, len(experiments) - successful - failed))
+        cpu_budget.declare_slots(0)
         
-        print("---")
+        # Finished experiments remove their own workspace; this drops what timed out experiments left behind
+        shutil.rmtree(workspace_root, ignore_errors=True)
+    else:
+        for experiment in experiments:
+            print(f"\n--- Processing experiment {experiment['index']}/{len(experiments)} ---")
+            
+            csv_lines = run_experiment(experiment, verbose=args.verbose, runner=args.runner, use_cache=not args.no_cache)
+            
+            if csv_lines:
+                append_csv_rows(csv_lines)
+                successful += 1
+            else:
+                failed += 1
+            
+            print("---")
     
     # Summary
     print(f"\n🎉 Orchestrator completed!")
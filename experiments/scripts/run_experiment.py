@@ -1,11 +1,32 @@
 import os
 import sys
+import shutil
 import subprocess
 import datetime
 import argparse
+import json
 from pathlib import Path
 
-def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_length, epochs, spaces, loss_function="SharpeHyperOptLoss", exp_index=1, verbose=False):
+# The runner backends live at the repository root next to walk_forward_test.py
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from freqtrade_runner import RUNNER_BACKENDS, create_runner
+from hyperopt_cache import HyperoptCache
+# Same data directory resolution as isolated walk forward workspaces
+from walk_forward_test import get_data_dir
+
+CONFIG_FILE = "user_data/config.json"
+
+def prepare_workspace(workspace):
+    """Create an isolated freqtrade user data directory for an experiment running in parallel"""
+    workspace = Path(workspace)
+    for subdir in ["backtest_results", "hyperopt_results", "plot"]:
+        (workspace / subdir).mkdir(parents=True, exist_ok=True)
+
+    # Hyperopt writes <strategy>.json next to the strategy file, so every experiment needs its own copy
+    shutil.copytree("user_data/strategies", workspace / "strategies",
+                    ignore=shutil.ignore_patterns("__pycache__"), dirs_exist_ok=True)
+
+def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_length, epochs, spaces, loss_function="SharpeHyperOptLoss", exp_index=1, verbose=False, runner="docker", use_cache=True, workspace=None):
     # Convert lengths to integers
     is_length = int(is_length)
     oos_length = int(oos_length)
@@ -46,12 +67,23 @@ def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_len
     log_and_print(f"Calculated In Sample Period: {is_period}")
     log_and_print(f"Calculated Out of Sample Period: {oos_period}")
 
-    # Clean previous backtest results to ensure we only copy files from this experiment
-    subprocess.run(["rm", "-f", "user_data/backtest_results/*.json"], capture_output=True)
-    subprocess.run(["rm", "-f", "user_data/backtest_results/*.zip"], capture_output=True)
+    # One runner for the whole experiment so worker backends start freqtrade only once
+    freqtrade_runner = create_runner(runner)
+
+    # Experiments running in parallel each get their own user data directory (see prepare_workspace)
+    user_data_dir = Path(workspace) if workspace else Path("user_data")
+    strategy_json = user_data_dir / "strategies" / f"{strategy}.json"
+    userdir_args = ["--userdir", str(user_data_dir), "--datadir", get_data_dir(CONFIG_FILE)] if workspace else []
+    if workspace:
+        prepare_workspace(workspace)
+        log_and_print(f"Using isolated workspace: {user_data_dir}")
+    else:
+        # Clean previous backtest results to ensure we only copy files from this experiment
+        subprocess.run(["rm", "-f", "user_data/backtest_results/*.json"], capture_output=True)
+        subprocess.run(["rm", "-f", "user_data/backtest_results/*.zip"], capture_output=True)
 
     # Clean strategy JSON files
-    subprocess.run(["rm", "-f", f"user_data/strategies/{strategy}.json"], capture_output=True)
+    subprocess.run(["rm", "-f", str(strategy_json)], capture_output=True)
 
     # Parse spaces parameter and add stoploss by default
     spaces_list = spaces.split(',') + ['stoploss']
@@ -59,8 +91,9 @@ def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_len
     
     # Hyperopt for the specified strategy
     hyperopt_cmd = [
-        "docker-compose", "run", "--rm", "freqtrade", "hyperopt",
-        "--config", "user_data/config.json",
+        "hyperopt",
+    ] + userdir_args + [
+        "--config", CONFIG_FILE,
         "--strategy", strategy,
         "--hyperopt-loss", loss_function
     ] + spaces_args + [
@@ -70,10 +103,24 @@ def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_len
         "--timerange", is_period,
         "-j", "-1"
     ]
-    log_and_print(f"Running command: {' '.join(hyperopt_cmd)}")
-    if verbose:
-        print(f"[HYPEROPT] {' '.join(hyperopt_cmd)}")
-    result = subprocess.run(hyperopt_cmd, capture_output=True, text=True)
+    # Identical hyperopt runs (same strategy source, spaces, loss, window, pair, epochs, config) are served from the cache
+    hyperopt_cache = HyperoptCache() if use_cache else None
+    cache_key = hyperopt_cache.fingerprint(
+        strategy, spaces_list, loss_function, is_period, pair, timeframe, epochs,
+        CONFIG_FILE, output_kind="hyperopt", strategies_dir=user_data_dir / "strategies"
+    ) if hyperopt_cache else None
+    cached = hyperopt_cache.get(cache_key) if cache_key else None
+
+    if cached:
+        log_and_print(f"Reusing cached hyperopt result ({cache_key[:12]}) instead of running: {freqtrade_runner.describe(hyperopt_cmd)}")
+        with open(strategy_json, 'w') as f:
+            json.dump(cached['strategy_params'], f, indent=4)
+        result = subprocess.CompletedProcess(hyperopt_cmd, 0, cached['output'], "")
+    else:
+        log_and_print(f"Running command: {freqtrade_runner.describe(hyperopt_cmd)}")
+        if verbose:
+            print(f"[HYPEROPT] {freqtrade_runner.describe(hyperopt_cmd)}")
+        result = freqtrade_runner.run(hyperopt_cmd, check=False)
     log_and_print(result.stdout)
     log_and_print(result.stderr)
     
@@ -96,6 +143,9 @@ def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_len
             f.write(f"{strategy}:{failure_reason}\n")
     else:
         log_and_print(f"SUCCESS: Hyperopt completed for {strategy}")
+        if cache_key and not cached and os.path.exists(strategy_json):
+            with open(strategy_json, 'r') as f:
+                hyperopt_cache.put(cache_key, json.load(f), result.stdout)
         # Create status file to indicate success
         with open(exp_dir / "hyperopt_status.txt", 'w') as f:
             f.write(f"{strategy}:Success\n")
@@ -104,30 +154,37 @@ def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_len
     if not hyperopt_failed:
         # Backtesting for OOS
         backtest_cmd = [
-            "docker-compose", "run", "--rm", "freqtrade", "backtesting",
-            "--config", "user_data/config.json",
+            "backtesting",
+        ] + userdir_args + [
+            "--config", CONFIG_FILE,
             "--strategy", strategy,
             "--pair", pair,
             "--timeframe", timeframe,
             "--timerange", oos_period,
             "--export", "trades"
         ]
-        log_and_print(f"Running command: {' '.join(backtest_cmd)}")
+        log_and_print(f"Running command: {freqtrade_runner.describe(backtest_cmd)}")
         if verbose:
-            print(f"[BACKTEST] {' '.join(backtest_cmd)}")
-        result = subprocess.run(backtest_cmd, capture_output=True, text=True)
+            print(f"[BACKTEST] {freqtrade_runner.describe(backtest_cmd)}")
+        result = freqtrade_runner.run(backtest_cmd, check=False)
         log_and_print(result.stdout)
         log_and_print(result.stderr)
     else:
         log_and_print(f"SKIPPING: OOS backtest for {strategy} due to hyperopt failure")
 
+    freqtrade_runner.close()
+
     # Copy backtest results (JSON and ZIP files)
-    subprocess.run(["cp", "-f", "user_data/backtest_results/*.json", str(exp_dir)], capture_output=True)
-    subprocess.run(["cp", "-f", "user_data/backtest_results/*.zip", str(exp_dir)], capture_output=True)
+    if workspace:
+        # The workspace only ever holds this experiment's results
+        for result_file in sorted((user_data_dir / "backtest_results").glob("*")):
+            if result_file.suffix in (".json", ".zip"):
+                shutil.copy2(result_file, exp_dir)
+    else:
+        subprocess.run(["cp", "-f", "user_data/backtest_results/*.json", str(exp_dir)], capture_output=True)
+        subprocess.run(["cp", "-f", "user_data/backtest_results/*.zip", str(exp_dir)], capture_output=True)
     
     # Copy optimization parameter files before they get deleted
-    strategy_json = f"user_data/strategies/{strategy}.json"
-    
     if os.path.exists(strategy_json):
         subprocess.run(["cp", strategy_json, str(exp_dir)], capture_output=True)
         log_and_print(f"Saved optimization parameters: {strategy}.json")
@@ -154,7 +211,11 @@ def run_experiment(strategy, pair, timeframe, start_date_str, is_length, oos_len
     log_and_print(f"Experiment finished for {strategy} {pair} {timeframe}")
 
     # Clean strategy JSON files again
-    subprocess.run(["rm", "-f", f"user_data/strategies/{strategy}.json"], capture_output=True)
+    subprocess.run(["rm", "-f", str(strategy_json)], capture_output=True)
+
+    # Everything worth keeping was copied to the experiment directory
+    if workspace:
+        shutil.rmtree(user_data_dir, ignore_errors=True)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run a freqtrade experiment")
@@ -169,10 +230,14 @@ if __name__ == "__main__":
     parser.add_argument("loss_function", nargs="?", default="SharpeHyperOptLoss", help="Hyperopt loss function")
     parser.add_argument("exp_index", nargs="?", default="1", help="Experiment index number")
     parser.add_argument("--verbose", action="store_true", help="Print full freqtrade commands")
+    parser.add_argument("--runner", choices=RUNNER_BACKENDS, default="docker", help="How freqtrade is executed (default: docker)")
+    parser.add_argument("--no-cache", action="store_true", help="Always run hyperopt instead of reusing cached results")
+    parser.add_argument("--workspace", help="Isolated freqtrade user data directory for this experiment (used by run_all_experiments.py --workers)")
     
     args = parser.parse_args()
     
     run_experiment(
         args.strategy, args.pair, args.timeframe, args.start_date,
-        args.is_length, args.oos_length, args.epochs, args.spaces, args.loss_function, int(args.exp_index), args.verbose
+        args.is_length, args.oos_length, args.epochs, args.spaces, args.loss_function, int(args.exp_index), args.verbose,
+        args.runner, not args.no_cache, args.workspace
     )
\ No newline at end of file
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Freqtrade Runner Backends
+Pluggable ways of executing freqtrade commands that all share one interface.
+
+- docker:        one `docker-compose run --rm freqtrade ...` container per command (default)
+- local:         one local `freqtrade ...` process per command
+- docker-worker: one long-lived container running freqtrade_worker.py for the whole session
+- local-worker:  one long-lived local process running freqtrade_worker.py for the whole session
+
+Local backends can additionally run backtests in-process through freqtrade's Backtesting API
+(see run_backtest_in_process), which hands back the results dict without a ZIP round-trip.
+
+Runners from create_runner run every command within the machine-wide CPU budget (see cpu_budget.py).
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from cpu_budget import CpuBudget
+
+RUNNER_BACKENDS = ["docker", "local", "docker-worker", "local-worker"]
+
+WORKER_SCRIPT = Path(__file__).resolve().parent / "freqtrade_worker.py"
+CONTAINER_WORKER_SCRIPT = "/freqtrade/freqtrade_worker.py"
+
+# freqtrade keeps backtest trades, pair locks and strategy loading state in process-wide globals,
+# so in-process backtests from concurrent threads (pipelined walk stages) must run one at a time
+IN_PROCESS_BACKTEST_LOCK = threading.Lock()
+
+
+class FreqtradeRunner:
+    """Base runner: executes freqtrade commands and mimics subprocess.run semantics"""
+
+    name = "base"
+    in_process_backtest = False
+    cpu_budget = None
+
+    def command_prefix(self):
+        """Command that precedes the freqtrade arguments (used for logging)"""
+        raise NotImplementedError
+
+    def execute(self, args):
+        """Execute freqtrade with args and return (returncode, stdout, stderr)"""
+        raise NotImplementedError
+
+    def describe(self, args):
+        """Human readable command line for a freqtrade invocation"""
+        return ' '.join(self.command_prefix() + [str(arg) for arg in args])
+
+    def run(self, args, check=True):
+        """Run a freqtrade command, raising CalledProcessError on failure like subprocess.run(check=True)"""
+        args = [str(arg) for arg in args]
+        if self.cpu_budget:
+            # Hyperopt waits for its core allotment and gets -j rewritten to it
+            with self.cpu_budget.job(args) as args:
+                returncode, stdout, stderr = self.execute(args)
+        else:
+            returncode, stdout, stderr = self.execute(args)
+        cmd = self.command_prefix() + args
+
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def close(self):
+        """Release any long-lived resources"""
+        pass
+
+
+class DockerRunner(FreqtradeRunner):
+    """Runs every command in a fresh freqtrade container"""
+
+    name = "docker"
+
+    def command_prefix(self):
+        return ["docker-compose", "run", "--rm", "freqtrade"]
+
+    def execute(self, args):
+        result = subprocess.run(self.command_prefix() + args, capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+
+
+class LocalRunner(FreqtradeRunner):
+    """Runs every command with a locally installed freqtrade"""
+
+    name = "local"
+
+    def __init__(self, freqtrade_bin="freqtrade"):
+        self.freqtrade_bin = freqtrade_bin
+        self.in_process_backtest = freqtrade_available()
+
+    def command_prefix(self):
+        return [self.freqtrade_bin]
+
+    def execute(self, args):
+        result = subprocess.run(self.command_prefix() + args, capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+
+
+class WorkerRunner(FreqtradeRunner):
+    """Sends commands to a persistent freqtrade_worker.py process started once per session"""
+
+    def __init__(self, name, launch_cmd, in_process_backtest=False):
+        self.name = name
+        self.launch_cmd = launch_cmd
+        self.in_process_backtest = in_process_backtest
+        self._process = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes and locks cannot cross process boundaries; each process starts its own worker
+        state = self.__dict__.copy()
+        state['_process'] = None
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def command_prefix(self):
+        return [f"[{self.name}]", "freqtrade"]
+
+    def start(self):
+        """Start the worker process if it is not running yet"""
+        if self._process and self._process.poll() is None:
+            return
+
+        print(f"🔧 Starting persistent freqtrade worker: {' '.join(self.launch_cmd)}")
+        self._process = subprocess.Popen(
+            self.launch_cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+
+        # Wait for the worker to finish importing freqtrade
+        ready_line = self._read_response_line()
+        if not ready_line or not json.loads(ready_line).get('ready'):
+            self.close()
+            raise RuntimeError("Freqtrade worker failed to start")
+        print("✅ Freqtrade worker ready")
+
+    def _read_response_line(self):
+        """Read the next protocol line, skipping anything that is not JSON"""
+        while True:
+            line = self._process.stdout.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if line.startswith('{') and line.endswith('}'):
+                return line
+
+    def execute(self, args):
+        with self._lock:
+            self.start()
+            self._process.stdin.write(json.dumps({'args': args}) + '\n')
+            self._process.stdin.flush()
+
+            response_line = self._read_response_line()
+            if response_line is None:
+                self.close()
+                return 1, "", "Freqtrade worker exited unexpectedly"
+
+            response = json.loads(response_line)
+            return response['returncode'], response.get('stdout', ''), response.get('stderr', '')
+
+    def close(self):
+        if not self._process:
+            return
+
+        try:
+            # Closing stdin makes the worker exit (and docker-compose remove its container)
+            self._process.stdin.close()
+            self._process.wait(timeout=60)
+        except Exception:
+            self._process.kill()
+        self._process = None
+
+
+def freqtrade_available():
+    """Whether freqtrade can be imported in this interpreter"""
+    try:
+        import freqtrade  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _json_default(value):
+    """Convert numpy scalars and timestamps the same way freqtrade's result files store them"""
+    if hasattr(value, 'item') and type(value).__name__.startswith(('int', 'uint', 'float', 'bool')):
+        return value.item()
+    return str(value)
+
+
+def run_backtest_in_process(args):
+    """
+    Run a `backtesting` command through freqtrade's Backtesting API in this process.
+    
+    Returns (results, strategy_params, export_file): results has the same layout as the main
+    JSON file inside a backtest ZIP, strategy_params the strategy's parameter file (or None),
+    and export_file the path of the exported result when --export is used (or None).
+    Backtests of concurrent threads are serialized by IN_PROCESS_BACKTEST_LOCK.
+    """
+    with IN_PROCESS_BACKTEST_LOCK:
+        return _run_backtest(args)
+
+
+def _run_backtest(args):
+    from freqtrade.commands.arguments import Arguments
+    from freqtrade.commands.optimize_commands import setup_optimize_configuration
+    from freqtrade.data.btanalysis import get_latest_backtest_filename
+    from freqtrade.enums import RunMode
+    from freqtrade.optimize.backtesting import Backtesting
+
+    parsed_args = Arguments([str(arg) for arg in args]).get_parsed_arg()
+    config = setup_optimize_configuration(parsed_args, RunMode.BACKTEST)
+
+    backtesting = Backtesting(config)
+    backtesting.start()
+
+    # Normalize to JSON types so results match what the ZIP parser would return
+    results = json.loads(json.dumps(backtesting.results, default=_json_default))
+
+    strategy_params = None
+    for strategy in backtesting.strategylist:
+        params_file = Path(getattr(strategy, '__file__', '')).with_suffix('.json')
+        if params_file.is_file():
+            with open(params_file, 'r') as f:
+                strategy_params = json.load(f)
+        break
+
+    export_file = None
+    if config.get('export', 'none') != 'none':
+        export_dir = Path(config.get('exportdirectory') or config.get('exportfilename')
+                          or Path(config['user_data_dir']) / "backtest_results")
+        if export_dir.suffix:
+            export_dir = export_dir.parent
+        try:
+            export_file = str(export_dir / get_latest_backtest_filename(export_dir))
+        except (ValueError, OSError):
+            export_file = None
+
+    return results, strategy_params, export_file
+
+
+def docker_worker_command():
+    """docker-compose command that starts the worker script inside the freqtrade image"""
+    return [
+        "docker-compose", "run", "--rm", "-T",
+        "-v", f"{WORKER_SCRIPT}:{CONTAINER_WORKER_SCRIPT}:ro",
+        "--entrypoint", "python3",
+        "freqtrade", CONTAINER_WORKER_SCRIPT
+    ]
+
+
+def create_runner(backend="docker", cpu_budget=None):
+    """Create a runner for one of RUNNER_BACKENDS, scheduled within cpu_budget (default: the whole machine)"""
+    if backend == "docker":
+        runner = DockerRunner()
+    elif backend == "local":
+        runner = LocalRunner(shutil.which("freqtrade") or "freqtrade")
+    elif backend == "docker-worker":
+        runner = WorkerRunner(backend, docker_worker_command())
+    elif backend == "local-worker":
+        runner = WorkerRunner(backend, [sys.executable, str(WORKER_SCRIPT)], in_process_backtest=freqtrade_available())
+    else:
+        raise ValueError(f"Unknown runner backend '{backend}'. Choose from: {', '.join(RUNNER_BACKENDS)}")
+    runner.cpu_budget = cpu_budget or CpuBudget()
+    return runner
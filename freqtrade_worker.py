@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Persistent Freqtrade Worker
+Long-lived process that runs freqtrade commands sent over stdin, one JSON request per line.
+
+Freqtrade and its heavy dependencies are imported once at startup. Every job then runs
+in a forked child, so jobs pay neither the interpreter/import start-up cost nor the
+container start-up cost, while each job still gets a clean freqtrade state.
+
+Protocol (line-delimited JSON):
+    worker  -> {"ready": true}
+    client  -> {"args": ["backtesting", "--config", "user_data/config.json", ...]}
+    worker  -> {"returncode": 0, "stdout": "...", "stderr": "..."}
+
+The worker exits when stdin is closed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def preload_freqtrade():
+    """Import freqtrade modules once so forked jobs start warm"""
+    import freqtrade.main  # noqa: F401
+    for module in ["freqtrade.optimize.backtesting", "freqtrade.optimize.hyperopt",
+                   "freqtrade.plot.plotting", "freqtrade.data.history"]:
+        try:
+            __import__(module)
+        except ImportError:
+            # Optional components (e.g. plotting or hyperopt extras) may not be installed
+            pass
+
+
+def run_job_in_child(args):
+    """Run a single freqtrade command in a forked child and capture its output"""
+    with tempfile.TemporaryFile() as out_file, tempfile.TemporaryFile() as err_file:
+        pid = os.fork()
+        if pid == 0:
+            returncode = 1
+            try:
+                os.dup2(out_file.fileno(), 1)
+                os.dup2(err_file.fileno(), 2)
+                sys.stdout = os.fdopen(1, 'w', closefd=False)
+                sys.stderr = os.fdopen(2, 'w', closefd=False)
+                from freqtrade.main import main as freqtrade_main
+                freqtrade_main(args)
+                returncode = 0
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except BaseException as e:
+                print(f"Worker job failed: {e}", file=sys.stderr)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(returncode)
+
+        _, status = os.waitpid(pid, 0)
+        returncode = os.waitstatus_to_exitcode(status)
+
+        out_file.seek(0)
+        err_file.seek(0)
+        return {
+            'returncode': returncode,
+            'stdout': out_file.read().decode('utf-8', errors='replace'),
+            'stderr': err_file.read().decode('utf-8', errors='replace')
+        }
+
+
+def run_job_in_subprocess(args):
+    """Fallback for platforms without fork"""
+    result = subprocess.run([sys.executable, "-m", "freqtrade", *args], capture_output=True, text=True)
+    return {'returncode': result.returncode, 'stdout': result.stdout, 'stderr': result.stderr}
+
+
+def main():
+    # Keep a private handle on the protocol stream and send anything else printed to stderr
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    can_fork = hasattr(os, 'fork')
+    if can_fork:
+        preload_freqtrade()
+
+    protocol.write(json.dumps({'ready': True}) + '\n')
+    protocol.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            args = [str(arg) for arg in request['args']]
+            response = run_job_in_child(args) if can_fork else run_job_in_subprocess(args)
+        except Exception as e:
+            response = {'returncode': 1, 'stdout': '', 'stderr': f"Worker could not run request: {e}"}
+
+        protocol.write(json.dumps(response) + '\n')
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Hyperopt Result Cache
+Content-addressed on-disk cache of hyperopt results.
+
+An entry is keyed by a fingerprint of everything that determines a hyperopt run: the strategy
+source and the shared indicators package it imports, the params of spaces that are not being optimized, spaces, loss function, timerange,
+pair, timeframe, epochs and the config file. It stores the optimized strategy params file, the
+captured freqtrade output and optionally the best epoch's IS trades, so an identical run can be
+answered without re-running hyperopt.
+
+Entries are evicted least-recently-used first once the cache exceeds its size budget, and
+unconditionally once they have not been used for longer than the maximum age.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = "user_data/hyperopt_cache"
+DEFAULT_MAX_SIZE_MB = 512
+DEFAULT_MAX_AGE_DAYS = 90
+
+# Local package the strategies import their indicator kernels from
+INDICATORS_PACKAGE = "indicators"
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def package_sha256(package_dir):
+    """SHA-256 over the relative paths and contents of a package's Python sources (None if it does not exist)"""
+    package_dir = Path(package_dir)
+    if not package_dir.is_dir():
+        return None
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob("*.py")):
+        if "__pycache__" in path.parts:
+            continue
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(file_sha256(path).encode())
+    return digest.hexdigest()
+
+
+def find_strategy_file(strategy, strategies_dir="user_data/strategies"):
+    """Locate the file defining a strategy class"""
+    class_pattern = re.compile(rf'^class\s+{re.escape(strategy)}\s*\(', re.MULTILINE)
+    candidates = sorted(Path(strategies_dir).glob("*.py"))
+
+    # The file is usually named after the strategy, so check that first
+    candidates.sort(key=lambda path: path.stem != strategy)
+    for path in candidates:
+        try:
+            if class_pattern.search(path.read_text(encoding='utf-8', errors='ignore')):
+                return path
+        except OSError:
+            continue
+    return None
+
+
+def frozen_strategy_params(params_file, spaces):
+    """Params of the spaces hyperopt will not touch; they are read from the params file and affect results"""
+    if 'all' in spaces or 'default' in spaces:
+        return {}
+    try:
+        with open(params_file, 'r') as f:
+            params = json.load(f).get('params', {})
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return {}
+    return {space: values for space, values in params.items() if space not in spaces}
+
+
+class HyperoptCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size_mb=DEFAULT_MAX_SIZE_MB, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+    def fingerprint(self, strategy, spaces, hyperopt_loss, timerange, pair, timeframe, epochs, config,
+                    output_kind, strategies_dir="user_data/strategies"):
+        """Cache key for a hyperopt run, or None if the strategy source cannot be located"""
+        strategy_file = find_strategy_file(strategy, strategies_dir)
+        if strategy_file is None:
+            return None
+
+        spaces = sorted(spaces)
+        key_fields = {
+            'strategy': strategy,
+            'strategy_source': file_sha256(strategy_file),
+            'indicators_source': package_sha256(Path(strategies_dir) / INDICATORS_PACKAGE),
+            'frozen_params': frozen_strategy_params(strategy_file.with_suffix('.json'), spaces),
+            'spaces': spaces,
+            'hyperopt_loss': hyperopt_loss,
+            'timerange': timerange,
+            'pair': pair,
+            'timeframe': timeframe,
+            'epochs': int(epochs),
+            'config': file_sha256(config) if Path(config).exists() else config,
+            'output_kind': output_kind
+        }
+        return hashlib.sha256(json.dumps(key_fields, sort_keys=True).encode()).hexdigest()
+
+    def entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Return a cached entry (strategy_params, output, is_trades) and mark it as recently used"""
+        if not key:
+            return None
+
+        path = self.entry_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        # The file modification time doubles as the LRU timestamp
+        os.utime(path)
+        return entry
+
+    def put(self, key, strategy_params, output, is_trades=None):
+        """Store the optimized params, freqtrade output and best-epoch IS trades of a hyperopt run"""
+        if not key or not strategy_params:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'created_at': time.time(),
+            'strategy_params': strategy_params,
+            'output': output
+        }
+        if is_trades is not None:
+            entry['is_trades'] = is_trades
+
+        path = self.entry_path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used entries until the size budget is met"""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the CPU budget scheduler (cpu_budget.py). Run from the repository root:
+
+    python -m unittest
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import cpu_budget
+from cpu_budget import CpuBudget, with_job_workers
+
+
+def dead_pid():
+    """Pid of a process that has already exited"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class TestCpuBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.ledger_dir = tempfile.TemporaryDirectory()
+        self.budget = CpuBudget(self.ledger_dir.name, total_cores=8, poll_seconds=0.01)
+
+    def tearDown(self):
+        self.ledger_dir.cleanup()
+
+    @staticmethod
+    def state(*jobs, slots=0):
+        return {
+            'jobs': {f"job-{i}": {'pid': 1, 'command': command, 'cores': cores}
+                     for i, (command, cores) in enumerate(jobs)},
+            'slots': {'1': slots} if slots else {}
+        }
+
+    def ledger(self):
+        with open(Path(self.ledger_dir.name) / "ledger.json", 'r') as f:
+            return json.load(f)
+
+    def test_with_job_workers_rewrites_or_appends_the_flag(self):
+        self.assertEqual(with_job_workers(["hyperopt", "-j", "-1", "-e", "100"], 4),
+                         ["hyperopt", "-j", "4", "-e", "100"])
+        self.assertEqual(with_job_workers(["hyperopt", "--job-workers", "16"], 4), ["hyperopt", "--job-workers", "4"])
+        self.assertEqual(with_job_workers(["hyperopt", "-e", "100"], 4), ["hyperopt", "-e", "100", "-j", "4"])
+        args = ["hyperopt", "-j", "-1"]
+        with_job_workers(args, 4)
+        self.assertEqual(args, ["hyperopt", "-j", "-1"])
+
+    def test_allotment_without_contention(self):
+        # A lone hyperopt takes the machine; with a second declared slot it keeps half back
+        self.assertEqual(self.budget.hyperopt_allotment(self.state()), 8)
+        self.assertEqual(self.budget.hyperopt_allotment(self.state(slots=2)), 4)
+        self.assertEqual(self.budget.hyperopt_allotment(self.state(("hyperopt", 4), slots=2)), 4)
+        # Single core jobs shrink the first hyperopt's share instead of making it wait
+        self.assertEqual(self.budget.hyperopt_allotment(self.state(("backtesting", 1), ("backtesting", 1))), 6)
+
+    def test_allotment_under_contention(self):
+        # Less than a fair share is free while another hyperopt runs: wait for it
+        self.assertIsNone(self.budget.hyperopt_allotment(self.state(("hyperopt", 4), ("backtesting", 1), slots=2)))
+        self.assertIsNone(self.budget.hyperopt_allotment(self.state(("hyperopt", 8))))
+        # Without declared slots the running hyperopts plus this one split the machine
+        self.assertEqual(self.budget.hyperopt_allotment(self.state(("hyperopt", 4))), 4)
+        # Four slots on eight cores: two cores each, two stay free for the slot that has not started
+        self.assertEqual(self.budget.hyperopt_allotment(self.state(("hyperopt", 2), ("hyperopt", 2), slots=4)), 2)
+        # With no slot left to start, the last hyperopt takes every free core
+        self.assertEqual(self.budget.hyperopt_allotment(self.state(("hyperopt", 2), slots=2)), 6)
+
+    def test_jobs_register_in_the_ledger_while_they_run(self):
+        with self.budget.job(["hyperopt", "-j", "-1"]) as hyperopt_args:
+            self.assertEqual(hyperopt_args, ["hyperopt", "-j", "8"])
+            with self.budget.job(["backtesting", "--timerange", "20240101-20240201"]) as backtest_args:
+                self.assertEqual(backtest_args, ["backtesting", "--timerange", "20240101-20240201"])
+                jobs = sorted((job['command'], job['cores']) for job in self.ledger()['jobs'].values())
+                self.assertEqual(jobs, [("backtesting", 1), ("hyperopt", 8)])
+                self.assertTrue(self.budget.has_jobs(os.getpid()))
+        self.assertEqual(self.ledger()['jobs'], {})
+        self.assertFalse(self.budget.has_jobs(os.getpid()))
+
+    def test_dead_processes_free_their_cores_and_slots(self):
+        pid = dead_pid()
+        Path(self.ledger_dir.name, "ledger.json").write_text(json.dumps({
+            'jobs': {f"{pid}-stale": {'pid': pid, 'command': "hyperopt", 'cores': 8}},
+            'slots': {str(pid): 4}
+        }))
+        with self.budget.job(["hyperopt"]) as args:
+            self.assertEqual(args, ["hyperopt", "-j", "8"])
+        self.assertEqual(self.ledger()['slots'], {})
+
+    def test_declared_slots(self):
+        self.budget.declare_slots(3)
+        self.assertEqual(self.ledger()['slots'], {str(os.getpid()): 3})
+        self.budget.declare_slots(0)
+        self.assertEqual(self.ledger()['slots'], {})
+
+    def test_zero_budget_keeps_the_arguments(self):
+        budget = CpuBudget(self.ledger_dir.name, total_cores=0)
+        with budget.job(["hyperopt", "-j", "-1"]) as args:
+            self.assertEqual(args, ["hyperopt", "-j", "-1"])
+        self.assertFalse(Path(self.ledger_dir.name, "ledger.json").exists())
+
+    def test_budget_from_env(self):
+        environ = dict(os.environ)
+        try:
+            os.environ[cpu_budget.BUDGET_ENV] = "6"
+            self.assertEqual(cpu_budget.budget_from_env(), 6)
+            os.environ[cpu_budget.BUDGET_ENV] = "-2"
+            self.assertEqual(cpu_budget.budget_from_env(), 0)
+            os.environ[cpu_budget.BUDGET_ENV] = "many"
+            self.assertEqual(cpu_budget.budget_from_env(), cpu_budget.available_cores())
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+
+
+if __name__ == "__main__":
+    unittest.main()
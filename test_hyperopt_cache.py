@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the hyperopt result cache (hyperopt_cache.py). Run from the repository root:
+
+    python -m unittest
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from hyperopt_cache import HyperoptCache
+
+
+class TestHyperoptCache(unittest.TestCase):
+
+    FINGERPRINT_ARGS = dict(spaces=["buy", "sell"], hyperopt_loss="SharpeHyperOptLoss", timerange="20240101-20240301",
+                            pair="BTC/USDT:USDT", timeframe="1h", epochs=100, config="missing_config.json",
+                            output_kind="show")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.strategies_dir = Path(self.tmp.name) / "strategies"
+        self.strategies_dir.mkdir()
+        (self.strategies_dir / "MyStrategy.py").write_text("class MyStrategy(IStrategy):\n    pass\n")
+        self.cache = HyperoptCache(Path(self.tmp.name) / "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fingerprint(self, strategy="MyStrategy", **overrides):
+        args = dict(self.FINGERPRINT_ARGS, **overrides)
+        return self.cache.fingerprint(strategy, strategies_dir=self.strategies_dir, **args)
+
+    def set_age(self, key, seconds):
+        then = time.time() - seconds
+        os.utime(self.cache.entry_path(key), (then, then))
+
+    def test_fingerprint_follows_the_hyperopt_inputs(self):
+        key = self.fingerprint()
+        self.assertEqual(self.fingerprint(), key)
+        self.assertEqual(self.fingerprint(spaces=["sell", "buy"]), key)
+        self.assertNotEqual(self.fingerprint(epochs=200), key)
+        self.assertNotEqual(self.fingerprint(timerange="20240201-20240401"), key)
+        self.assertIsNone(self.fingerprint(strategy="UnknownStrategy"))
+
+    def test_fingerprint_covers_the_strategy_source(self):
+        key = self.fingerprint()
+        (self.strategies_dir / "MyStrategy.py").write_text("class MyStrategy(IStrategy):\n    minimal_roi = {}\n")
+        self.assertNotEqual(self.fingerprint(), key)
+
+    def test_fingerprint_covers_the_indicators_package(self):
+        indicators_dir = self.strategies_dir / "indicators"
+        indicators_dir.mkdir()
+        (indicators_dir / "__init__.py").write_text("")
+        (indicators_dir / "vwma.py").write_text("PERIOD = 21\n")
+        key = self.fingerprint()
+
+        (indicators_dir / "vwma.py").write_text("PERIOD = 22\n")
+        changed = self.fingerprint()
+        self.assertNotEqual(changed, key)
+
+        # Bytecode caches are not sources
+        (indicators_dir / "__pycache__").mkdir()
+        (indicators_dir / "__pycache__" / "stale.py").write_text("")
+        self.assertEqual(self.fingerprint(), changed)
+
+        (indicators_dir / "slope.py").write_text("")
+        self.assertNotEqual(self.fingerprint(), changed)
+
+    def test_fingerprint_covers_params_of_frozen_spaces(self):
+        params_file = self.strategies_dir / "MyStrategy.json"
+        params_file.write_text(json.dumps({'params': {'buy': {'rsi': 30}, 'sell': {'rsi': 70}}}))
+        key = self.fingerprint(spaces=["buy"])
+        # Hyperopt overwrites the buy params, but reads the sell params it does not optimize
+        params_file.write_text(json.dumps({'params': {'buy': {'rsi': 25}, 'sell': {'rsi': 70}}}))
+        self.assertEqual(self.fingerprint(spaces=["buy"]), key)
+        params_file.write_text(json.dumps({'params': {'buy': {'rsi': 25}, 'sell': {'rsi': 75}}}))
+        self.assertNotEqual(self.fingerprint(spaces=["buy"]), key)
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get(None))
+        self.assertIsNone(self.cache.get("absent"))
+
+        self.cache.put("key", {'params': {'buy': {'rsi': 30}}}, "best epoch")
+        entry = self.cache.get("key")
+        self.assertEqual(entry['strategy_params'], {'params': {'buy': {'rsi': 30}}})
+        self.assertEqual(entry['output'], "best epoch")
+
+        # Runs that produced no params are not cached
+        self.cache.put("empty", {}, "no epochs")
+        self.assertIsNone(self.cache.get("empty"))
+
+    def test_is_trades_round_trip(self):
+        trades = [{'close_timestamp': 1704067200000, 'profit_abs': 10.0}]
+        self.cache.put("key", {'params': {}}, "best epoch", is_trades=trades)
+        self.assertEqual(self.cache.get("key")['is_trades'], trades)
+        self.cache.put("no trades", {'params': {}}, "best epoch")
+        self.assertNotIn('is_trades', self.cache.get("no trades"))
+
+    def test_get_marks_the_entry_recently_used(self):
+        self.cache.put("key", {'params': {}}, "output")
+        self.set_age("key", 3600)
+        self.cache.get("key")
+        self.assertLess(time.time() - self.cache.entry_path("key").stat().st_mtime, 60)
+
+    def test_eviction_drops_least_recently_used_first(self):
+        for age, key in zip([300, 200, 100], ["a", "b", "c"]):
+            self.cache.put(key, {'params': {}}, "x" * 1000)
+            self.set_age(key, age)
+        self.cache.get("a")
+
+        # Room for three entries: the fourth evicts b, the least recently used after a's lookup
+        self.cache.max_size_bytes = 3 * self.cache.entry_path("a").stat().st_size + 100
+        self.cache.put("d", {'params': {}}, "x" * 1000)
+        self.assertEqual(sorted(path.stem for path in self.cache.cache_dir.glob("*.json")), ["a", "c", "d"])
+
+        self.set_age("c", 50)
+        self.cache.put("e", {'params': {}}, "x" * 1000)
+        self.assertEqual(sorted(path.stem for path in self.cache.cache_dir.glob("*.json")), ["a", "d", "e"])
+
+    def test_stale_entries_expire(self):
+        self.cache.put("stale", {'params': {}}, "output")
+        self.cache.put("fresh", {'params': {}}, "output")
+        self.set_age("stale", self.cache.max_age_seconds + 60)
+        self.assertIsNone(self.cache.get("stale"))
+        self.assertFalse(self.cache.entry_path("stale").exists())
+
+        # Eviction drops expired entries even when the cache is within its size budget
+        self.cache.put("old", {'params': {}}, "output")
+        self.set_age("old", self.cache.max_age_seconds + 60)
+        self.cache.evict()
+        self.assertFalse(self.cache.entry_path("old").exists())
+        self.assertIsNotNone(self.cache.get("fresh"))
+
+
+if __name__ == "__main__":
+    unittest.main()
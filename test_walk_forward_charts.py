@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the walk equity charts (walk_forward_charts.py). Run from the repository root:
+
+    python -m unittest
+"""
+
+import json
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from walk_forward_charts import (STYLESHEET_NAME, curve_stats, equity_curve, load_is_trades, nice_ticks,
+                                 period_bounds, render_walk_charts)
+
+
+class TestWalkCharts(unittest.TestCase):
+
+    def test_period_bounds_end_at_the_next_period_start(self):
+        start, end = period_bounds({'start': "2024-01-01", 'end': "2024-01-31"})
+        self.assertEqual(start, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2024, 1, 31, tzinfo=timezone.utc))
+        oos_start, _ = period_bounds({'start': "2024-01-31", 'end': "2024-02-10"})
+        self.assertEqual(oos_start, end)
+
+    def test_equity_curve(self):
+        trades = [
+            {'close_date': "2024-01-03 00:00:00+00:00", 'profit_abs': -30.0},
+            {'close_timestamp': 1704067200000, 'profit_abs': 50.0},  # 2024-01-01
+            {'close_date': "2024-01-02T00:00:00", 'profit_abs': 20.0},
+            {'close_date': None, 'profit_abs': 99.0},
+            {'close_date': "2024-01-04 00:00:00+00:00", 'profit_abs': None},
+        ]
+        points = equity_curve(trades)
+        self.assertEqual([point['time'].day for point in points], [1, 2, 3, 4])
+        self.assertEqual([point['equity'] for point in points], [50.0, 70.0, 40.0, 40.0])
+        self.assertEqual([point['drawdown'] for point in points], [0.0, 0.0, -30.0, -30.0])
+        self.assertTrue(all(point['time'].tzinfo is not None for point in points))
+
+    def test_curve_stats(self):
+        stats = curve_stats(equity_curve([
+            {'close_timestamp': 1704067200000, 'profit_abs': 10.0},
+            {'close_timestamp': 1704153600000, 'profit_abs': -25.0},
+            {'close_timestamp': 1704240000000, 'profit_abs': 5.0},
+            {'close_timestamp': 1704326400000, 'profit_abs': 30.0},
+        ]))
+        self.assertEqual(stats, {'trades': 4, 'profit_abs': 20.0, 'win_rate': 75.0, 'max_drawdown_abs': 25.0})
+        self.assertEqual(curve_stats([]), {'trades': 0, 'profit_abs': 0.0, 'win_rate': 0.0, 'max_drawdown_abs': 0.0})
+
+    def test_nice_ticks(self):
+        self.assertEqual(nice_ticks(0, 100), [0, 20, 40, 60, 80, 100])
+        self.assertEqual(nice_ticks(-37, 12), [-40, -30, -20, -10, 0, 10, 20])
+        self.assertEqual(nice_ticks(0.1, 0.35), [0.1, 0.15, 0.2, 0.25, 0.3, 0.35])
+        ticks = nice_ticks(5, 5)
+        self.assertLessEqual(ticks[0], 5)
+        self.assertGreaterEqual(ticks[-1], 6)
+
+    def test_load_is_trades(self):
+        trades = [{'close_timestamp': 1704067200000, 'profit_abs': 10.0}]
+        with tempfile.TemporaryDirectory() as results_dir:
+            (Path(results_dir) / "is_trades_walk_1.json").write_text(json.dumps(trades))
+            self.assertEqual(load_is_trades({'is_backtest': {'trades_file': "is_trades_walk_1.json"}}, results_dir),
+                             trades)
+            self.assertIsNone(load_is_trades({'is_backtest': {'trades_file': "is_trades_walk_2.json"}}, results_dir))
+            self.assertEqual(load_is_trades({'is_backtest': {'trades': trades}}, results_dir), trades)
+            self.assertIsNone(load_is_trades({'is_backtest': None}, results_dir))
+            self.assertIsNone(load_is_trades(None, results_dir))
+
+    def test_render_walk_charts(self):
+        trades = [{'close_timestamp': 1704067200000, 'profit_abs': 10.0}]
+        walks = [
+            {'walk_num': 1, 'is_period': {'start': "2023-12-01", 'end': "2024-01-01"},
+             'oos_period': {'start': "2024-01-01", 'end': "2024-01-11"},
+             'hyperopt_results': None, 'backtest_results': {'trades': trades}},
+            {'walk_num': 2, 'status': "failed_hyperopt"},
+        ]
+        with tempfile.TemporaryDirectory() as results_dir:
+            rendered = render_walk_charts(walks, results_dir, "MyStrategy", "BTC/USDT:USDT")
+            self.assertEqual(rendered, {1: {'IS': False, 'OOS': True}})
+            page = (Path(results_dir) / "charts" / "walk_1_OOS_chart.html").read_text(encoding='utf-8')
+            self.assertIn("Walk 1 OOS - MyStrategy", page)
+            self.assertTrue((Path(results_dir) / "charts" / STYLESHEET_NAME).exists())
+            self.assertFalse((Path(results_dir) / "charts" / "walk_1_IS_chart.html").exists())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 import logging
+import sys
 from functools import reduce
+from pathlib import Path
 from typing import Dict, List
 
-import numpy as np
 import pandas as pd
 import talib.abstract as ta
 from pandas import DataFrame
@@ -17,6 +18,9 @@ from freqtrade.strategy import (
     stoploss_from_open,
 )
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import qfl_indicators
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,7 +137,7 @@ class FreqAI_Simple_Strategy(IStrategy):
         # Get QFL indicators from higher timeframe or calculate directly
         if self.qfl_timeframe == self.timeframe:
             # Calculate QFL indicators on current timeframe
-            dataframe = self.calculate_qfl_indicators(dataframe)
+            dataframe = qfl_indicators(dataframe, self.volume_ma_period.value)
             dataframe['qfl_fractal_up'] = dataframe['fractal_up']
             dataframe['qfl_fractal_down'] = dataframe['fractal_down']
             dataframe['qfl_base_age'] = dataframe['base_age']
@@ -147,7 +151,7 @@ class FreqAI_Simple_Strategy(IStrategy):
                 
                 if not qfl_tf_data.empty:
                     # Calculate QFL indicators on higher timeframe
-                    qfl_tf_data = self.calculate_qfl_indicators(qfl_tf_data)
+                    qfl_tf_data = qfl_indicators(qfl_tf_data, self.volume_ma_period.value)
                     
                     # Merge with current timeframe
                     dataframe = merge_informative_pair(
@@ -208,59 +212,6 @@ class FreqAI_Simple_Strategy(IStrategy):
         
         return dataframe
 
-    def calculate_qfl_indicators(self, dataframe: DataFrame) -> DataFrame:
-        """
-        Calculate QFL fractals and bases - adapted from QFL_Strategy.py
-        """
-        # Volume moving average for fractal validation
-        dataframe['volume_ma'] = ta.SMA(dataframe['volume'], timeperiod=self.volume_ma_period.value)
-        
-        # Fractal detection
-        # Up fractal: high[3]>high[4] and high[4]>high[5] and high[2]<high[3] and high[1]<high[2] and volume[3]>vam[3]
-        dataframe['fractal_up_condition'] = (
-            (dataframe['high'].shift(3) > dataframe['high'].shift(4)) &
-            (dataframe['high'].shift(4) > dataframe['high'].shift(5)) &
-            (dataframe['high'].shift(2) < dataframe['high'].shift(3)) &
-            (dataframe['high'].shift(1) < dataframe['high'].shift(2)) &
-            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
-        )
-        
-        # Down fractal: low[3]<low[4] and low[4]<low[5] and low[2]>low[3] and low[1]>low[2] and volume[3]>vam[3]
-        dataframe['fractal_down_condition'] = (
-            (dataframe['low'].shift(3) < dataframe['low'].shift(4)) &
-            (dataframe['low'].shift(4) < dataframe['low'].shift(5)) &
-            (dataframe['low'].shift(2) > dataframe['low'].shift(3)) &
-            (dataframe['low'].shift(1) > dataframe['low'].shift(2)) &
-            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
-        )
-        
-        # Track fractal levels
-        dataframe['fractal_up'] = np.nan
-        dataframe['fractal_down'] = np.nan
-        
-        # Set fractal levels when conditions are met
-        dataframe.loc[dataframe['fractal_up_condition'], 'fractal_up'] = dataframe['high'].shift(3)
-        dataframe.loc[dataframe['fractal_down_condition'], 'fractal_down'] = dataframe['low'].shift(3)
-        
-        # Forward fill fractal levels
-        dataframe['fractal_up'] = dataframe['fractal_up'].ffill()
-        dataframe['fractal_down'] = dataframe['fractal_down'].ffill()
-        
-        # Calculate base age
-        dataframe['base_changed'] = dataframe['fractal_down'] != dataframe['fractal_down'].shift(1)
-        dataframe['base_age'] = 0
-        
-        # Calculate bars since base change
-        base_change_indices = dataframe[dataframe['base_changed']].index
-        for i, idx in enumerate(dataframe.index):
-            if len(base_change_indices) > 0:
-                recent_changes = base_change_indices[base_change_indices <= idx]
-                if len(recent_changes) > 0:
-                    last_change = recent_changes[-1]
-                    dataframe.loc[idx, 'base_age'] = idx - last_change
-        
-        return dataframe
-
     def populate_entry_trend(self, df: DataFrame, metadata: dict) -> DataFrame:
         """
         Combined QFL + FreqAI entry logic
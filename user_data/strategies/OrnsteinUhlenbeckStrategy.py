@@ -1,11 +1,16 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
-import pandas as pd
+import sys
+from pathlib import Path
+
 import numpy as np
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import ou_parameters_variant, shared_feature_bank
+
 class OrnsteinUhlenbeckStrategy(IStrategy):
     """
     Ornstein-Uhlenbeck Mean Reversion Strategy (Long Only)
@@ -58,38 +63,14 @@ class OrnsteinUhlenbeckStrategy(IStrategy):
         }
     }
 
-    def estimate_ou_parameters(self, log_prices: pd.Series, lookback: int):
-        """
-        Estimate Ornstein-Uhlenbeck parameters (θ, μ, σ) using a rolling window.
-        """
-        # This calculation is iterative and can be slow; consider vectorizing for performance
-        ou_params = []
-        for i in range(lookback, len(log_prices)):
-            window = log_prices[i-lookback:i]
-            if len(window) < 2:
-                ou_params.append((np.nan, np.nan, np.nan))
-                continue
-            
-            delta_t = 1
-            mu = window.mean()
-            
-            try:
-                autocorr = window.autocorr(lag=1)
-                theta = -np.log(autocorr) / delta_t if autocorr > 0 else np.nan
-            except Exception:
-                theta = np.nan
-
-            sigma = window.std() * np.sqrt(2 * theta / delta_t) if pd.notna(theta) and theta > 0 else np.nan
-            ou_params.append((theta, mu, sigma))
-        
-        return pd.DataFrame(ou_params, columns=['theta', 'mu', 'sigma'], index=log_prices.index[lookback:])
-
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Populate indicators for the Ornstein-Uhlenbeck strategy.
         """
         log_prices = np.log(dataframe['close'])
-        ou_params_df = self.estimate_ou_parameters(log_prices, self.lookback_period.value)
+        # Rolling OU fit (θ, μ, σ), shared with the long/short twin strategy
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        ou_params_df = ou_parameters_variant(bank, self.lookback_period.value)
         
         dataframe['ou_theta'] = ou_params_df['theta']
         dataframe['ou_mean'] = ou_params_df['mu']
@@ -1,12 +1,19 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, CategoricalParameter, merge_informative_pair
 import talib.abstract as ta
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import (add_rolling_order_statistics, downcast_indicators, drop_plot_columns, qfl_indicators,
+                        rolling_percent_rank, rolling_quantile_from_order_statistics)
+
 
 class QFLRSI_Strategy(IStrategy):
     """
@@ -45,6 +52,11 @@ class QFLRSI_Strategy(IStrategy):
     # Startup candle count
     startup_candle_count: int = 200
     
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = ['qfl_condition', 'rsi_condition']
+    # Indicator columns no entry/exit logic reads; stored as float32 in lean backtests/hyperopt
+    downcast_columns = ['rsi_pnr']
+    
     # Plot configuration for web UI
     plot_config = {
         'main_plot': {
@@ -100,38 +112,45 @@ class QFLRSI_Strategy(IStrategy):
     rsi_lookback = 150  # Lookback period for percentile rank calculation
     rsi_entry_percentile = DecimalParameter(0.1, 5.0, default=1.0, space='buy')  # Entry percentile threshold
     rsi_exit_percentile = DecimalParameter(95.0, 99.9, default=99.0, space='sell')  # Exit percentile threshold
+    rsi_percentile_interpolation = 'nearest_rank'  # Pine: ta.percentile_nearest_rank ('linear' for pandas quantiles)
     
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Populate indicators for QFL strategy
-        """
-        # Volume moving average
-        dataframe['volume_ma'] = ta.SMA(dataframe['volume'], timeperiod=self.volume_ma_period.value)
         
+        Freqtrade runs this once per hyperopt, so every variant the buy/sell parameters can pick
+        is precomputed here and select_indicator_variants() picks the current one each epoch.
+        """
         # RSI calculation on current timeframe
         dataframe['rsi'] = ta.RSI(dataframe['close'], timeperiod=self.rsi_length)
         
-        # ATR calculation (always calculate for plotting purposes)
-        dataframe['atr'] = ta.ATR(dataframe['high'], dataframe['low'], dataframe['close'], timeperiod=self.atr_period.value)
+        # Volume moving average for every volume_ma_period value
+        for period in self.volume_ma_period.range:
+            dataframe[f'volume_ma_{period}'] = ta.SMA(dataframe['volume'], timeperiod=period)
+        
+        # ATR for every atr_period value (always calculated for plotting purposes)
+        for period in self.atr_period.range:
+            dataframe[f'atr_{period}'] = ta.ATR(dataframe['high'], dataframe['low'], dataframe['close'], timeperiod=period)
         
         # Calculate RSI Percentile Rank (PNR) with 150 candle lookback
-        dataframe['rsi_pnr'] = dataframe['rsi'].rolling(window=self.rsi_lookback, min_periods=self.rsi_lookback).apply(
-            lambda x: (x.iloc[-1] <= x).sum() / len(x) * 100, raw=False
-        )
+        dataframe['rsi_pnr'] = rolling_percent_rank(dataframe['rsi'], self.rsi_lookback)
         
-        # Calculate dynamic percentile levels based on parameters
-        dataframe['rsi_entry_level'] = dataframe['rsi'].rolling(window=self.rsi_lookback, min_periods=self.rsi_lookback).quantile(self.rsi_entry_percentile.value / 100)
-        dataframe['rsi_exit_level'] = dataframe['rsi'].rolling(window=self.rsi_lookback, min_periods=self.rsi_lookback).quantile(self.rsi_exit_percentile.value / 100)
+        # Sorted-window RSI values covering the entry/exit percentile ranges, so any percentile
+        # level is an O(n) lookup instead of a rolling quantile
+        add_rolling_order_statistics(
+            dataframe, 'rsi', self.rsi_lookback,
+            [self.percentile_range(self.rsi_entry_percentile), self.percentile_range(self.rsi_exit_percentile)],
+            prefix='rsi_sorted', interpolation=self.rsi_percentile_interpolation
+        )
         
         # Individual condition indicators will be set in entry logic
         
         # Since we're running 1h chart with 1h QFL timeframe, calculate directly on current timeframe
         if self.qfl_timeframe == self.timeframe:
             # Calculate QFL indicators on current timeframe
-            dataframe = self.calculate_qfl_indicators(dataframe)
-            dataframe['qfl_fractal_up'] = dataframe['fractal_up']
-            dataframe['qfl_fractal_down'] = dataframe['fractal_down']
-            dataframe['qfl_base_age'] = dataframe['base_age']
+            qfl_variants = self.calculate_qfl_variants(dataframe)
+            for column in qfl_variants.columns.drop('date'):
+                dataframe[column] = qfl_variants[column]
         else:
             # Get higher timeframe data for QFL base detection
             if self.dp:
@@ -142,21 +161,20 @@ class QFLRSI_Strategy(IStrategy):
                 
                 if not qfl_tf_data.empty:
                     # Calculate QFL indicators on higher timeframe
-                    qfl_tf_data = self.calculate_qfl_indicators(qfl_tf_data)
+                    qfl_variants = self.calculate_qfl_variants(qfl_tf_data)
                     
                     # Merge with current timeframe
                     dataframe = merge_informative_pair(
                         dataframe, 
-                        qfl_tf_data, 
+                        qfl_variants, 
                         self.timeframe, 
                         self.qfl_timeframe, 
                         ffill=True
                     )
                     
                     # Rename columns for easier access
-                    dataframe['qfl_fractal_up'] = dataframe[f'fractal_up_{self.qfl_timeframe}']
-                    dataframe['qfl_fractal_down'] = dataframe[f'fractal_down_{self.qfl_timeframe}']
-                    dataframe['qfl_base_age'] = dataframe[f'base_age_{self.qfl_timeframe}']
+                    for column in qfl_variants.columns.drop('date'):
+                        dataframe[column] = dataframe[f'{column}_{self.qfl_timeframe}']
                     
                     # Clean up temporary columns
                     cols_to_drop = [col for col in dataframe.columns if col.endswith(f'_{self.qfl_timeframe}')]
@@ -169,61 +187,52 @@ class QFLRSI_Strategy(IStrategy):
         # if not dataframe['qfl_fractal_down'].isna().all():
         #     print(f"DEBUG: Latest fractal down: {dataframe['qfl_fractal_down'].iloc[-1]}")
         
-        return dataframe
+        dataframe = self.select_indicator_variants(dataframe)
+        return downcast_indicators(dataframe, self.config, self.downcast_columns)
+    
+    @staticmethod
+    def percentile_range(parameter) -> tuple:
+        """Quantile range (0-1) a percentile parameter can take, including its current value"""
+        low = min(parameter.low, parameter.value)
+        high = max(parameter.high, parameter.value)
+        return low / 100, high / 100
+    
+    def calculate_qfl_variants(self, dataframe: DataFrame) -> DataFrame:
+        """
+        QFL fractals and base age for every volume_ma_period value
+        Returns date plus qfl_fractal_up_{period}, qfl_fractal_down_{period} and qfl_base_age_{period}
+        """
+        variants = DataFrame({'date': dataframe['date']}, index=dataframe.index)
+        for period in self.volume_ma_period.range:
+            qfl = qfl_indicators(dataframe[['date', 'high', 'low', 'volume']].copy(), period)
+            variants[f'qfl_fractal_up_{period}'] = qfl['fractal_up']
+            variants[f'qfl_fractal_down_{period}'] = qfl['fractal_down']
+            variants[f'qfl_base_age_{period}'] = qfl['base_age']
+        return variants
     
-    def calculate_qfl_indicators(self, dataframe: DataFrame) -> DataFrame:
+    def select_indicator_variants(self, dataframe: DataFrame) -> DataFrame:
         """
-        Calculate QFL fractals and bases on higher timeframe data
-        Translates the Pine Script QFL logic to Python
+        Point the working columns at the precomputed variants for the current parameter values
+        Cheap enough to run every epoch, which is what lets hyperopt explore these parameters
         """
-        # Volume moving average for fractal validation
-        dataframe['volume_ma'] = ta.SMA(dataframe['volume'], timeperiod=self.volume_ma_period.value)
+        volume_ma_period = self.volume_ma_period.value
+        dataframe['volume_ma'] = dataframe[f'volume_ma_{volume_ma_period}']
+        dataframe['atr'] = dataframe[f'atr_{self.atr_period.value}']
         
-        # Fractal detection (Pine: up/down conditions)
-        # Up fractal: high[3]>high[4] and high[4]>high[5] and high[2]<high[3] and high[1]<high[2] and volume[3]>vam[3]
-        dataframe['fractal_up_condition'] = (
-            (dataframe['high'].shift(3) > dataframe['high'].shift(4)) &
-            (dataframe['high'].shift(4) > dataframe['high'].shift(5)) &
-            (dataframe['high'].shift(2) < dataframe['high'].shift(3)) &
-            (dataframe['high'].shift(1) < dataframe['high'].shift(2)) &
-            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
-        )
+        if f'qfl_fractal_down_{volume_ma_period}' in dataframe.columns:
+            dataframe['qfl_fractal_up'] = dataframe[f'qfl_fractal_up_{volume_ma_period}']
+            dataframe['qfl_fractal_down'] = dataframe[f'qfl_fractal_down_{volume_ma_period}']
+            dataframe['qfl_base_age'] = dataframe[f'qfl_base_age_{volume_ma_period}']
         
-        # Down fractal: low[3]<low[4] and low[4]<low[5] and low[2]>low[3] and low[1]>low[2] and volume[3]>vam[3]
-        dataframe['fractal_down_condition'] = (
-            (dataframe['low'].shift(3) < dataframe['low'].shift(4)) &
-            (dataframe['low'].shift(4) < dataframe['low'].shift(5)) &
-            (dataframe['low'].shift(2) > dataframe['low'].shift(3)) &
-            (dataframe['low'].shift(1) > dataframe['low'].shift(2)) &
-            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
+        # Dynamic percentile levels based on parameters
+        dataframe['rsi_entry_level'] = rolling_quantile_from_order_statistics(
+            dataframe, 'rsi', self.rsi_lookback, self.rsi_entry_percentile.value / 100, prefix='rsi_sorted',
+            interpolation=self.rsi_percentile_interpolation
+        )
+        dataframe['rsi_exit_level'] = rolling_quantile_from_order_statistics(
+            dataframe, 'rsi', self.rsi_lookback, self.rsi_exit_percentile.value / 100, prefix='rsi_sorted',
+            interpolation=self.rsi_percentile_interpolation
         )
-        
-        # Track fractal levels (Pine: fractalupF() and fractaldownF() functions)
-        dataframe['fractal_up'] = np.nan
-        dataframe['fractal_down'] = np.nan
-        
-        # Set fractal levels when conditions are met
-        dataframe.loc[dataframe['fractal_up_condition'], 'fractal_up'] = dataframe['high'].shift(3)
-        dataframe.loc[dataframe['fractal_down_condition'], 'fractal_down'] = dataframe['low'].shift(3)
-        
-        # Forward fill fractal levels (Pine: fd := down ? low[3] : nz(fd[1]))
-        dataframe['fractal_up'] = dataframe['fractal_up'].ffill()
-        dataframe['fractal_down'] = dataframe['fractal_down'].ffill()
-        
-        # Calculate base age (Pine: barssince(fuptf != fuptf[1]))
-        dataframe['base_changed'] = dataframe['fractal_down'] != dataframe['fractal_down'].shift(1)
-        dataframe['base_age'] = 0
-        
-        # Calculate bars since base change
-        base_change_indices = dataframe[dataframe['base_changed']].index
-        for i, idx in enumerate(dataframe.index):
-            if len(base_change_indices) > 0:
-                # Find most recent base change
-                recent_changes = base_change_indices[base_change_indices <= idx]
-                if len(recent_changes) > 0:
-                    last_change = recent_changes[-1]
-                    dataframe.loc[idx, 'base_age'] = idx - last_change
-        
         return dataframe
     
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
@@ -231,6 +240,8 @@ class QFLRSI_Strategy(IStrategy):
         QFL Entry Logic
         Pine: buy = 100*(close/fdowntf) < 100 - percentage and agecond
         """
+        dataframe = self.select_indicator_variants(dataframe)
+        
         # Age condition (Pine: agecond = maxbaseage == 0 or age < maxbaseage)
         age_condition = (
             (self.max_base_age == 0) | 
@@ -340,13 +351,15 @@ class QFLRSI_Strategy(IStrategy):
         #     'enter_short'
         # ] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         QFL+RSI Exit Logic
         Exit when RSI above 99% percentile
         """
+        dataframe = self.select_indicator_variants(dataframe)
+        
         # Exit long when RSI above exit percentile level (overbought)
         rsi_exit_condition = dataframe['rsi'] > dataframe['rsi_exit_level']
         
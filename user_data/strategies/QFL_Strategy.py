@@ -1,12 +1,17 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
-import numpy as np
+import sys
+from pathlib import Path
+
 import pandas as pd
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, merge_informative_pair
 import talib.abstract as ta
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import qfl_indicators
+
 
 class QFL_Strategy(IStrategy):
     """
@@ -82,7 +87,7 @@ class QFL_Strategy(IStrategy):
         # Since we're running 1h chart with 1h QFL timeframe, calculate directly on current timeframe
         if self.qfl_timeframe == self.timeframe:
             # Calculate QFL indicators on current timeframe
-            dataframe = self.calculate_qfl_indicators(dataframe)
+            dataframe = qfl_indicators(dataframe, self.volume_ma_period.value)
             dataframe['qfl_fractal_up'] = dataframe['fractal_up']
             dataframe['qfl_fractal_down'] = dataframe['fractal_down']
             dataframe['qfl_base_age'] = dataframe['base_age']
@@ -96,7 +101,7 @@ class QFL_Strategy(IStrategy):
                 
                 if not qfl_tf_data.empty:
                     # Calculate QFL indicators on higher timeframe
-                    qfl_tf_data = self.calculate_qfl_indicators(qfl_tf_data)
+                    qfl_tf_data = qfl_indicators(qfl_tf_data, self.volume_ma_period.value)
                     
                     # Merge with current timeframe
                     dataframe = merge_informative_pair(
@@ -125,61 +130,6 @@ class QFL_Strategy(IStrategy):
         
         return dataframe
     
-    def calculate_qfl_indicators(self, dataframe: DataFrame) -> DataFrame:
-        """
-        Calculate QFL fractals and bases on higher timeframe data
-        Translates the Pine Script QFL logic to Python
-        """
-        # Volume moving average for fractal validation
-        dataframe['volume_ma'] = ta.SMA(dataframe['volume'], timeperiod=self.volume_ma_period.value)
-        
-        # Fractal detection (Pine: up/down conditions)
-        # Up fractal: high[3]>high[4] and high[4]>high[5] and high[2]<high[3] and high[1]<high[2] and volume[3]>vam[3]
-        dataframe['fractal_up_condition'] = (
-            (dataframe['high'].shift(3) > dataframe['high'].shift(4)) &
-            (dataframe['high'].shift(4) > dataframe['high'].shift(5)) &
-            (dataframe['high'].shift(2) < dataframe['high'].shift(3)) &
-            (dataframe['high'].shift(1) < dataframe['high'].shift(2)) &
-            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
-        )
-        
-        # Down fractal: low[3]<low[4] and low[4]<low[5] and low[2]>low[3] and low[1]>low[2] and volume[3]>vam[3]
-        dataframe['fractal_down_condition'] = (
-            (dataframe['low'].shift(3) < dataframe['low'].shift(4)) &
-            (dataframe['low'].shift(4) < dataframe['low'].shift(5)) &
-            (dataframe['low'].shift(2) > dataframe['low'].shift(3)) &
-            (dataframe['low'].shift(1) > dataframe['low'].shift(2)) &
-            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
-        )
-        
-        # Track fractal levels (Pine: fractalupF() and fractaldownF() functions)
-        dataframe['fractal_up'] = np.nan
-        dataframe['fractal_down'] = np.nan
-        
-        # Set fractal levels when conditions are met
-        dataframe.loc[dataframe['fractal_up_condition'], 'fractal_up'] = dataframe['high'].shift(3)
-        dataframe.loc[dataframe['fractal_down_condition'], 'fractal_down'] = dataframe['low'].shift(3)
-        
-        # Forward fill fractal levels (Pine: fd := down ? low[3] : nz(fd[1]))
-        dataframe['fractal_up'] = dataframe['fractal_up'].ffill()
-        dataframe['fractal_down'] = dataframe['fractal_down'].ffill()
-        
-        # Calculate base age (Pine: barssince(fuptf != fuptf[1]))
-        dataframe['base_changed'] = dataframe['fractal_down'] != dataframe['fractal_down'].shift(1)
-        dataframe['base_age'] = 0
-        
-        # Calculate bars since base change
-        base_change_indices = dataframe[dataframe['base_changed']].index
-        for i, idx in enumerate(dataframe.index):
-            if len(base_change_indices) > 0:
-                # Find most recent base change
-                recent_changes = base_change_indices[base_change_indices <= idx]
-                if len(recent_changes) > 0:
-                    last_change = recent_changes[-1]
-                    dataframe.loc[idx, 'base_age'] = idx - last_change
-        
-        return dataframe
-    
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         QFL Entry Logic
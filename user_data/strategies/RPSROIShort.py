@@ -1,11 +1,15 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
-import pandas as pd
-import numpy as np
+import sys
+from pathlib import Path
+
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, CategoricalParameter, BooleanParameter
-import talib.abstract as ta
+
+sys.path.append(str(Path(__file__).parent))
+from indicators import (downcast_indicators, drop_plot_columns, rsi_pnr_buy_variant, rsi_pnr_sell_variant, rsi_variant,
+                        shared_feature_bank, vwma_slope_variant, vwma_variant)
 
 
 class RPSROIShort(IStrategy):
@@ -52,6 +56,7 @@ class RPSROIShort(IStrategy):
     sell_rsi_lookback = IntParameter(5, 40, default=10, space='sell')
     sell_rsi_percentile_window = IntParameter(100, 200, default=150, space='sell')
     source_type = CategoricalParameter(['close', 'vwma', 'ema'], default='close', space='sell')
+    rsi_pnr_interpolation = 'linear'  # pandas rolling quantile ('nearest_rank' for Pine's ta.percentile_nearest_rank)
     
     # VWMA filter toggle and parameters (sell space)
     use_vwma_filter = BooleanParameter(default=True, space='sell')
@@ -60,6 +65,14 @@ class RPSROIShort(IStrategy):
     max_slope_slow = DecimalParameter(-5.0, 5.0, default=0.0, space='sell', decimals=2)
         
     # Plot configuration for web UI (red theme for shorts)
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = ['rsidiffMAX_prev', 'rsidiffMAX_threshold_prev', 'vwma_slow_slope_clean']
+    # Indicator columns no entry/exit logic reads; stored as float32 in lean backtests/hyperopt
+    downcast_columns = [
+        'vwma_slow_base', 'vwma_slow_slope_base', 'rsi_base', 'rsidiffMIN_base', 'rsidiffMIN_threshold_base',
+        'rsidiffMAX_base', 'rsidiffMAX_threshold_base'
+    ]
+    
     plot_config = {
         'main_plot': {
             'vwma_slow': {'color': '#990000', 'type': 'line'},   # Very dark red
@@ -81,95 +94,33 @@ class RPSROIShort(IStrategy):
         }
     }
     
-    def vwma(self, dataframe: DataFrame, period: int = 21) -> pd.Series:
-        """
-        Calculate Volume Weighted Moving Average
-        VWMA = Sum(Close * Volume) / Sum(Volume) over period
-        """
-        volume_price = dataframe['close'] * dataframe['volume']
-        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
-    
-    def calculate_slope_angle(self, ma_series: pd.Series, slope_bars: int) -> pd.Series:
-        """
-        Calculate slope using: slope = (ma - ma[slopeBars]) / slopeBars
-        Convert slope to angle: slopeAngle = arctan(slope) * 180 / pi
-        """
-        # Calculate slope over slope_bars periods
-        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
-        
-        # Convert slope to angle in degrees
-        slope_angle = np.arctan(slope) * 180 / np.pi
-        
-        return slope_angle
-    
-    def get_rsi_source(self, dataframe: DataFrame, source_type: str) -> pd.Series:
-        """
-        Get the RSI source based on the selected type
-        """
-        if source_type == 'close':
-            return dataframe['close']
-        elif source_type == 'vwma':
-            return self.vwma(dataframe, 20)  # Standard 20-period VWMA
-        elif source_type == 'ema':
-            return ta.EMA(dataframe, timeperiod=20)  # Standard 20-period EMA
-        else:
-            return dataframe['close']  # Default fallback
-    
-    def calculate_rsi_pnr_sell(self, rsi_series: pd.Series, lookback: int, percentile_window: int) -> tuple:
-        """
-        Calculate RSI PNR components for SELL signal (short entry)
-        Returns rsidiffMAX and its threshold
-        """
-        # Calculate rsidiffMAX for sell signal (how far RSI is above recent low)
-        rsidiffMAX = rsi_series - rsi_series.rolling(window=lookback).min()
-        
-        # Calculate 99th percentile threshold
-        rsidiffMAX_threshold = rsidiffMAX.rolling(window=percentile_window).quantile(0.99)
-        
-        return rsidiffMAX, rsidiffMAX_threshold
-    
-    def calculate_rsi_pnr_buy(self, rsi_series: pd.Series, lookback: int, percentile_window: int) -> tuple:
-        """
-        Calculate RSI PNR components for BUY signal (short exit)
-        Returns rsidiffMIN and its threshold
-        """
-        # Calculate rsidiffMIN for buy signal (how far RSI is below recent high)
-        rsidiffMIN = rsi_series.rolling(window=lookback).max() - rsi_series
-        
-        # Calculate 99th percentile threshold
-        rsidiffMIN_threshold = rsidiffMIN.rolling(window=percentile_window).quantile(0.99)
-        
-        return rsidiffMIN, rsidiffMIN_threshold
-    
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Populate indicators for RSI PNR Slope short strategy
         """
+        # Features shared with the long/short twin strategy and with populate_entry/exit_trend
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Calculate VWMA slow with default period (will be optimized in populate_entry_trend)
-        dataframe['vwma_slow_base'] = self.vwma(dataframe, 300)
+        dataframe['vwma_slow_base'] = vwma_variant(bank, 300)
         
         # Calculate slope angle of slow VWMA using default slope_bars (3)
-        dataframe['vwma_slow_slope_base'] = self.calculate_slope_angle(dataframe['vwma_slow_base'], 3)
+        dataframe['vwma_slow_slope_base'] = vwma_slope_variant(bank, 300, 3)
         
         # Calculate RSI with default parameters (will be recalculated with hyperopt params)
-        rsi_source = self.get_rsi_source(dataframe, 'close')
-        dataframe['rsi_base'] = ta.RSI(rsi_source, timeperiod=14)
+        dataframe['rsi_base'] = rsi_variant(bank, 'close')
         
         # Calculate RSI PNR for sell signal with default parameters
-        rsidiffMAX, rsidiffMAX_threshold = self.calculate_rsi_pnr_sell(
-            dataframe['rsi_base'], 10, 150
-        )
+        rsidiffMAX, rsidiffMAX_threshold = rsi_pnr_sell_variant(bank, 'close', 10, 150, self.rsi_pnr_interpolation)
         dataframe['rsidiffMAX_base'] = rsidiffMAX
         dataframe['rsidiffMAX_threshold_base'] = rsidiffMAX_threshold
         
         # Calculate RSI PNR for buy signal with default parameters
-        rsidiffMIN, rsidiffMIN_threshold = self.calculate_rsi_pnr_buy(
-            dataframe['rsi_base'], 10, 150
-        )
+        rsidiffMIN, rsidiffMIN_threshold = rsi_pnr_buy_variant(bank, 'close', 10, 150, self.rsi_pnr_interpolation)
         dataframe['rsidiffMIN_base'] = rsidiffMIN
         dataframe['rsidiffMIN_threshold_base'] = rsidiffMIN_threshold
         
-        return dataframe
+        return downcast_indicators(dataframe, self.config, self.downcast_columns)
     
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -177,21 +128,19 @@ class RPSROIShort(IStrategy):
         Use hyperopt parameters to modify base calculations
         """
         
-        # Recalculate VWMA slow with hyperopt parameters if they differ from defaults
-        if self.vwma_slow.value != 300 or self.slope_bars.value != 3:
-            dataframe['vwma_slow'] = self.vwma(dataframe, self.vwma_slow.value)
-            dataframe['vwma_slow_slope'] = self.calculate_slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
-        else:
-            dataframe['vwma_slow'] = dataframe['vwma_slow_base']
-            dataframe['vwma_slow_slope'] = dataframe['vwma_slow_slope_base']
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
+        # VWMA slow with hyperopt parameters (reused across epochs with the same values)
+        dataframe['vwma_slow'] = vwma_variant(bank, self.vwma_slow.value)
+        dataframe['vwma_slow_slope'] = vwma_slope_variant(bank, self.vwma_slow.value, self.slope_bars.value)
         
-        # Recalculate RSI with hyperopt parameters
-        rsi_source = self.get_rsi_source(dataframe, self.source_type.value)
-        dataframe['rsi'] = ta.RSI(rsi_source, timeperiod=14)
+        # RSI with hyperopt parameters
+        dataframe['rsi'] = rsi_variant(bank, self.source_type.value)
         
         # Calculate RSI PNR for sell signal with sell space hyperopt parameters
-        rsidiffMAX, rsidiffMAX_threshold = self.calculate_rsi_pnr_sell(
-            dataframe['rsi'], self.sell_rsi_lookback.value, self.sell_rsi_percentile_window.value
+        rsidiffMAX, rsidiffMAX_threshold = rsi_pnr_sell_variant(
+            bank, self.source_type.value, self.sell_rsi_lookback.value, self.sell_rsi_percentile_window.value,
+            self.rsi_pnr_interpolation
         )
         dataframe['rsidiffMAX'] = rsidiffMAX
         dataframe['rsidiffMAX_threshold'] = rsidiffMAX_threshold
@@ -224,7 +173,7 @@ class RPSROIShort(IStrategy):
         
         dataframe.loc[short_condition, 'enter_short'] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
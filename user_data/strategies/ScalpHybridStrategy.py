@@ -38,7 +38,9 @@ Usage
 © 2025 Mariano / ChatGPT — MIT-style licence. Use at your own risk.
 """
 
+import sys
 from functools import reduce
+from pathlib import Path
 from typing import Dict, List
 
 import numpy as np
@@ -46,6 +48,7 @@ import pandas as pd
 from pandas import DataFrame
 
 import talib.abstract as ta
+from freqtrade.exchange import timeframe_to_seconds
 from freqtrade.strategy import (
     BooleanParameter,
     CategoricalParameter,
@@ -55,6 +58,10 @@ from freqtrade.strategy import (
     merge_informative_pair,
 )
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import (REGIME_ROW_COLUMN, FeatureBank, LastRowSnapshots, RegimeFeatureBank, compact_regime_rows,
+                        downcast_indicators, drop_plot_columns, regime_row_column)
+
 
 class ScalpHybridStrategy(IStrategy):
     """Freqtrade strategy that supports both long and short scalping."""
@@ -116,16 +123,29 @@ class ScalpHybridStrategy(IStrategy):
         "stoploss_on_exchange": False,
     }
 
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns: List[str] = [
+        "buy_rsi_line", "sell_rsi_line", "adx_threshold_line", "cond1_rsi", "cond2_bb", "cond3_ema", "cond4_adx",
+        "cond5_vol", "cond6_trend", "conditions_met"
+    ]
+    # Indicator columns no entry/exit logic reads; stored as float32 in lean backtests/hyperopt
+    downcast_columns: List[str] = ["mfi", "stoch_k", "stoch_d"]
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        # Last analyzed ATR per pair for the stake and stoploss callbacks, read once per candle
+        self.last_row_snapshots = LastRowSnapshots(self.timeframe, timeframe_to_seconds(self.timeframe), ["atr"])
+        # EMAs per pair for the base and informative candles, computed for the lengths epochs select
+        self.ema_features: Dict[str, FeatureBank] = {}
+        self.informative_features: Dict[str, RegimeFeatureBank] = {}
+
     # ============================
     # Indicator calculation
     # ============================
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:  # type: ignore[override]
         # --- Base timeframe (5 m) ---
-        ema_fast_len = int(self.ema_fast_period.value)
-        ema_slow_len = int(self.ema_slow_period.value)
-
-        dataframe["ema_fast"] = ta.EMA(dataframe, timeperiod=ema_fast_len)
-        dataframe["ema_slow"] = ta.EMA(dataframe, timeperiod=ema_slow_len)
+        # EMAs for the fast/slow lengths come from the feature banks in select_indicator_variants()
+        self.feature_bank(self.ema_features, metadata["pair"], dataframe, FeatureBank)
 
         dataframe["rsi"] = ta.RSI(dataframe, timeperiod=14)
         dataframe["mfi"] = ta.MFI(dataframe)
@@ -133,27 +153,27 @@ class ScalpHybridStrategy(IStrategy):
         slowk, slowd = ta.STOCH(dataframe)
         dataframe["stoch_k"], dataframe["stoch_d"] = slowk, slowd
 
-        # Bollinger Bands using hyperopt-able multiplier
-        bb = ta.BBANDS(dataframe, timeperiod=20, nbdevup=self.bb_mult.value, nbdevdn=self.bb_mult.value, matype=0)
-        dataframe["bb_lower"] = bb['lowerband']
-        dataframe["bb_mid"] = bb['middleband']
-        dataframe["bb_upper"] = bb['upperband']
-        dataframe["bb_width"] = (bb['upperband'] - bb['lowerband']) / bb['middleband']
+        # Bollinger Bands stored as mid + std; the bands for the hyperopt-able multiplier are
+        # derived in select_indicator_variants() exactly as BBANDS computes them
+        dataframe["bb_mid"] = ta.SMA(dataframe, timeperiod=20)
+        dataframe["bb_std"] = ta.STDDEV(dataframe, timeperiod=20, nbdev=1.0)
 
         dataframe["atr"] = ta.ATR(dataframe, timeperiod=14)
         dataframe["adx"] = ta.ADX(dataframe)
 
         # Volume filter
         dataframe["vol_mean"] = dataframe["volume"].rolling(20).mean()
-        dataframe["vol_ok"] = dataframe["volume"] > dataframe["vol_mean"] * self.vol_mult.value
 
         # --- Higher TF (1 h) ---
         informative = self.dp.get_pair_dataframe(pair=metadata["pair"], timeframe=self.informative_tf)
-        informative["ema_fast"] = ta.EMA(informative, timeperiod=ema_fast_len)
-        informative["ema_slow"] = ta.EMA(informative, timeperiod=ema_slow_len)
-        informative["trend_ok"] = informative["ema_fast"] > informative["ema_slow"]
+        bank = self.feature_bank(self.informative_features, metadata["pair"], informative, RegimeFeatureBank)
 
+        # Only the 1h row numbers are merged; the 1h trend is mapped through them for each epoch's lengths
+        informative = informative[["date"]].copy()
+        informative[REGIME_ROW_COLUMN] = bank.row_numbers()
         dataframe = merge_informative_pair(dataframe, informative, self.timeframe, self.informative_tf, ffill=True)
+        dataframe = compact_regime_rows(dataframe, self.informative_tf)
+        dataframe = self.select_indicator_variants(dataframe, metadata)
 
         # Add plotting reference lines and condition indicators
         dataframe['buy_rsi_line'] = self.buy_rsi.value
@@ -178,12 +198,53 @@ class ScalpHybridStrategy(IStrategy):
             dataframe['cond6_trend']
         )
 
+        dataframe = drop_plot_columns(dataframe, self.plot_only_columns, self.config)
+        return downcast_indicators(dataframe, self.config, self.downcast_columns)
+
+    @staticmethod
+    def feature_bank(banks: Dict[str, FeatureBank], pair: str, candles: DataFrame, bank_type) -> FeatureBank:
+        """The pair's bank in banks, rebuilt when its candles changed"""
+        bank = banks.get(pair)
+        if bank is None or not bank.matches(candles):
+            bank = banks[pair] = bank_type(candles)
+        return bank
+
+    @staticmethod
+    def ema_variant(bank: FeatureBank, period: int) -> pd.Series:
+        """EMA of the bank's candles, computed the first time an epoch selects this length"""
+        return bank.get(("ema", period), lambda candles: ta.EMA(candles, timeperiod=period))
+
+    def select_indicator_variants(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Derive the parameter-dependent columns from the feature banks and precomputed columns.
+        Cheap enough to run every epoch, so hyperopt explores these parameters.
+        """
+        ema_fast_len = int(self.ema_fast_period.value)
+        ema_slow_len = int(self.ema_slow_period.value)
+
+        # Banks hold the full candles, so trimmed epoch frames pick up the same EMA values by index
+        bank = self.ema_features[metadata["pair"]]
+        dataframe["ema_fast"] = self.ema_variant(bank, ema_fast_len)
+        dataframe["ema_slow"] = self.ema_variant(bank, ema_slow_len)
+
+        bb_offset = dataframe["bb_std"] * self.bb_mult.value
+        dataframe["bb_lower"] = dataframe["bb_mid"] - bb_offset
+        dataframe["bb_upper"] = dataframe["bb_mid"] + bb_offset
+        dataframe["bb_width"] = (dataframe["bb_upper"] - dataframe["bb_lower"]) / dataframe["bb_mid"]
+
+        dataframe["vol_ok"] = dataframe["volume"] > dataframe["vol_mean"] * self.vol_mult.value
+        informative_bank = self.informative_features[metadata["pair"]]
+        trend_ok = self.ema_variant(informative_bank, ema_fast_len) > self.ema_variant(informative_bank, ema_slow_len)
+        dataframe["trend_ok_1h"] = informative_bank.to_timeframe(
+            trend_ok, dataframe[regime_row_column(self.informative_tf)]
+        ).astype(bool)
         return dataframe
 
     # ============================
     # Entry logic — LONG
     # ============================
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:  # type: ignore[override]
+        dataframe = self.select_indicator_variants(dataframe, metadata)
         conditions: List[pd.Series] = []
 
         conditions.append(dataframe["rsi"] < self.buy_rsi.value)
@@ -201,6 +262,7 @@ class ScalpHybridStrategy(IStrategy):
     # Entry logic — SHORT
     # ============================
     def populate_entry_short_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:  # type: ignore[override]
+        dataframe = self.select_indicator_variants(dataframe, metadata)
         conditions: List[pd.Series] = []
 
         conditions.append(dataframe["rsi"] > self.sell_rsi.value)
@@ -218,6 +280,7 @@ class ScalpHybridStrategy(IStrategy):
     # Exit logic — LONG
     # ============================
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:  # type: ignore[override]
+        dataframe = self.select_indicator_variants(dataframe, metadata)
         conditions: List[pd.Series] = []
 
         conditions.append(dataframe["rsi"] > self.sell_rsi.value)
@@ -232,6 +295,7 @@ class ScalpHybridStrategy(IStrategy):
     # Exit logic — SHORT
     # ============================
     def populate_exit_short_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:  # type: ignore[override]
+        dataframe = self.select_indicator_variants(dataframe, metadata)
         conditions: List[pd.Series] = []
 
         conditions.append(dataframe["rsi"] < self.buy_rsi.value)
@@ -248,11 +312,11 @@ class ScalpHybridStrategy(IStrategy):
     def custom_stake_amount(self, pair: str, current_time, current_rate, proposed_stake, min_stake, max_stake, **kwargs):
         """Calculate position size based on risk per trade."""
         try:
-            dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-            if dataframe is None or len(dataframe) < 1:
+            last_row = self.last_row_snapshots.get(self.dp, pair, current_time)
+            if last_row is None:
                 return proposed_stake
                 
-            last_atr = dataframe.iloc[-1]["atr"]
+            last_atr = last_row["atr"]
             
             # Calculate stop percentage
             static_stop_pct = abs(self.stoploss)
@@ -281,11 +345,11 @@ class ScalpHybridStrategy(IStrategy):
     def custom_stoploss(self, pair: str, trade, current_time, current_rate, current_profit, **kwargs):  # noqa: N802,E501
         """Tighter dynamic SL: once in profit, follow price at 1 × ATR below/above close."""
         try:
-            dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-            if dataframe is None or len(dataframe) < 1:
+            last_row = self.last_row_snapshots.get(self.dp, pair, current_time)
+            if last_row is None:
                 return self.stoploss
 
-            last_atr = dataframe.iloc[-1]["atr"]
+            last_atr = last_row["atr"]
             if current_profit > 0.01:
                 # Long trades: raise SL; Short trades: lower SL
                 if trade.is_short:
@@ -1,12 +1,18 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, merge_informative_pair
 import talib.abstract as ta
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import (REGIME_ROW_COLUMN, RegimeFeatureBank, compact_regime_rows, drop_plot_columns, regime_row_column,
+                        shared_feature_bank, slope_angle, vwma_variant)
+
 
 class VWMAStrategyATRRegimeShort(IStrategy):
     """
@@ -64,6 +70,11 @@ class VWMAStrategyATRRegimeShort(IStrategy):
     atr_ma_period = IntParameter(30, 100, default=50, space='sell')
     atr_multiplier = DecimalParameter(1.0, 3.0, default=1.5, space='sell', decimals=2)
     
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        # Regime feature banks per pair; kept on the instance so hyperopt workers receive them
+        self.regime_features = {}
+    
     # Informative pairs - define higher timeframe for the same pair
     def informative_pairs(self):
         pairs = self.dp.current_whitelist() if self.dp else []
@@ -71,6 +82,11 @@ class VWMAStrategyATRRegimeShort(IStrategy):
         return informative_pairs
     
     # Plot configuration for web UI (red theme for shorts)
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = [
+        'vwma_fast_prev', 'vwma_medium_prev', 'vwma_slow_slope_clean', 'vwma_crossover_plot', 'vwma_crossunder_plot'
+    ]
+    
     plot_config = {
         'main_plot': {
             'vwma_fast': {'color': '#ff6666', 'type': 'line'},  # Light red
@@ -93,26 +109,47 @@ class VWMAStrategyATRRegimeShort(IStrategy):
         }
     }
     
-    def vwma(self, dataframe: DataFrame, period: int = 21) -> pd.Series:
+    def regime_feature_bank(self, pair: str, informative: DataFrame) -> RegimeFeatureBank:
         """
-        Calculate Volume Weighted Moving Average
-        VWMA = Sum(Close * Volume) / Sum(Volume) over period
+        Higher timeframe features for every regime parameter value, reused while the candles are unchanged
         """
-        volume_price = dataframe['close'] * dataframe['volume']
-        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
+        bank = self.regime_features.get(pair)
+        if bank is None or not bank.matches(informative):
+            bank = RegimeFeatureBank(informative)
+            for period in self.atr_period.range:
+                bank.get(('atr', period), lambda df, period=period: ta.ATR(df, timeperiod=period))
+            self.regime_features[pair] = bank
+        return bank
     
-    def calculate_slope_angle(self, ma_series: pd.Series, slope_bars: int) -> pd.Series:
+    def calculate_regime(self, bank: RegimeFeatureBank) -> DataFrame:
         """
-        Calculate slope using: slope = (ma - ma[slopeBars]) / slopeBars
-        Convert slope to angle: slopeAngle = arctan(slope) * 180 / pi
+        ATR volatility regime for the current parameter values, on the higher timeframe
         """
-        # Calculate slope over slope_bars periods
-        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
+        atr_period = self.atr_period.value
+        atr_ma_period = self.atr_ma_period.value
         
-        # Convert slope to angle in degrees
-        slope_angle = np.arctan(slope) * 180 / np.pi
+        regime = DataFrame(index=bank.informative.index)
+        regime['atr'] = bank.get(('atr', atr_period), lambda df: ta.ATR(df, timeperiod=atr_period))
+        regime['atr_ma'] = bank.get(('atr_ma', atr_period, atr_ma_period),
+                                    lambda df: ta.SMA(regime['atr'], timeperiod=atr_ma_period))
         
-        return slope_angle
+        # Calculate high volatility regime
+        regime['high_vol_regime'] = (
+            regime['atr'] > (self.atr_multiplier.value * regime['atr_ma'])
+        ).astype(int)
+        return regime
+    
+    def select_regime(self, dataframe: DataFrame, metadata: dict, regime_name: str) -> DataFrame:
+        """
+        Rebuild a regime column for the current parameter values from the pair's feature bank
+        Keeps the regime parameters searchable without recomputing or re-merging the higher timeframe
+        """
+        bank = self.regime_features.get(metadata['pair'])
+        row_column = regime_row_column(self.regime_timeframe)
+        if bank is not None and row_column in dataframe.columns:
+            regime = self.calculate_regime(bank)
+            dataframe[f'{regime_name}_{self.regime_timeframe}'] = bank.to_timeframe(regime[regime_name], dataframe[row_column])
+        return dataframe
     
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -120,13 +157,16 @@ class VWMAStrategyATRRegimeShort(IStrategy):
         Calculate 3 VWMAs with different lengths on 15m timeframe
         Calculate ATR regime on 4h timeframe
         """
+        # VWMAs shared with the long/short twin strategy and with populate_entry_trend
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Calculate base VWMAs with default periods (will be optimized in populate_entry_trend)
-        dataframe['vwma_fast_base'] = self.vwma(dataframe, 20)
-        dataframe['vwma_medium_base'] = self.vwma(dataframe, 100)
-        dataframe['vwma_slow_base'] = self.vwma(dataframe, 300)
+        dataframe['vwma_fast_base'] = vwma_variant(bank, 20)
+        dataframe['vwma_medium_base'] = vwma_variant(bank, 100)
+        dataframe['vwma_slow_base'] = vwma_variant(bank, 300)
         
         # Calculate slope angle of slow VWMA using default slope_bars (3)
-        dataframe['vwma_slow_slope_base'] = self.calculate_slope_angle(dataframe['vwma_slow_base'], 3)
+        dataframe['vwma_slow_slope_base'] = slope_angle(dataframe['vwma_slow_base'], 3)
         
         # Add regime filter from higher timeframe
         if self.dp:
@@ -136,21 +176,23 @@ class VWMAStrategyATRRegimeShort(IStrategy):
                 timeframe=self.regime_timeframe
             )
             
-            # Calculate ATR and ATR moving average on higher timeframe
-            informative['atr'] = ta.ATR(informative, timeperiod=self.atr_period.value)
-            informative[f'atr_ma'] = ta.SMA(informative['atr'], timeperiod=self.atr_ma_period.value)
+            # Regime features for every parameter value, built once per pair and candle set
+            bank = self.regime_feature_bank(metadata['pair'], informative)
             
-            # Calculate high volatility regime
-            informative['high_vol_regime'] = (
-                informative['atr'] > (self.atr_multiplier.value * informative['atr_ma'])
-            ).astype(int)
+            # Regime for the current values (plotting); entries rebuild it with each epoch's values
+            regime = self.calculate_regime(bank)
+            informative['atr'] = regime['atr']
+            informative['atr_ma'] = regime['atr_ma']
+            informative['high_vol_regime'] = regime['high_vol_regime']
             
             # Merge informative data properly to avoid lookahead bias
+            informative[REGIME_ROW_COLUMN] = bank.row_numbers()
             dataframe = merge_informative_pair(
                 dataframe, informative,
                 self.timeframe, self.regime_timeframe,
                 ffill=True
             )
+            dataframe = compact_regime_rows(dataframe, self.regime_timeframe)
         
         return dataframe
     
@@ -161,21 +203,23 @@ class VWMAStrategyATRRegimeShort(IStrategy):
         Use hyperopt parameters to modify base calculations
         """
         
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Recalculate VWMAs with hyperopt parameters if they differ from defaults
         if self.vwma_fast.value != 20:
-            dataframe['vwma_fast'] = self.vwma(dataframe, self.vwma_fast.value)
+            dataframe['vwma_fast'] = vwma_variant(bank, self.vwma_fast.value)
         else:
             dataframe['vwma_fast'] = dataframe['vwma_fast_base']
         
         if self.vwma_medium.value != 100:
-            dataframe['vwma_medium'] = self.vwma(dataframe, self.vwma_medium.value)
+            dataframe['vwma_medium'] = vwma_variant(bank, self.vwma_medium.value)
         else:
             dataframe['vwma_medium'] = dataframe['vwma_medium_base']
         
         if self.vwma_slow.value != 300 or self.slope_bars.value != 3:
-            dataframe['vwma_slow'] = self.vwma(dataframe, self.vwma_slow.value)
+            dataframe['vwma_slow'] = vwma_variant(bank, self.vwma_slow.value)
             # Recalculate slope angle with hyperopt parameters
-            dataframe['vwma_slow_slope'] = self.calculate_slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
+            dataframe['vwma_slow_slope'] = slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
         else:
             dataframe['vwma_slow'] = dataframe['vwma_slow_base']
             dataframe['vwma_slow_slope'] = dataframe['vwma_slow_slope_base']
@@ -204,6 +248,9 @@ class VWMAStrategyATRRegimeShort(IStrategy):
         # Handle NaN values in slope angle
         dataframe['vwma_slow_slope_clean'] = dataframe['vwma_slow_slope'].fillna(0)
         
+        # Regime for this epoch's parameter values
+        dataframe = self.select_regime(dataframe, metadata, 'high_vol_regime')
+        
         # Check if regime data is available
         regime_column = f'high_vol_regime_{self.regime_timeframe}'
         if regime_column in dataframe.columns:
@@ -224,7 +271,7 @@ class VWMAStrategyATRRegimeShort(IStrategy):
         
         dataframe.loc[short_condition, 'enter_short'] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
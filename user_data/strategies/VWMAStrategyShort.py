@@ -1,11 +1,16 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import drop_plot_columns, shared_feature_bank, slope_angle, vwma_variant
+
 
 class VWMAStrategyShort(IStrategy):
     """
@@ -53,6 +58,11 @@ class VWMAStrategyShort(IStrategy):
     max_slope_slow = DecimalParameter(-5.0, 5.0, default=0.0, space='sell', decimals=2)
     
     # Plot configuration for web UI (red theme for shorts)
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = [
+        'vwma_fast_prev', 'vwma_medium_prev', 'vwma_slow_slope_clean', 'vwma_crossover_plot', 'vwma_crossunder_plot'
+    ]
+    
     plot_config = {
         'main_plot': {
             'vwma_fast': {'color': '#ff6666', 'type': 'line'},  # Light red
@@ -70,39 +80,21 @@ class VWMAStrategyShort(IStrategy):
         }
     }
     
-    def vwma(self, dataframe: DataFrame, period: int = 21) -> pd.Series:
-        """
-        Calculate Volume Weighted Moving Average
-        VWMA = Sum(Close * Volume) / Sum(Volume) over period
-        """
-        volume_price = dataframe['close'] * dataframe['volume']
-        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
-    
-    def calculate_slope_angle(self, ma_series: pd.Series, slope_bars: int) -> pd.Series:
-        """
-        Calculate slope using: slope = (ma - ma[slopeBars]) / slopeBars
-        Convert slope to angle: slopeAngle = arctan(slope) * 180 / pi
-        """
-        # Calculate slope over slope_bars periods
-        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
-        
-        # Convert slope to angle in degrees
-        slope_angle = np.arctan(slope) * 180 / np.pi
-        
-        return slope_angle
-    
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Populate indicators for VWMA short strategy
         Calculate 3 VWMAs with different lengths on 15m timeframe
         """
+        # VWMAs shared with the long/short twin strategy and with populate_entry_trend
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Calculate base VWMAs with default periods (will be optimized in populate_entry_trend)
-        dataframe['vwma_fast_base'] = self.vwma(dataframe, 20)
-        dataframe['vwma_medium_base'] = self.vwma(dataframe, 100)
-        dataframe['vwma_slow_base'] = self.vwma(dataframe, 300)
+        dataframe['vwma_fast_base'] = vwma_variant(bank, 20)
+        dataframe['vwma_medium_base'] = vwma_variant(bank, 100)
+        dataframe['vwma_slow_base'] = vwma_variant(bank, 300)
         
         # Calculate slope angle of slow VWMA using default slope_bars (3)
-        dataframe['vwma_slow_slope_base'] = self.calculate_slope_angle(dataframe['vwma_slow_base'], 3)
+        dataframe['vwma_slow_slope_base'] = slope_angle(dataframe['vwma_slow_base'], 3)
         
         return dataframe
     
@@ -112,21 +104,23 @@ class VWMAStrategyShort(IStrategy):
         Use hyperopt parameters to modify base calculations
         """
         
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Recalculate VWMAs with hyperopt parameters if they differ from defaults
         if self.vwma_fast.value != 20:
-            dataframe['vwma_fast'] = self.vwma(dataframe, self.vwma_fast.value)
+            dataframe['vwma_fast'] = vwma_variant(bank, self.vwma_fast.value)
         else:
             dataframe['vwma_fast'] = dataframe['vwma_fast_base']
         
         if self.vwma_medium.value != 100:
-            dataframe['vwma_medium'] = self.vwma(dataframe, self.vwma_medium.value)
+            dataframe['vwma_medium'] = vwma_variant(bank, self.vwma_medium.value)
         else:
             dataframe['vwma_medium'] = dataframe['vwma_medium_base']
         
         if self.vwma_slow.value != 300 or self.slope_bars.value != 3:
-            dataframe['vwma_slow'] = self.vwma(dataframe, self.vwma_slow.value)
+            dataframe['vwma_slow'] = vwma_variant(bank, self.vwma_slow.value)
             # Recalculate slope angle with hyperopt parameters
-            dataframe['vwma_slow_slope'] = self.calculate_slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
+            dataframe['vwma_slow_slope'] = slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
         else:
             dataframe['vwma_slow'] = dataframe['vwma_slow_base']
             dataframe['vwma_slow_slope'] = dataframe['vwma_slow_slope_base']
@@ -164,7 +158,7 @@ class VWMAStrategyShort(IStrategy):
         
         dataframe.loc[short_condition, 'enter_short'] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
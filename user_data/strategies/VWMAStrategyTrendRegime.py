@@ -1,12 +1,18 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, merge_informative_pair
 import talib.abstract as ta
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import (REGIME_ROW_COLUMN, RegimeFeatureBank, compact_regime_rows, drop_plot_columns, regime_row_column,
+                        shared_feature_bank, slope_angle, vwma_variant)
+
 
 class VWMAStrategyTrendRegime(IStrategy):
     """
@@ -66,12 +72,22 @@ class VWMAStrategyTrendRegime(IStrategy):
     adx_period = IntParameter(10, 20, default=14, space='buy')
     adx_threshold = IntParameter(20, 30, default=25, space='buy')
     
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        # Regime feature banks per pair; kept on the instance so hyperopt workers receive them
+        self.regime_features = {}
+    
     # Informative pairs - define higher timeframe for the same pair
     def informative_pairs(self):
         pairs = self.dp.current_whitelist() if self.dp else []
         informative_pairs = [(pair, self.regime_timeframe) for pair in pairs]
         return informative_pairs
     
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = [
+        'vwma_fast_prev', 'vwma_medium_prev', 'vwma_slow_slope_clean', 'vwma_crossover_plot', 'vwma_crossunder_plot'
+    ]
+    
     # Plot configuration for web UI
     plot_config = {
         'main_plot': {
@@ -94,26 +110,51 @@ class VWMAStrategyTrendRegime(IStrategy):
         }
     }
     
-    def vwma(self, dataframe: DataFrame, period: int = 21) -> pd.Series:
+    def regime_feature_bank(self, pair: str, informative: DataFrame) -> RegimeFeatureBank:
         """
-        Calculate Volume Weighted Moving Average
-        VWMA = Sum(Close * Volume) / Sum(Volume) over period
+        Higher timeframe features for every regime parameter value, reused while the candles are unchanged
         """
-        volume_price = dataframe['close'] * dataframe['volume']
-        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
+        bank = self.regime_features.get(pair)
+        if bank is None or not bank.matches(informative):
+            bank = RegimeFeatureBank(informative)
+            for period in sorted(set(self.ema_fast_period.range) | set(self.ema_slow_period.range)):
+                bank.get(('ema', period), lambda df, period=period: ta.EMA(df, timeperiod=period))
+            for period in self.adx_period.range:
+                bank.get(('adx', period), lambda df, period=period: ta.ADX(df, timeperiod=period))
+            self.regime_features[pair] = bank
+        return bank
     
-    def calculate_slope_angle(self, ma_series: pd.Series, slope_bars: int) -> pd.Series:
+    def calculate_regime(self, bank: RegimeFeatureBank) -> DataFrame:
         """
-        Calculate slope using: slope = (ma - ma[slopeBars]) / slopeBars
-        Convert slope to angle: slopeAngle = arctan(slope) * 180 / pi
+        EMA/ADX trend regime for the current parameter values, on the higher timeframe
         """
-        # Calculate slope over slope_bars periods
-        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
+        ema_fast_period = self.ema_fast_period.value
+        ema_slow_period = self.ema_slow_period.value
+        adx_period = self.adx_period.value
         
-        # Convert slope to angle in degrees
-        slope_angle = np.arctan(slope) * 180 / np.pi
+        regime = DataFrame(index=bank.informative.index)
+        regime['ema_fast'] = bank.get(('ema', ema_fast_period), lambda df: ta.EMA(df, timeperiod=ema_fast_period))
+        regime['ema_slow'] = bank.get(('ema', ema_slow_period), lambda df: ta.EMA(df, timeperiod=ema_slow_period))
+        regime['adx'] = bank.get(('adx', adx_period), lambda df: ta.ADX(df, timeperiod=adx_period))
         
-        return slope_angle
+        # For long strategy: trending up when EMA_fast > EMA_slow AND ADX > threshold
+        regime['trend_regime'] = (
+            (regime['ema_fast'] > regime['ema_slow']) & 
+            (regime['adx'] > self.adx_threshold.value)
+        ).astype(int)
+        return regime
+    
+    def select_regime(self, dataframe: DataFrame, metadata: dict, regime_name: str) -> DataFrame:
+        """
+        Rebuild a regime column for the current parameter values from the pair's feature bank
+        Keeps the regime parameters searchable without recomputing or re-merging the higher timeframe
+        """
+        bank = self.regime_features.get(metadata['pair'])
+        row_column = regime_row_column(self.regime_timeframe)
+        if bank is not None and row_column in dataframe.columns:
+            regime = self.calculate_regime(bank)
+            dataframe[f'{regime_name}_{self.regime_timeframe}'] = bank.to_timeframe(regime[regime_name], dataframe[row_column])
+        return dataframe
     
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -121,13 +162,16 @@ class VWMAStrategyTrendRegime(IStrategy):
         Calculate 3 VWMAs with different lengths on 15m timeframe
         Calculate EMA crossover and ADX on 4h timeframe for trend regime
         """
+        # VWMAs shared with the long/short twin strategy and with populate_entry_trend
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Calculate base VWMAs with default periods (will be optimized in populate_entry_trend)
-        dataframe['vwma_fast_base'] = self.vwma(dataframe, 20)
-        dataframe['vwma_medium_base'] = self.vwma(dataframe, 100)
-        dataframe['vwma_slow_base'] = self.vwma(dataframe, 300)
+        dataframe['vwma_fast_base'] = vwma_variant(bank, 20)
+        dataframe['vwma_medium_base'] = vwma_variant(bank, 100)
+        dataframe['vwma_slow_base'] = vwma_variant(bank, 300)
         
         # Calculate slope angle of slow VWMA using default slope_bars (3)
-        dataframe['vwma_slow_slope_base'] = self.calculate_slope_angle(dataframe['vwma_slow_base'], 3)
+        dataframe['vwma_slow_slope_base'] = slope_angle(dataframe['vwma_slow_base'], 3)
         
         # Add regime filter from higher timeframe
         if self.dp:
@@ -137,26 +181,24 @@ class VWMAStrategyTrendRegime(IStrategy):
                 timeframe=self.regime_timeframe
             )
             
-            # Calculate EMAs on higher timeframe
-            informative['ema_fast'] = ta.EMA(informative, timeperiod=self.ema_fast_period.value)
-            informative['ema_slow'] = ta.EMA(informative, timeperiod=self.ema_slow_period.value)
-            
-            # Calculate ADX on higher timeframe
-            informative['adx'] = ta.ADX(informative, timeperiod=self.adx_period.value)
+            # Regime features for every parameter value, built once per pair and candle set
+            bank = self.regime_feature_bank(metadata['pair'], informative)
             
-            # Calculate trend regime
-            # For long strategy: trending up when EMA_fast > EMA_slow AND ADX > threshold
-            informative['trend_regime'] = (
-                (informative['ema_fast'] > informative['ema_slow']) & 
-                (informative['adx'] > self.adx_threshold.value)
-            ).astype(int)
+            # Regime for the current values (plotting); entries rebuild it with each epoch's values
+            regime = self.calculate_regime(bank)
+            informative['ema_fast'] = regime['ema_fast']
+            informative['ema_slow'] = regime['ema_slow']
+            informative['adx'] = regime['adx']
+            informative['trend_regime'] = regime['trend_regime']
             
             # Merge informative data properly to avoid lookahead bias
+            informative[REGIME_ROW_COLUMN] = bank.row_numbers()
             dataframe = merge_informative_pair(
                 dataframe, informative,
                 self.timeframe, self.regime_timeframe,
                 ffill=True
             )
+            dataframe = compact_regime_rows(dataframe, self.regime_timeframe)
         
         return dataframe
     
@@ -167,21 +209,23 @@ class VWMAStrategyTrendRegime(IStrategy):
         Use hyperopt parameters to modify base calculations
         """
         
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Recalculate VWMAs with hyperopt parameters if they differ from defaults
         if self.vwma_fast.value != 20:
-            dataframe['vwma_fast'] = self.vwma(dataframe, self.vwma_fast.value)
+            dataframe['vwma_fast'] = vwma_variant(bank, self.vwma_fast.value)
         else:
             dataframe['vwma_fast'] = dataframe['vwma_fast_base']
         
         if self.vwma_medium.value != 100:
-            dataframe['vwma_medium'] = self.vwma(dataframe, self.vwma_medium.value)
+            dataframe['vwma_medium'] = vwma_variant(bank, self.vwma_medium.value)
         else:
             dataframe['vwma_medium'] = dataframe['vwma_medium_base']
         
         if self.vwma_slow.value != 300 or self.slope_bars.value != 3:
-            dataframe['vwma_slow'] = self.vwma(dataframe, self.vwma_slow.value)
+            dataframe['vwma_slow'] = vwma_variant(bank, self.vwma_slow.value)
             # Recalculate slope angle with hyperopt parameters
-            dataframe['vwma_slow_slope'] = self.calculate_slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
+            dataframe['vwma_slow_slope'] = slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
         else:
             dataframe['vwma_slow'] = dataframe['vwma_slow_base']
             dataframe['vwma_slow_slope'] = dataframe['vwma_slow_slope_base']
@@ -210,6 +254,9 @@ class VWMAStrategyTrendRegime(IStrategy):
         # Handle NaN values in slope angle
         dataframe['vwma_slow_slope_clean'] = dataframe['vwma_slow_slope'].fillna(0)
         
+        # Regime for this epoch's parameter values
+        dataframe = self.select_regime(dataframe, metadata, 'trend_regime')
+        
         # Check if regime data is available
         regime_column = f'trend_regime_{self.regime_timeframe}'
         if regime_column in dataframe.columns:
@@ -229,7 +276,7 @@ class VWMAStrategyTrendRegime(IStrategy):
         
         dataframe.loc[long_condition, 'enter_long'] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -1,14 +1,20 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 from pandas import DataFrame
 from datetime import datetime, timedelta
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, BooleanParameter
+from freqtrade.exchange import timeframe_to_seconds
 from freqtrade.optimize.space import SKDecimal
 import talib.abstract as ta
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import LastRowSnapshots, drop_plot_columns, shared_feature_bank, slope_angle, vwma_variant
+
 
 class VWMAStrategyV3(IStrategy):
     """
@@ -99,6 +105,12 @@ class VWMAStrategyV3(IStrategy):
         def stoploss_space():
             return [SKDecimal(-0.05, -0.01, decimals=3, name='stoploss')]
     
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = [
+        'trade_entry_time', 'rsi', 'volume_threshold_line', 'vwma_fast_prev', 'vwma_medium_prev',
+        'vwma_slow_slope_clean', 'buy_signal', 'time_exit_signal'
+    ]
+    
     # Plot configuration for web UI
     plot_config = {
         'main_plot': {
@@ -125,26 +137,10 @@ class VWMAStrategyV3(IStrategy):
         }
     }
     
-    def vwma(self, dataframe: DataFrame, period: int = 21) -> pd.Series:
-        """
-        Calculate Volume Weighted Moving Average
-        VWMA = Sum(Close * Volume) / Sum(Volume) over period
-        """
-        volume_price = dataframe['close'] * dataframe['volume']
-        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
-    
-    def calculate_slope_angle(self, ma_series: pd.Series, slope_bars: int) -> pd.Series:
-        """
-        Calculate slope using: slope = (ma - ma[slopeBars]) / slopeBars
-        Convert slope to angle: slopeAngle = arctan(slope) * 180 / pi
-        """
-        # Calculate slope over slope_bars periods
-        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
-        
-        # Convert slope to angle in degrees
-        slope_angle = np.arctan(slope) * 180 / np.pi
-        
-        return slope_angle
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        # Last analyzed ATR values per pair for custom_stoploss
+        self.last_row_snapshots = LastRowSnapshots(self.timeframe, timeframe_to_seconds(self.timeframe), ['atr', 'atr_base'])
     
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -153,13 +149,16 @@ class VWMAStrategyV3(IStrategy):
         Add volume moving average for threshold comparison
         Phase 2: Add ATR for dynamic stop loss calculation
         """
+        # VWMAs shared with the long/short twin strategy and with populate_entry_trend
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Calculate base VWMAs with default periods (will be optimized in populate_entry_trend)
-        dataframe['vwma_fast_base'] = self.vwma(dataframe, 20)
-        dataframe['vwma_medium_base'] = self.vwma(dataframe, 100)
-        dataframe['vwma_slow_base'] = self.vwma(dataframe, 300)
+        dataframe['vwma_fast_base'] = vwma_variant(bank, 20)
+        dataframe['vwma_medium_base'] = vwma_variant(bank, 100)
+        dataframe['vwma_slow_base'] = vwma_variant(bank, 300)
         
         # Calculate slope angle of slow VWMA using default slope_bars (3)
-        dataframe['vwma_slow_slope_base'] = self.calculate_slope_angle(dataframe['vwma_slow_base'], 3)
+        dataframe['vwma_slow_slope_base'] = slope_angle(dataframe['vwma_slow_base'], 3)
         
         # Volume moving average for threshold comparison (from V2)
         dataframe['volume_ma_base'] = dataframe['volume'].rolling(window=20).mean()
@@ -173,6 +172,7 @@ class VWMAStrategyV3(IStrategy):
         # Prepare columns for future enhancements
         dataframe['rsi'] = 0  # Placeholder for future Phase 3
         
+        dataframe = drop_plot_columns(dataframe, self.plot_only_columns, self.config)
         return dataframe
     
     def custom_stoploss(self, pair: str, trade, current_time: datetime, current_rate: float, current_profit: float, after_fill: bool, **kwargs) -> float:
@@ -180,24 +180,21 @@ class VWMAStrategyV3(IStrategy):
         Phase 2.1: ATR-based dynamic stop loss implementation
         Calculate stop loss based on ATR to adapt to market volatility
         """
-        dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
+        # Only use ATR stop loss if enabled
+        if not self.use_atr_stoploss.value:
+            return self.stoploss
         
-        if dataframe is None or len(dataframe) == 0:
+        # Latest ATR values, read once per pair per candle
+        last_row = self.last_row_snapshots.get(self.dp, pair, current_time)
+        if last_row is None:
             return self.stoploss
         
         # Get the latest ATR value
-        if 'atr' in dataframe.columns:
-            current_atr = dataframe['atr'].iloc[-1]
-        else:
-            current_atr = dataframe['atr_base'].iloc[-1]
+        current_atr = last_row.get('atr', last_row.get('atr_base'))
         
         if pd.isna(current_atr) or current_atr == 0:
             return self.stoploss
         
-        # Only use ATR stop loss if enabled
-        if not self.use_atr_stoploss.value:
-            return self.stoploss
-        
         # Calculate ATR-based stop loss
         # For long positions: stop_loss = -1 * (atr_multiplier * atr / entry_price)
         atr_stop_distance = (self.atr_multiplier.value * current_atr) / trade.open_rate
@@ -220,21 +217,23 @@ class VWMAStrategyV3(IStrategy):
         # Native trailing stop is configured at class level
         # No need to modify trailing stop parameters dynamically
         
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Recalculate VWMAs with hyperopt parameters if they differ from defaults
         if self.vwma_fast.value != 20:
-            dataframe['vwma_fast'] = self.vwma(dataframe, self.vwma_fast.value)
+            dataframe['vwma_fast'] = vwma_variant(bank, self.vwma_fast.value)
         else:
             dataframe['vwma_fast'] = dataframe['vwma_fast_base']
         
         if self.vwma_medium.value != 100:
-            dataframe['vwma_medium'] = self.vwma(dataframe, self.vwma_medium.value)
+            dataframe['vwma_medium'] = vwma_variant(bank, self.vwma_medium.value)
         else:
             dataframe['vwma_medium'] = dataframe['vwma_medium_base']
         
         if self.vwma_slow.value != 300 or self.slope_bars.value != 3:
-            dataframe['vwma_slow'] = self.vwma(dataframe, self.vwma_slow.value)
+            dataframe['vwma_slow'] = vwma_variant(bank, self.vwma_slow.value)
             # Recalculate slope angle with hyperopt parameters
-            dataframe['vwma_slow_slope'] = self.calculate_slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
+            dataframe['vwma_slow_slope'] = slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
         else:
             dataframe['vwma_slow'] = dataframe['vwma_slow_base']
             dataframe['vwma_slow_slope'] = dataframe['vwma_slow_slope_base']
@@ -291,7 +290,7 @@ class VWMAStrategyV3(IStrategy):
         # Add buy signal for plotting
         dataframe.loc[long_condition, 'buy_signal'] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -312,7 +311,7 @@ class VWMAStrategyV3(IStrategy):
         # Actual time-based exits are better handled in custom_exit() method
         # which has access to trade information
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def custom_exit(self, pair: str, trade, current_time: datetime, current_rate: float, current_profit: float, **kwargs):
         """
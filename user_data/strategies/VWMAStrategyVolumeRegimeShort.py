@@ -1,12 +1,18 @@
 # pragma pylint: disable=missing-docstring, invalid-name, too-few-public-methods
 # pragma pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals
 
+import sys
+from pathlib import Path
+
 import pandas as pd
-import numpy as np
 from pandas import DataFrame
 from freqtrade.strategy import IStrategy, DecimalParameter, IntParameter, merge_informative_pair
 import talib.abstract as ta
 
+sys.path.append(str(Path(__file__).parent))
+from indicators import (REGIME_ROW_COLUMN, RegimeFeatureBank, compact_regime_rows, drop_plot_columns, on_balance_volume,
+                        regime_row_column, shared_feature_bank, slope_angle, vwma_variant)
+
 
 class VWMAStrategyVolumeRegimeShort(IStrategy):
     """
@@ -66,6 +72,11 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
     rsi_lower_bear = IntParameter(25, 35, default=30, space='sell')
     rsi_upper_bear = IntParameter(45, 55, default=50, space='sell')
     
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        # Regime feature banks per pair; kept on the instance so hyperopt workers receive them
+        self.regime_features = {}
+    
     # Informative pairs - define higher timeframe for the same pair
     def informative_pairs(self):
         pairs = self.dp.current_whitelist() if self.dp else []
@@ -73,6 +84,11 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
         return informative_pairs
     
     # Plot configuration for web UI (red theme for shorts)
+    # Columns only plotted or used for debugging; dropped in lean backtests/hyperopt
+    plot_only_columns = [
+        'vwma_fast_prev', 'vwma_medium_prev', 'vwma_slow_slope_clean', 'vwma_crossover_plot', 'vwma_crossunder_plot'
+    ]
+    
     plot_config = {
         'main_plot': {
             'vwma_fast': {'color': '#ff6666', 'type': 'line'},  # Light red
@@ -98,43 +114,57 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
         }
     }
     
-    def vwma(self, dataframe: DataFrame, period: int = 21) -> pd.Series:
+    def calculate_obv(self, dataframe: DataFrame) -> pd.Series:
         """
-        Calculate Volume Weighted Moving Average
-        VWMA = Sum(Close * Volume) / Sum(Volume) over period
+        Calculate On-Balance Volume (OBV)
         """
-        volume_price = dataframe['close'] * dataframe['volume']
-        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
+        return on_balance_volume(dataframe['close'], dataframe['volume'])
     
-    def calculate_slope_angle(self, ma_series: pd.Series, slope_bars: int) -> pd.Series:
+    def regime_feature_bank(self, pair: str, informative: DataFrame) -> RegimeFeatureBank:
         """
-        Calculate slope using: slope = (ma - ma[slopeBars]) / slopeBars
-        Convert slope to angle: slopeAngle = arctan(slope) * 180 / pi
+        Higher timeframe features for every regime parameter value, reused while the candles are unchanged
         """
-        # Calculate slope over slope_bars periods
-        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
-        
-        # Convert slope to angle in degrees
-        slope_angle = np.arctan(slope) * 180 / np.pi
-        
-        return slope_angle
+        bank = self.regime_features.get(pair)
+        if bank is None or not bank.matches(informative):
+            bank = RegimeFeatureBank(informative)
+            # OBV only depends on the candles
+            bank.get(('obv',), self.calculate_obv)
+            for period in self.rsi_period.range:
+                bank.get(('rsi', period), lambda df, period=period: ta.RSI(df, timeperiod=period))
+            self.regime_features[pair] = bank
+        return bank
     
-    def calculate_obv(self, dataframe: DataFrame) -> pd.Series:
+    def calculate_regime(self, bank: RegimeFeatureBank) -> DataFrame:
         """
-        Calculate On-Balance Volume (OBV)
+        OBV + RSI volume/momentum regime for the current parameter values, on the higher timeframe
         """
-        obv = pd.Series(index=dataframe.index, dtype='float64')
-        obv.iloc[0] = 0
+        obv_ma_period = self.obv_ma_period.value
+        rsi_period = self.rsi_period.value
         
-        for i in range(1, len(dataframe)):
-            if dataframe['close'].iloc[i] > dataframe['close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + dataframe['volume'].iloc[i]
-            elif dataframe['close'].iloc[i] < dataframe['close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - dataframe['volume'].iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
+        regime = DataFrame(index=bank.informative.index)
+        regime['obv'] = bank.get(('obv',), self.calculate_obv)
+        regime['obv_ma'] = bank.get(('obv_ma', obv_ma_period), lambda df: ta.SMA(regime['obv'], timeperiod=obv_ma_period))
+        regime['rsi'] = bank.get(('rsi', rsi_period), lambda df: ta.RSI(df, timeperiod=rsi_period))
         
-        return obv
+        # Bear regime: OBV < OBV_MA AND RSI between 30-50
+        regime['bear_regime'] = (
+            (regime['obv'] < regime['obv_ma']) & 
+            (regime['rsi'] >= self.rsi_lower_bear.value) &
+            (regime['rsi'] <= self.rsi_upper_bear.value)
+        ).astype(int)
+        return regime
+    
+    def select_regime(self, dataframe: DataFrame, metadata: dict, regime_name: str) -> DataFrame:
+        """
+        Rebuild a regime column for the current parameter values from the pair's feature bank
+        Keeps the regime parameters searchable without recomputing or re-merging the higher timeframe
+        """
+        bank = self.regime_features.get(metadata['pair'])
+        row_column = regime_row_column(self.regime_timeframe)
+        if bank is not None and row_column in dataframe.columns:
+            regime = self.calculate_regime(bank)
+            dataframe[f'{regime_name}_{self.regime_timeframe}'] = bank.to_timeframe(regime[regime_name], dataframe[row_column])
+        return dataframe
     
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -142,13 +172,16 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
         Calculate 3 VWMAs with different lengths on 15m timeframe
         Calculate OBV and RSI on 4h timeframe for volume/momentum regime
         """
+        # VWMAs shared with the long/short twin strategy and with populate_entry_trend
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Calculate base VWMAs with default periods (will be optimized in populate_entry_trend)
-        dataframe['vwma_fast_base'] = self.vwma(dataframe, 20)
-        dataframe['vwma_medium_base'] = self.vwma(dataframe, 100)
-        dataframe['vwma_slow_base'] = self.vwma(dataframe, 300)
+        dataframe['vwma_fast_base'] = vwma_variant(bank, 20)
+        dataframe['vwma_medium_base'] = vwma_variant(bank, 100)
+        dataframe['vwma_slow_base'] = vwma_variant(bank, 300)
         
         # Calculate slope angle of slow VWMA using default slope_bars (3)
-        dataframe['vwma_slow_slope_base'] = self.calculate_slope_angle(dataframe['vwma_slow_base'], 3)
+        dataframe['vwma_slow_slope_base'] = slope_angle(dataframe['vwma_slow_base'], 3)
         
         # Add regime filter from higher timeframe
         if self.dp:
@@ -158,27 +191,24 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
                 timeframe=self.regime_timeframe
             )
             
-            # Calculate OBV on higher timeframe
-            informative['obv'] = self.calculate_obv(informative)
-            informative['obv_ma'] = ta.SMA(informative['obv'], timeperiod=self.obv_ma_period.value)
+            # Regime features for every parameter value, built once per pair and candle set
+            bank = self.regime_feature_bank(metadata['pair'], informative)
             
-            # Calculate RSI on higher timeframe
-            informative['rsi'] = ta.RSI(informative, timeperiod=self.rsi_period.value)
-            
-            # Calculate bearish regime
-            # Bear regime: OBV < OBV_MA AND RSI between 30-50
-            informative['bear_regime'] = (
-                (informative['obv'] < informative['obv_ma']) & 
-                (informative['rsi'] >= self.rsi_lower_bear.value) &
-                (informative['rsi'] <= self.rsi_upper_bear.value)
-            ).astype(int)
+            # Regime for the current values (plotting); entries rebuild it with each epoch's values
+            regime = self.calculate_regime(bank)
+            informative['obv'] = regime['obv']
+            informative['obv_ma'] = regime['obv_ma']
+            informative['rsi'] = regime['rsi']
+            informative['bear_regime'] = regime['bear_regime']
             
             # Merge informative data properly to avoid lookahead bias
+            informative[REGIME_ROW_COLUMN] = bank.row_numbers()
             dataframe = merge_informative_pair(
                 dataframe, informative,
                 self.timeframe, self.regime_timeframe,
                 ffill=True
             )
+            dataframe = compact_regime_rows(dataframe, self.regime_timeframe)
         
         return dataframe
     
@@ -189,21 +219,23 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
         Use hyperopt parameters to modify base calculations
         """
         
+        bank = shared_feature_bank(metadata['pair'], self.timeframe, dataframe)
+        
         # Recalculate VWMAs with hyperopt parameters if they differ from defaults
         if self.vwma_fast.value != 20:
-            dataframe['vwma_fast'] = self.vwma(dataframe, self.vwma_fast.value)
+            dataframe['vwma_fast'] = vwma_variant(bank, self.vwma_fast.value)
         else:
             dataframe['vwma_fast'] = dataframe['vwma_fast_base']
         
         if self.vwma_medium.value != 100:
-            dataframe['vwma_medium'] = self.vwma(dataframe, self.vwma_medium.value)
+            dataframe['vwma_medium'] = vwma_variant(bank, self.vwma_medium.value)
         else:
             dataframe['vwma_medium'] = dataframe['vwma_medium_base']
         
         if self.vwma_slow.value != 300 or self.slope_bars.value != 3:
-            dataframe['vwma_slow'] = self.vwma(dataframe, self.vwma_slow.value)
+            dataframe['vwma_slow'] = vwma_variant(bank, self.vwma_slow.value)
             # Recalculate slope angle with hyperopt parameters
-            dataframe['vwma_slow_slope'] = self.calculate_slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
+            dataframe['vwma_slow_slope'] = slope_angle(dataframe['vwma_slow'], self.slope_bars.value)
         else:
             dataframe['vwma_slow'] = dataframe['vwma_slow_base']
             dataframe['vwma_slow_slope'] = dataframe['vwma_slow_slope_base']
@@ -232,6 +264,9 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
         # Handle NaN values in slope angle
         dataframe['vwma_slow_slope_clean'] = dataframe['vwma_slow_slope'].fillna(0)
         
+        # Regime for this epoch's parameter values
+        dataframe = self.select_regime(dataframe, metadata, 'bear_regime')
+        
         # Check if regime data is available
         regime_column = f'bear_regime_{self.regime_timeframe}'
         if regime_column in dataframe.columns:
@@ -252,7 +287,7 @@ class VWMAStrategyVolumeRegimeShort(IStrategy):
         
         dataframe.loc[short_condition, 'enter_short'] = 1
         
-        return dataframe
+        return drop_plot_columns(dataframe, self.plot_only_columns, self.config)
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -0,0 +1,61 @@
+"""
+Shared indicator kernels for the strategies in this directory.
+
+Strategies import from here instead of carrying their own copies, so a speedup lands in
+every strategy at once. The `*_variant` helpers memoize on a shared_feature_bank, one per
+(pair, timeframe, candles), so long and short twins running in the same process compute each
+feature once. Parity checks against the original implementations:
+
+    cd user_data/strategies && python -m indicators test
+"""
+
+from indicators.cache import FeatureBank, IndicatorCache, clear_shared_feature_banks, shared_feature_bank
+from indicators.lean import downcast_indicators, drop_plot_columns, lean_mode
+from indicators.ou import ou_parameters_variant, rolling_ou_parameters
+from indicators.qfl import bars_since, qfl_indicators
+from indicators.regime import REGIME_ROW_COLUMN, RegimeFeatureBank, compact_regime_rows, regime_row_column
+from indicators.rolling import (QUANTILE_INTERPOLATIONS, add_rolling_order_statistics, rolling_order_statistics,
+                                rolling_percent_rank, rolling_quantile_from_order_statistics, rolling_quantiles)
+from indicators.rsi_pnr import (rsi_pnr_buy, rsi_pnr_buy_variant, rsi_pnr_sell, rsi_pnr_sell_variant, rsi_source,
+                                rsi_variant)
+from indicators.slope import slope_angle
+from indicators.snapshot import LastRowSnapshots
+from indicators.volume import on_balance_volume
+from indicators.vwma import add_vwma_sums, vwma_from_sums, vwma_slope_variant, vwma_variant
+
+__all__ = [
+    'QUANTILE_INTERPOLATIONS',
+    'REGIME_ROW_COLUMN',
+    'FeatureBank',
+    'IndicatorCache',
+    'LastRowSnapshots',
+    'RegimeFeatureBank',
+    'add_rolling_order_statistics',
+    'add_vwma_sums',
+    'bars_since',
+    'clear_shared_feature_banks',
+    'compact_regime_rows',
+    'downcast_indicators',
+    'drop_plot_columns',
+    'lean_mode',
+    'on_balance_volume',
+    'ou_parameters_variant',
+    'qfl_indicators',
+    'regime_row_column',
+    'rolling_order_statistics',
+    'rolling_ou_parameters',
+    'rolling_percent_rank',
+    'rolling_quantile_from_order_statistics',
+    'rolling_quantiles',
+    'rsi_pnr_buy',
+    'rsi_pnr_buy_variant',
+    'rsi_pnr_sell',
+    'rsi_pnr_sell_variant',
+    'rsi_source',
+    'rsi_variant',
+    'shared_feature_bank',
+    'slope_angle',
+    'vwma_from_sums',
+    'vwma_slope_variant',
+    'vwma_variant',
+]
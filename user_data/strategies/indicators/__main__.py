@@ -0,0 +1,600 @@
+"""
+Parity tests for the shared indicator kernels.
+
+Each test compares a kernel with the implementation it replaced in the strategies.
+Run from user_data/strategies:
+
+    python -m indicators test
+"""
+
+import importlib.util
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import talib
+import talib.abstract as ta
+
+from indicators import (FeatureBank, IndicatorCache, LastRowSnapshots, RegimeFeatureBank, add_rolling_order_statistics,
+                        add_vwma_sums, bars_since, clear_shared_feature_banks, downcast_indicators, on_balance_volume,
+                        ou_parameters_variant, qfl_indicators, rolling_ou_parameters, rolling_percent_rank,
+                        rolling_quantile_from_order_statistics, rolling_quantiles, rsi_pnr_buy, rsi_pnr_buy_variant,
+                        rsi_pnr_sell, rsi_pnr_sell_variant, rsi_source, rsi_variant, shared_feature_bank, slope_angle,
+                        vwma_from_sums, vwma_slope_variant, vwma_variant)
+from indicators.cache import SHARED_BANKS_PER_PAIR
+from indicators.synthetic import synthetic_ohlcv
+
+
+def fractal_down(dataframe, volume_ma_period=6):
+    """Forward-filled QFL fractal-down level, as built in calculate_qfl_indicators"""
+    low = dataframe['low']
+    volume_ma = dataframe['volume'].rolling(volume_ma_period).mean()
+    condition = ((low.shift(3) < low.shift(4)) & (low.shift(4) < low.shift(5)) &
+                 (low.shift(2) > low.shift(3)) & (low.shift(1) > low.shift(2)) &
+                 (dataframe['volume'].shift(3) > volume_ma.shift(3)))
+    fractal = pd.Series(np.nan, index=dataframe.index)
+    fractal[condition] = low.shift(3)[condition]
+    return fractal.ffill()
+
+
+class TestQFLKernels(unittest.TestCase):
+
+    @staticmethod
+    def reference_base_age(base_changed):
+        """The original per-row loop from calculate_qfl_indicators"""
+        dataframe = pd.DataFrame({'base_changed': base_changed})
+        dataframe['base_age'] = 0
+        base_change_indices = dataframe[dataframe['base_changed']].index
+        for i, idx in enumerate(dataframe.index):
+            if len(base_change_indices) > 0:
+                recent_changes = base_change_indices[base_change_indices <= idx]
+                if len(recent_changes) > 0:
+                    last_change = recent_changes[-1]
+                    dataframe.loc[idx, 'base_age'] = idx - last_change
+        return dataframe['base_age']
+
+    def test_bars_since_matches_loop_on_fractal_bases(self):
+        fractal = fractal_down(synthetic_ohlcv(rows=2000))
+        base_changed = fractal != fractal.shift(1)
+        pd.testing.assert_series_equal(bars_since(base_changed), self.reference_base_age(base_changed),
+                                       check_names=False)
+
+    def test_bars_since_edge_cases(self):
+        for flags in [[], [False] * 5, [True] * 5, [False, False, True, False, False, True, False]]:
+            base_changed = pd.Series(flags, dtype=bool)
+            pd.testing.assert_series_equal(bars_since(base_changed), self.reference_base_age(base_changed),
+                                           check_names=False)
+
+    @staticmethod
+    def reference_qfl_indicators(dataframe, volume_ma_period):
+        """calculate_qfl_indicators as it was copied into the QFL strategies"""
+        dataframe['volume_ma'] = ta.SMA(dataframe['volume'], timeperiod=volume_ma_period)
+        dataframe['fractal_up_condition'] = (
+            (dataframe['high'].shift(3) > dataframe['high'].shift(4)) &
+            (dataframe['high'].shift(4) > dataframe['high'].shift(5)) &
+            (dataframe['high'].shift(2) < dataframe['high'].shift(3)) &
+            (dataframe['high'].shift(1) < dataframe['high'].shift(2)) &
+            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
+        )
+        dataframe['fractal_down_condition'] = (
+            (dataframe['low'].shift(3) < dataframe['low'].shift(4)) &
+            (dataframe['low'].shift(4) < dataframe['low'].shift(5)) &
+            (dataframe['low'].shift(2) > dataframe['low'].shift(3)) &
+            (dataframe['low'].shift(1) > dataframe['low'].shift(2)) &
+            (dataframe['volume'].shift(3) > dataframe['volume_ma'].shift(3))
+        )
+        dataframe['fractal_up'] = np.nan
+        dataframe['fractal_down'] = np.nan
+        dataframe.loc[dataframe['fractal_up_condition'], 'fractal_up'] = dataframe['high'].shift(3)
+        dataframe.loc[dataframe['fractal_down_condition'], 'fractal_down'] = dataframe['low'].shift(3)
+        dataframe['fractal_up'] = dataframe['fractal_up'].ffill()
+        dataframe['fractal_down'] = dataframe['fractal_down'].ffill()
+        dataframe['base_changed'] = dataframe['fractal_down'] != dataframe['fractal_down'].shift(1)
+        dataframe['base_age'] = bars_since(dataframe['base_changed'])
+        return dataframe
+
+    def test_qfl_indicators_match_strategy_copy(self):
+        candles = synthetic_ohlcv(rows=3000)
+        # Resampled candles hold equal highs/lows, and sliced frames keep their labels
+        candles['high'] = candles['high'].round(-1)
+        candles['low'] = candles['low'].round(-1)
+        for dataframe in [candles, candles.iloc[1000:], candles.iloc[:4]]:
+            for volume_ma_period in [5, 6, 10]:
+                pd.testing.assert_frame_equal(qfl_indicators(dataframe.copy(), volume_ma_period),
+                                              self.reference_qfl_indicators(dataframe.copy(), volume_ma_period),
+                                              check_exact=True)
+
+    def test_bars_since_offset_index(self):
+        # Sliced frames keep their original labels; ages are measured in labels like the loop
+        base_changed = pd.Series([False, True, False, False, True, False], index=range(100, 106))
+        pd.testing.assert_series_equal(bars_since(base_changed), self.reference_base_age(base_changed),
+                                       check_names=False)
+
+
+class TestRollingKernels(unittest.TestCase):
+
+    def test_percent_rank_matches_rolling_apply(self):
+        rsi = pd.Series(talib.RSI(synthetic_ohlcv(rows=5000)['close'].to_numpy(), timeperiod=14))
+        for window in [1, 14, 150]:
+            expected = rsi.rolling(window=window, min_periods=window).apply(
+                lambda x: (x.iloc[-1] <= x).sum() / len(x) * 100, raw=False
+            )
+            pd.testing.assert_series_equal(rolling_percent_rank(rsi, window), expected)
+
+    def test_percent_rank_ties_gaps_and_short_series(self):
+        series = pd.Series([50.0, 50.0, np.nan, 40.0, 40.0, 60.0, 40.0, 40.0, 40.0, 70.0])
+        for window in [3, 4, 20]:
+            expected = series.rolling(window=window, min_periods=window).apply(
+                lambda x: (x.iloc[-1] <= x).sum() / len(x) * 100, raw=False
+            )
+            pd.testing.assert_series_equal(rolling_percent_rank(series, window), expected)
+
+    def test_order_statistics_quantiles_match_rolling_quantile(self):
+        rsi = pd.Series(talib.RSI(synthetic_ohlcv(rows=3000)['close'].to_numpy(), timeperiod=14))
+        dataframe = pd.DataFrame({'rsi': rsi})
+        # QFLRSI's rsi_entry_percentile and rsi_exit_percentile ranges
+        add_rolling_order_statistics(dataframe, 'rsi', 150, [(0.001, 0.05), (0.95, 0.999)], prefix='rsi_sorted')
+        for percentile in [0.1, 0.5, 1.0, 1.234, 3.333, 5.0, 95.0, 97.5, 99.0, 99.9]:
+            expected = rsi.rolling(window=150, min_periods=150).quantile(percentile / 100)
+            pd.testing.assert_series_equal(
+                rolling_quantile_from_order_statistics(dataframe, 'rsi', 150, percentile / 100, prefix='rsi_sorted'),
+                expected, check_names=False, check_exact=True
+            )
+
+        # Quantiles outside the precomputed ranges fall back to the rolling quantile
+        expected = rsi.rolling(window=150, min_periods=150).quantile(0.5)
+        pd.testing.assert_series_equal(
+            rolling_quantile_from_order_statistics(dataframe, 'rsi', 150, 0.5, prefix='rsi_sorted'),
+            expected, check_names=False
+        )
+
+    @staticmethod
+    def reference_percentile_nearest_rank(series, window, percentage):
+        """Pine's ta.percentile_nearest_rank: the ceil(percentage / 100 * n)-th smallest value"""
+        def nearest_rank(x):
+            return np.sort(x)[int(np.ceil(percentage / 100 * len(x))) - 1]
+        return series.rolling(window=window, min_periods=window).apply(nearest_rank, raw=True)
+
+    def test_multi_quantiles_match_rolling_quantile_and_pine(self):
+        rsi = pd.Series(talib.RSI(synthetic_ohlcv(rows=3000)['close'].to_numpy(), timeperiod=14))
+        # rsidiffMIN of the RPS strategies, which leads with NaN for the RSI warm-up
+        rsidiff = rsi.rolling(window=10).max() - rsi
+        for window in [100, 150, 200]:
+            linear = rolling_quantiles(rsidiff, window, [0.01, 0.5, 0.99])
+            nearest = rolling_quantiles(rsidiff, window, [0.01, 0.5, 0.99], interpolation='nearest_rank')
+            for percentage in [1, 50, 99]:
+                pd.testing.assert_series_equal(
+                    linear[percentage / 100], rsidiff.rolling(window=window, min_periods=window).quantile(percentage / 100),
+                    check_exact=True
+                )
+                pd.testing.assert_series_equal(
+                    nearest[percentage / 100], self.reference_percentile_nearest_rank(rsidiff, window, percentage),
+                    check_exact=True
+                )
+
+        dataframe = pd.DataFrame({'rsi': rsi})
+        add_rolling_order_statistics(dataframe, 'rsi', 150, [(0.001, 0.05), (0.95, 0.999)], prefix='rsi_sorted',
+                                     interpolation='nearest_rank')
+        for percentage in [0.1, 1.0, 5.0, 95.0, 99.0, 99.9, 50.0]:
+            pd.testing.assert_series_equal(
+                rolling_quantile_from_order_statistics(dataframe, 'rsi', 150, percentage / 100, prefix='rsi_sorted',
+                                                       interpolation='nearest_rank'),
+                self.reference_percentile_nearest_rank(rsi, 150, percentage), check_names=False, check_exact=True
+            )
+
+
+class TestOUKernels(unittest.TestCase):
+
+    @staticmethod
+    def reference_ou_parameters(log_prices, lookback):
+        """The original per-window loop from OrnsteinUhlenbeckStrategy.estimate_ou_parameters"""
+        ou_params = []
+        for i in range(lookback, len(log_prices)):
+            window = log_prices[i-lookback:i]
+            delta_t = 1
+            mu = window.mean()
+            autocorr = window.autocorr(lag=1)
+            theta = -np.log(autocorr) / delta_t if autocorr > 0 else np.nan
+            sigma = window.std() * np.sqrt(2 * theta / delta_t) if pd.notna(theta) and theta > 0 else np.nan
+            ou_params.append((theta, mu, sigma))
+        return pd.DataFrame(ou_params, columns=['theta', 'mu', 'sigma'], index=log_prices.index[lookback:])
+
+    def test_ou_parameters_match_window_loop(self):
+        log_prices = np.log(synthetic_ohlcv(rows=1500)['close'])
+        # Covers the hyperopt range of lookback_period (20-400)
+        for lookback in [20, 100, 400]:
+            expected = self.reference_ou_parameters(log_prices, lookback).reindex(log_prices.index)
+            pd.testing.assert_frame_equal(rolling_ou_parameters(log_prices, lookback), expected,
+                                          check_exact=False, rtol=1e-8)
+
+    def test_ou_parameters_mean_reverting_series(self):
+        # Strongly mean-reverting prices give negative autocorrelation: theta and sigma must be NaN like the loop
+        log_prices = pd.Series(np.log(100 + np.tile([1.0, -1.0], 200) + np.linspace(0, 0.5, 400)))
+        expected = self.reference_ou_parameters(log_prices, 30).reindex(log_prices.index)
+        pd.testing.assert_frame_equal(rolling_ou_parameters(log_prices, 30), expected,
+                                      check_exact=False, rtol=1e-8)
+
+    def test_ou_variant_is_shared_between_twins(self):
+        clear_shared_feature_banks()
+        candles = synthetic_ohlcv(rows=1000)
+        long_bank = shared_feature_bank('BTC/USDT', '15m', candles)
+        short_bank = shared_feature_bank('BTC/USDT', '15m', candles.assign(z_score=0.0))
+        self.assertIs(ou_parameters_variant(long_bank, 100), ou_parameters_variant(short_bank, 100))
+        pd.testing.assert_frame_equal(ou_parameters_variant(long_bank, 100),
+                                      rolling_ou_parameters(np.log(candles['close']), 100), check_exact=True)
+        clear_shared_feature_banks()
+
+
+class TestVolumeKernels(unittest.TestCase):
+
+    @staticmethod
+    def reference_obv(dataframe):
+        """The original row loop from VWMAStrategyVolumeRegime.calculate_obv"""
+        obv = pd.Series(index=dataframe.index, dtype='float64')
+        obv.iloc[0] = 0
+        for i in range(1, len(dataframe)):
+            if dataframe['close'].iloc[i] > dataframe['close'].iloc[i-1]:
+                obv.iloc[i] = obv.iloc[i-1] + dataframe['volume'].iloc[i]
+            elif dataframe['close'].iloc[i] < dataframe['close'].iloc[i-1]:
+                obv.iloc[i] = obv.iloc[i-1] - dataframe['volume'].iloc[i]
+            else:
+                obv.iloc[i] = obv.iloc[i-1]
+        return obv
+
+    def test_obv_matches_loop_exactly(self):
+        dataframe = synthetic_ohlcv(rows=3000)
+        # Rounded closes produce unchanged candles, a NaN close must keep the previous OBV
+        dataframe['close'] = dataframe['close'].round(-1)
+        dataframe.loc[100, 'close'] = np.nan
+        pd.testing.assert_series_equal(on_balance_volume(dataframe['close'], dataframe['volume']),
+                                       self.reference_obv(dataframe), check_exact=True)
+
+    def test_indicator_cache_reuses_until_candles_change(self):
+        cache = IndicatorCache()
+        calls = []
+
+        def compute(dataframe):
+            calls.append(len(dataframe))
+            return on_balance_volume(dataframe['close'], dataframe['volume'])
+
+        candles = synthetic_ohlcv(rows=500)
+        first = cache.get('BTC/USDT', '4h', 'obv', candles, compute)
+        second = cache.get('BTC/USDT', '4h', 'obv', candles.copy(), compute)
+        self.assertIs(first, second)
+        cache.get('ETH/USDT', '4h', 'obv', candles, compute)
+        cache.get('BTC/USDT', '4h', 'obv', synthetic_ohlcv(rows=501), compute)
+        self.assertEqual(calls, [500, 500, 501])
+
+
+class TestVWMAKernels(unittest.TestCase):
+
+    @staticmethod
+    def reference_vwma(dataframe, period):
+        """The original rolling-sum VWMA from the VWMA strategies"""
+        volume_price = dataframe['close'] * dataframe['volume']
+        return volume_price.rolling(window=period).sum() / dataframe['volume'].rolling(window=period).sum()
+
+    def test_vwma_matches_rolling_sums_over_hyperopt_ranges(self):
+        dataframe = synthetic_ohlcv(rows=20000)
+        dataframe.loc[500:520, 'volume'] = 0.0
+        add_vwma_sums(dataframe)
+        for period in list(range(10, 31)) + [80, 100, 120, 280, 300, 320]:
+            pd.testing.assert_series_equal(vwma_from_sums(dataframe, period), self.reference_vwma(dataframe, period),
+                                           check_exact=False, rtol=1e-10)
+
+    def test_vwma_gaps_and_missing_sums(self):
+        dataframe = synthetic_ohlcv(rows=300)
+        dataframe.loc[50, 'close'] = np.nan
+        dataframe.loc[120, 'volume'] = np.nan
+        # Without add_vwma_sums the sums are built for the call
+        for period in [1, 5, 20, 300, 301]:
+            pd.testing.assert_series_equal(vwma_from_sums(dataframe, period), self.reference_vwma(dataframe, period),
+                                           check_exact=False, rtol=1e-10)
+
+    def test_vwma_on_sliced_frame_with_sums(self):
+        dataframe = synthetic_ohlcv(rows=2000)
+        dataframe.loc[1210, 'volume'] = np.nan
+        add_vwma_sums(dataframe)
+        # Callbacks and snapshots see slices that still carry the running sums of the full frame
+        for start in [1, 1000, 1200]:
+            sliced = dataframe.iloc[start:]
+            for period in [1, 20, 300]:
+                pd.testing.assert_series_equal(vwma_from_sums(sliced, period), self.reference_vwma(sliced, period),
+                                               check_exact=False, rtol=1e-10)
+
+    def test_vwma_lookups_are_independent_copies(self):
+        dataframe = add_vwma_sums(synthetic_ohlcv(rows=500))
+        first = vwma_from_sums(dataframe, 20)
+        first.iloc[-1] = -1.0
+        self.assertNotEqual(vwma_from_sums(dataframe, 20).iloc[-1], -1.0)
+
+    @staticmethod
+    def reference_slope_angle(ma_series, slope_bars):
+        """calculate_slope_angle as it was copied into the VWMA and RPS strategies"""
+        slope = (ma_series - ma_series.shift(slope_bars)) / slope_bars
+        return np.arctan(slope) * 180 / np.pi
+
+    def test_slope_angle_matches_strategy_copy(self):
+        dataframe = add_vwma_sums(synthetic_ohlcv(rows=2000))
+        vwma = vwma_from_sums(dataframe, 300)
+        for slope_bars in [1, 3, 10, 1999, 2000, 2500]:
+            pd.testing.assert_series_equal(slope_angle(vwma, slope_bars), self.reference_slope_angle(vwma, slope_bars),
+                                           check_exact=True)
+
+    def test_vwma_variants_match_kernels(self):
+        clear_shared_feature_banks()
+        dataframe = add_vwma_sums(synthetic_ohlcv(rows=2000))
+        bank = shared_feature_bank('BTC/USDT', '15m', dataframe)
+        pd.testing.assert_series_equal(vwma_variant(bank, 300), vwma_from_sums(dataframe, 300), check_exact=True)
+        pd.testing.assert_series_equal(vwma_slope_variant(bank, 300, 3),
+                                       slope_angle(vwma_from_sums(dataframe, 300), 3), check_exact=True)
+        self.assertIs(vwma_variant(bank, 20), vwma_variant(bank, 20))
+        clear_shared_feature_banks()
+
+    def test_vwma_variants_follow_each_pairs_candles(self):
+        clear_shared_feature_banks()
+        # Whole-number candles keep the running sums exact, so both pairs end on the same totals
+        candles = synthetic_ohlcv(rows=2000).round({'close': 0, 'volume': 0})
+        # Same length, dates and running sum totals, different candles
+        swapped = candles.copy()
+        swapped.loc[[500, 1500], ['close', 'volume']] = candles.loc[[1500, 500], ['close', 'volume']].to_numpy()
+        for pair, dataframe in [('BTC/USDT', candles), ('ETH/USDT', swapped)]:
+            bank = shared_feature_bank(pair, '15m', dataframe)
+            pd.testing.assert_series_equal(vwma_variant(bank, 20), self.reference_vwma(dataframe, 20),
+                                           check_names=False, check_exact=False, rtol=1e-10)
+        clear_shared_feature_banks()
+
+
+class TestRSIPNRKernels(unittest.TestCase):
+
+    @staticmethod
+    def reference_rsi_source(dataframe, source_type):
+        """get_rsi_source as it was copied into the RPS strategies"""
+        if source_type == 'vwma':
+            return TestVWMAKernels.reference_vwma(dataframe, 20)
+        if source_type == 'ema':
+            return ta.EMA(dataframe, timeperiod=20)
+        return dataframe['close']
+
+    def test_rsi_sources_match_strategy_copy(self):
+        dataframe = synthetic_ohlcv(rows=3000)
+        for source_type in ['close', 'vwma', 'ema', 'unknown']:
+            expected = ta.RSI(self.reference_rsi_source(dataframe, source_type), timeperiod=14)
+            actual = ta.RSI(rsi_source(dataframe, source_type), timeperiod=14)
+            pd.testing.assert_series_equal(pd.Series(actual), pd.Series(expected), check_names=False,
+                                           check_exact=False, rtol=1e-9)
+
+    def test_rsi_pnr_matches_strategy_copy(self):
+        rsi = pd.Series(ta.RSI(synthetic_ohlcv(rows=3000)['close'], timeperiod=14))
+        nearest_rank = TestRollingKernels.reference_percentile_nearest_rank
+        for lookback, window in [(5, 100), (10, 150), (20, 200)]:
+            rsidiffMIN, rsidiffMIN_threshold = rsi_pnr_buy(rsi, lookback, window)
+            pd.testing.assert_series_equal(rsidiffMIN, rsi.rolling(window=lookback).max() - rsi, check_exact=True)
+            pd.testing.assert_series_equal(rsidiffMIN_threshold, rsidiffMIN.rolling(window=window).quantile(0.99),
+                                           check_names=False, check_exact=False, rtol=1e-12)
+            _, rsidiffMIN_nearest = rsi_pnr_buy(rsi, lookback, window, interpolation='nearest_rank')
+            pd.testing.assert_series_equal(rsidiffMIN_nearest, nearest_rank(rsidiffMIN, window, 99),
+                                           check_names=False, check_exact=True)
+
+            rsidiffMAX, rsidiffMAX_threshold = rsi_pnr_sell(rsi, lookback, window)
+            pd.testing.assert_series_equal(rsidiffMAX, rsi - rsi.rolling(window=lookback).min(), check_exact=True)
+            pd.testing.assert_series_equal(rsidiffMAX_threshold, rsidiffMAX.rolling(window=window).quantile(0.99),
+                                           check_names=False, check_exact=False, rtol=1e-12)
+            _, rsidiffMAX_nearest = rsi_pnr_sell(rsi, lookback, window, interpolation='nearest_rank')
+            pd.testing.assert_series_equal(rsidiffMAX_nearest, nearest_rank(rsidiffMAX, window, 99),
+                                           check_names=False, check_exact=True)
+
+    def test_rsi_pnr_variants_are_shared_between_twins(self):
+        clear_shared_feature_banks()
+        candles = synthetic_ohlcv(rows=2000)
+        # The long strategy sees the populated frame, its short twin its own copy
+        long_bank = shared_feature_bank('BTC/USDT', '15m', candles.assign(rsi_base=0.0))
+        short_bank = shared_feature_bank('BTC/USDT', '15m', candles.copy())
+        self.assertIs(long_bank, short_bank)
+
+        for source_type in ['close', 'vwma', 'ema']:
+            rsi = pd.Series(ta.RSI(rsi_source(candles, source_type), timeperiod=14))
+            pd.testing.assert_series_equal(rsi_variant(long_bank, source_type), rsi, check_names=False,
+                                           check_exact=True)
+            for variant, kernel in [(rsi_pnr_buy_variant, rsi_pnr_buy), (rsi_pnr_sell_variant, rsi_pnr_sell)]:
+                memoized = variant(long_bank, source_type, 10, 150)
+                for actual, expected in zip(memoized, kernel(rsi, 10, 150)):
+                    pd.testing.assert_series_equal(actual, expected, check_names=False, check_exact=True)
+                for first, second in zip(memoized, variant(short_bank, source_type, 10, 150)):
+                    self.assertIs(first, second)
+                # Each interpolation is its own feature
+                _, nearest = variant(long_bank, source_type, 10, 150, 'nearest_rank')
+                pd.testing.assert_series_equal(nearest, kernel(rsi, 10, 150, 'nearest_rank')[1], check_names=False,
+                                               check_exact=True)
+        clear_shared_feature_banks()
+
+
+class TestRegimeKernels(unittest.TestCase):
+
+    def test_regime_mapping_matches_merged_column(self):
+        candles = synthetic_ohlcv(rows=2000)
+        informative = candles.set_index('date').resample('4h').agg(
+            {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+        ).reset_index()
+        bank = RegimeFeatureBank(informative)
+        sma = bank.get(('sma', 10), lambda df: talib.SMA(df['close'].to_numpy(), timeperiod=10))
+        regime = (informative['close'] > sma).astype(int)
+
+        # Merge the regime and the row numbers like merge_informative_pair does (shifted to candle close)
+        informative['regime'] = regime
+        informative['regime_row'] = bank.row_numbers()
+        informative['date_merge'] = informative['date'] + pd.Timedelta('4h') - pd.Timedelta('15min')
+        merged = pd.merge(candles, informative[['date_merge', 'regime', 'regime_row']],
+                          left_on='date', right_on='date_merge', how='left').ffill()
+
+        mapped = bank.to_timeframe(regime, merged['regime_row'])
+        np.testing.assert_array_equal(mapped == 1, (merged['regime'] == 1).to_numpy())
+
+    def test_feature_bank_evicts_least_recently_used(self):
+        candles = synthetic_ohlcv(rows=500)
+        # Room for two 500-row float64 features
+        bank = FeatureBank(candles, max_bytes=2 * 500 * 8)
+        calls = []
+
+        def compute(period):
+            def rolling_mean(dataframe):
+                calls.append(period)
+                return dataframe['close'].rolling(period).mean()
+            return rolling_mean
+
+        bank.get(('ma', 5), compute(5))
+        bank.get(('ma', 10), compute(10))
+        bank.get(('ma', 5), compute(5))
+        bank.get(('ma', 20), compute(20))
+        self.assertEqual(len(bank), 2)
+        bank.get(('ma', 5), compute(5))
+        bank.get(('ma', 10), compute(10))
+        self.assertEqual(calls, [5, 10, 20, 10])
+
+    def test_feature_bank_memoizes_and_tracks_candles(self):
+        candles = synthetic_ohlcv(rows=500)
+        bank = RegimeFeatureBank(candles)
+        calls = []
+
+        def compute(dataframe):
+            calls.append(1)
+            return dataframe['close'].rolling(5).mean()
+
+        self.assertIs(bank.get(('ma', 5), compute), bank.get(('ma', 5), compute))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(bank.matches(candles.copy()))
+        self.assertFalse(bank.matches(candles.iloc[:-1]))
+
+    def test_shared_feature_bank_follows_pair_timeframe_and_candles(self):
+        clear_shared_feature_banks()
+        candles = synthetic_ohlcv(rows=500)
+        bank = shared_feature_bank('BTC/USDT', '15m', candles)
+        self.assertIs(shared_feature_bank('BTC/USDT', '15m', candles.copy()), bank)
+        self.assertIsNot(shared_feature_bank('ETH/USDT', '15m', candles), bank)
+        self.assertIsNot(shared_feature_bank('BTC/USDT', '1h', candles), bank)
+
+        # Two candle sets of a pair (e.g. neighbouring timeranges) stay available at once
+        trimmed = candles.iloc[100:]
+        trimmed_bank = shared_feature_bank('BTC/USDT', '15m', trimmed)
+        self.assertIsNot(trimmed_bank, bank)
+        self.assertIs(shared_feature_bank('BTC/USDT', '15m', candles), bank)
+        self.assertIs(shared_feature_bank('BTC/USDT', '15m', trimmed), trimmed_bank)
+
+        # A new candle gives a new bank and retires the least recently used one
+        for rows in range(SHARED_BANKS_PER_PAIR):
+            shared_feature_bank('BTC/USDT', '15m', synthetic_ohlcv(rows=501 + rows))
+        self.assertIsNot(shared_feature_bank('BTC/USDT', '15m', candles), bank)
+        clear_shared_feature_banks()
+
+
+class TestSnapshots(unittest.TestCase):
+
+    class SlicingDataProvider:
+        """Hands out the candles analyzed so far, like freqtrade's DataProvider in backtesting"""
+
+        def __init__(self, dataframe):
+            self.dataframe = dataframe
+            self.rows = 0
+            self.calls = 0
+
+        def get_analyzed_dataframe(self, pair, timeframe):
+            self.calls += 1
+            return self.dataframe.iloc[:self.rows], None
+
+    def test_snapshot_matches_last_row_once_per_candle(self):
+        dataframe = synthetic_ohlcv(rows=300)
+        dataframe['atr'] = talib.ATR(dataframe['high'], dataframe['low'], dataframe['close'], timeperiod=14)
+        dp = self.SlicingDataProvider(dataframe)
+        snapshots = LastRowSnapshots('15m', 15 * 60, ['atr', 'missing'])
+
+        for row in range(1, len(dataframe)):
+            dp.rows = row
+            current_time = dataframe['date'].iloc[row].to_pydatetime()
+            for minutes in [0, 5, 14]:
+                values = snapshots.get(dp, 'BTC/USDT', current_time + pd.Timedelta(minutes=minutes))
+                np.testing.assert_equal(values, {'atr': dataframe['atr'].iloc[row - 1]})
+        self.assertEqual(dp.calls, len(dataframe) - 1)
+
+        # A candle that opened before its predecessor was analyzed is fetched again
+        snapshots.clear()
+        dp.rows = 100
+        dp.calls = 0
+        current_time = dataframe['date'].iloc[dp.rows + 1].to_pydatetime()
+        snapshots.get(dp, 'BTC/USDT', current_time)
+        snapshots.get(dp, 'BTC/USDT', current_time)
+        self.assertEqual(dp.calls, 2)
+
+
+class TestLeanDataframes(unittest.TestCase):
+
+    SIGNAL_COLUMNS = ['enter_long', 'enter_short', 'exit_long', 'exit_short', 'enter_tag', 'exit_tag']
+
+    @classmethod
+    def strategy_signals(cls, strategy_class, candles, lean, points=3):
+        """Entry/exit columns for the default and sampled parameter points, with lean dataframes on or off"""
+        from indicators.benchmark import BENCHMARK_PAIR, create_strategy, hyperopt_parameters, sample_parameter_points
+
+        strategy = create_strategy(strategy_class, candles)
+        strategy.config['lean_dataframes'] = lean
+        parameters = hyperopt_parameters(strategy)
+        defaults = {name: parameter.value for name, parameter in parameters.items()}
+        metadata = {'pair': BENCHMARK_PAIR}
+        signals = []
+        try:
+            indicators = strategy.populate_indicators(candles.copy(), metadata)
+            strategy.dp.analyzed = indicators
+            for point in sample_parameter_points(strategy, points, seed=42):
+                for name, value in point.items():
+                    parameters[name].value = value
+                dataframe = strategy.populate_entry_trend(indicators.copy(), metadata)
+                dataframe = strategy.populate_exit_trend(dataframe, metadata)
+                columns = [column for column in cls.SIGNAL_COLUMNS if column in dataframe.columns]
+                signals.append(dataframe[columns].fillna(0))
+        finally:
+            # Parameters live on the class; leave them as they were found
+            for name, value in defaults.items():
+                parameters[name].value = value
+        return signals
+
+    def test_downcast_only_touches_listed_columns(self):
+        dataframe = synthetic_ohlcv(rows=100)
+        dataframe['signal'] = dataframe['close'].rolling(5).mean()
+        dataframe['display'] = dataframe['close'].rolling(10).mean()
+
+        lean = downcast_indicators(dataframe, {'runmode': 'hyperopt'}, ['display', 'missing'])
+        self.assertEqual(lean['display'].dtype, np.float32)
+        self.assertEqual(lean['signal'].dtype, np.float64)
+        self.assertEqual(lean['close'].dtype, np.float64)
+        self.assertIs(downcast_indicators(dataframe, {'runmode': 'live'}, ['display']), dataframe)
+        self.assertIs(downcast_indicators(dataframe, {'runmode': 'hyperopt', 'lean_dataframes': False}, ['display']),
+                      dataframe)
+
+    @unittest.skipUnless(importlib.util.find_spec('freqtrade'), "needs freqtrade importable")
+    def test_strategy_signals_identical_with_lean_on_and_off(self):
+        from freqtrade.exchange import timeframe_to_seconds
+        from indicators.benchmark import discover_strategies
+
+        strategies, _ = discover_strategies()
+        for name, strategy_class in strategies.items():
+            candles = synthetic_ohlcv(rows=3000, freq=f"{timeframe_to_seconds(strategy_class.timeframe)}s")
+            with self.subTest(strategy=name):
+                full = self.strategy_signals(strategy_class, candles, lean=False)
+                lean = self.strategy_signals(strategy_class, candles, lean=True)
+                for full_signals, lean_signals in zip(full, lean):
+                    pd.testing.assert_frame_equal(full_signals, lean_signals)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'test':
+        suite = unittest.TestSuite()
+        for case in [TestQFLKernels, TestRollingKernels, TestOUKernels, TestVolumeKernels, TestVWMAKernels,
+                     TestRSIPNRKernels, TestRegimeKernels, TestSnapshots, TestLeanDataframes]:
+            suite.addTests(unittest.TestLoader().loadTestsFromTestCase(case))
+        result = unittest.TextTestRunner(verbosity=2).run(suite)
+        sys.exit(0 if result.wasSuccessful() else 1)
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        from indicators.benchmark import main
+        sys.exit(main(sys.argv[2:]))
+    print("Usage: python -m indicators test | benchmark [--help]")
@@ -0,0 +1,377 @@
+"""
+Strategy benchmark on synthetic candles.
+
+Times populate_indicators, populate_entry_trend and populate_exit_trend of every strategy in
+this directory the way hyperopt drives them: indicators are populated once with every
+hyperopt space enabled, then entry/exit run once per sampled parameter point (one "epoch").
+Wall time and peak traced memory are recorded per phase and compared against a JSON baseline.
+Needs freqtrade importable, but no docker, exchange or downloaded data. Run from
+user_data/strategies:
+
+    python -m indicators benchmark                          # compare with (or create) the baseline
+    python -m indicators benchmark --candles 10000 --strategies RPSROI VWMAStrategyV3
+    python -m indicators benchmark --update-baseline        # accept the current numbers
+
+Exits with status 1 when a phase got slower or bigger than the baseline by more than the
+threshold. Wall times only compare on the same machine; the baseline records where it was made.
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import freqtrade
+import numpy as np
+import pandas as pd
+from freqtrade.enums import RunMode
+from freqtrade.exchange import timeframe_to_seconds
+from freqtrade.strategy import IStrategy
+from freqtrade.strategy.parameters import BaseParameter
+
+from indicators.synthetic import resample_ohlcv, synthetic_ohlcv
+
+STRATEGIES_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = STRATEGIES_DIR.parent / "benchmarks" / "strategy_benchmark.json"
+DEFAULT_CANDLES = [10_000, 100_000, 1_000_000]
+DEFAULT_POINTS = 5
+DEFAULT_REPEATS = 3
+DEFAULT_THRESHOLD = 0.25
+
+PHASES = ['populate_indicators', 'populate_entry_trend', 'populate_exit_trend']
+BENCHMARK_PAIR = 'BTC/USDT:USDT'
+
+# Regressions smaller than these are timer/allocator noise
+MIN_SECONDS_REGRESSION = 0.01
+MIN_MEMORY_REGRESSION_MB = 1.0
+
+
+class SyntheticDataProvider:
+    """The part of freqtrade's DataProvider the strategies use, serving synthetic candles"""
+
+    def __init__(self, candles: pd.DataFrame, timeframe: str):
+        self._candles = candles
+        self._timeframe = timeframe
+        self._informative = {}
+        self.analyzed = None
+
+    def current_whitelist(self):
+        return [BENCHMARK_PAIR]
+
+    def get_pair_dataframe(self, pair, timeframe=None, candle_type=''):
+        timeframe = timeframe or self._timeframe
+        if timeframe not in self._informative:
+            seconds = timeframe_to_seconds(timeframe)
+            if seconds <= timeframe_to_seconds(self._timeframe):
+                self._informative[timeframe] = self._candles
+            else:
+                self._informative[timeframe] = resample_ohlcv(self._candles, f"{seconds}s")
+        return self._informative[timeframe].copy()
+
+    def get_analyzed_dataframe(self, pair, timeframe):
+        return self.analyzed, datetime.now()
+
+
+def discover_strategies(names=None):
+    """{name: strategy class} for the strategies in this directory, plus {file: error} for files that fail to import"""
+    strategies = {}
+    failures = {}
+    for path in sorted(STRATEGIES_DIR.glob("*.py")):
+        try:
+            module = importlib.import_module(path.stem)
+        except Exception as e:
+            failures[path.name] = f"{type(e).__name__}: {e}"
+            continue
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__ and issubclass(cls, IStrategy) and cls is not IStrategy:
+                if names is None or name in names:
+                    strategies[name] = cls
+    return strategies, failures
+
+
+def hyperopt_parameters(strategy):
+    """{name: parameter} of every hyperoptable parameter; they are class attributes shared by all instances"""
+    cls = type(strategy)
+    return {
+        name: getattr(cls, name) for name in dir(cls)
+        if not name.startswith('__') and isinstance(getattr(cls, name, None), BaseParameter)
+    }
+
+
+def sample_parameter_points(strategy, points, seed):
+    """Deterministic parameter points drawn from the strategy's hyperopt ranges, current values first"""
+    parameters = hyperopt_parameters(strategy)
+    defaults = {name: parameter.value for name, parameter in parameters.items()}
+    rng = np.random.default_rng([seed, zlib.crc32(type(strategy).__name__.encode())])
+
+    sampled = [defaults]
+    for _ in range(points - 1):
+        point = {}
+        for name, parameter in sorted(parameters.items()):
+            if hasattr(parameter, 'range'):
+                choices = list(parameter.range)
+                point[name] = choices[rng.integers(len(choices))]
+            else:
+                point[name] = float(rng.uniform(parameter.low, parameter.high))
+        sampled.append(point)
+    return sampled[:points]
+
+
+def create_strategy(cls, candles):
+    """Strategy instance configured like a hyperopt run over every space"""
+    config = {
+        'runmode': RunMode.HYPEROPT,
+        'spaces': ['all'],
+        'timeframe': cls.timeframe,
+        'stake_currency': 'USDT',
+        'dry_run': True
+    }
+    strategy = cls(config)
+    strategy.dp = SyntheticDataProvider(candles, cls.timeframe)
+    if hasattr(strategy, 'ft_bot_start'):
+        # Loads the parameters with hyperopt ranges enabled
+        strategy.ft_bot_start()
+    return strategy
+
+
+class PhaseRecorder:
+    """Wall time or peak traced memory of a callable, depending on whether memory is traced"""
+
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+
+    def measure(self, func, *args):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result = func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            return result, (peak - baseline) / (1024 * 1024)
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+
+def run_pass(strategy, candles, points, recorder):
+    """One hyperopt-like pass: populate once, then entry and exit for every parameter point"""
+    parameters = hyperopt_parameters(strategy)
+    metadata = {'pair': BENCHMARK_PAIR}
+
+    measured = {phase: [] for phase in PHASES}
+    indicators, value = recorder.measure(strategy.populate_indicators, candles.copy(), metadata)
+    measured['populate_indicators'].append(value)
+    strategy.dp.analyzed = indicators
+
+    for point in points:
+        for name, value in point.items():
+            parameters[name].value = value
+        entry, value = recorder.measure(strategy.populate_entry_trend, indicators.copy(), metadata)
+        measured['populate_entry_trend'].append(value)
+        _, value = recorder.measure(strategy.populate_exit_trend, entry, metadata)
+        measured['populate_exit_trend'].append(value)
+    return measured
+
+
+def benchmark_strategy(cls, candles, points, repeats, seed):
+    """
+    {phase: {'seconds', 'peak_mb'}} for a strategy class.
+
+    Every pass uses a fresh instance so per-instance caches start cold, as in a new hyperopt run.
+    seconds is the best of `repeats` passes (averaged over the points for entry/exit); peak_mb
+    comes from one extra pass under tracemalloc, which is too slow to time.
+    """
+    strategy = create_strategy(cls, candles)
+    parameters = hyperopt_parameters(strategy)
+    defaults = {name: parameter.value for name, parameter in parameters.items()}
+    parameter_points = sample_parameter_points(strategy, points, seed)
+    try:
+        timings = []
+        for _ in range(repeats):
+            strategy = create_strategy(cls, candles)
+            timings.append(run_pass(strategy, candles, parameter_points, PhaseRecorder(trace_memory=False)))
+
+        strategy = create_strategy(cls, candles)
+        tracemalloc.start()
+        try:
+            memory = run_pass(strategy, candles, parameter_points, PhaseRecorder(trace_memory=True))
+        finally:
+            tracemalloc.stop()
+    finally:
+        # Parameters live on the class; leave them as they were found
+        for name, value in defaults.items():
+            parameters[name].value = value
+
+    return {
+        phase: {
+            'seconds': round(min(float(np.mean(timing[phase])) for timing in timings), 6),
+            'peak_mb': round(max(memory[phase]), 3)
+        }
+        for phase in PHASES
+    }
+
+
+def environment():
+    """Where the numbers were measured; wall times do not transfer between machines"""
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': platform.node(),
+        'processor': platform.processor() or platform.machine(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'freqtrade': getattr(freqtrade, '__version__', 'unknown')
+    }
+
+
+def run_benchmark(strategies, candle_counts, points, repeats, seed):
+    """Benchmark results keyed by strategy and candle count"""
+    results = {}
+    for rows in candle_counts:
+        for name, cls in strategies.items():
+            candles = synthetic_ohlcv(rows, seed=seed, freq=f"{timeframe_to_seconds(cls.timeframe)}s")
+            print(f"⏱️  {name} on {rows:,} {cls.timeframe} candles ({points} parameter points)...")
+            try:
+                phases = benchmark_strategy(cls, candles, points, repeats, seed)
+            except Exception as e:
+                print(f"   ❌ {type(e).__name__}: {e}")
+                results.setdefault(name, {})[str(rows)] = {'error': f"{type(e).__name__}: {e}"}
+                continue
+            results.setdefault(name, {})[str(rows)] = phases
+            print("   " + "  ".join(
+                f"{phase.replace('populate_', '')} {values['seconds']:.3f}s/{values['peak_mb']:.1f}MB"
+                for phase, values in phases.items()
+            ))
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold, min_seconds=MIN_SECONDS_REGRESSION,
+                          min_memory_mb=MIN_MEMORY_REGRESSION_MB):
+    """Phases that got slower or bigger than the baseline by more than threshold, as readable lines"""
+    regressions = []
+    for name, by_rows in results.items():
+        for rows, phases in by_rows.items():
+            base_phases = baseline.get(name, {}).get(rows)
+            if not base_phases or 'error' in phases or 'error' in base_phases:
+                continue
+            for phase, values in phases.items():
+                base = base_phases.get(phase)
+                if not base:
+                    continue
+                checks = [('seconds', 's', min_seconds), ('peak_mb', 'MB', min_memory_mb)]
+                for key, unit, floor in checks:
+                    current, previous = values[key], base[key]
+                    if current > previous * (1 + threshold) and current - previous > floor:
+                        regressions.append(
+                            f"{name} @ {int(rows):,} candles {phase}: {previous:.3f}{unit} -> {current:.3f}{unit} "
+                            f"(+{(current / previous - 1) * 100 if previous else float('inf'):.0f}%)"
+                        )
+    return regressions
+
+
+def print_epoch_ranking(results):
+    """Strategies ordered by entry+exit time per hyperopt epoch at the largest candle count"""
+    ranking = []
+    for name, by_rows in results.items():
+        measured = {int(rows): phases for rows, phases in by_rows.items() if 'error' not in phases}
+        if not measured:
+            continue
+        rows = max(measured)
+        phases = measured[rows]
+        epoch = phases['populate_entry_trend']['seconds'] + phases['populate_exit_trend']['seconds']
+        ranking.append((epoch, name, rows, phases['populate_indicators']['seconds']))
+
+    if not ranking:
+        return
+    print("\n📊 Epoch time (entry + exit) per strategy:")
+    for epoch, name, rows, populate in sorted(ranking, reverse=True):
+        print(f"   {name:<36} {epoch:8.3f}s/epoch  populate {populate:8.3f}s  ({rows:,} candles)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m indicators benchmark',
+                                     description='Benchmark strategy populate/entry/exit on synthetic candles')
+    parser.add_argument('--candles', type=int, nargs='+', default=DEFAULT_CANDLES,
+                        help=f"Candle counts to benchmark (default: {' '.join(map(str, DEFAULT_CANDLES))})")
+    parser.add_argument('--strategies', nargs='+', help='Strategy classes to benchmark (default: all)')
+    parser.add_argument('--points', type=int, default=DEFAULT_POINTS,
+                        help=f'Hyperopt parameter points per strategy, defaults included (default: {DEFAULT_POINTS})')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f'Timed passes per strategy, the fastest counts (default: {DEFAULT_REPEATS})')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for candles and parameter points (default: 42)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help=f'Baseline JSON file (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Relative slowdown/growth that counts as a regression (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--output', type=Path, help='Also write the results of this run to a JSON file')
+    args = parser.parse_args(argv)
+
+    if args.points < 1 or args.repeats < 1:
+        parser.error('--points and --repeats must be at least 1')
+
+    strategies, failures = discover_strategies(set(args.strategies) if args.strategies else None)
+    for filename, error in failures.items():
+        print(f"⚠️  Skipping {filename}: {error}")
+    if args.strategies:
+        missing = sorted(set(args.strategies) - set(strategies))
+        if missing:
+            parser.error(f"Strategies not found or failed to import: {', '.join(missing)}")
+    if not strategies:
+        print("❌ No strategies to benchmark")
+        return 1
+
+    results = run_benchmark(strategies, args.candles, args.points, args.repeats, args.seed)
+    report = {
+        'environment': environment(),
+        'settings': {'points': args.points, 'repeats': args.repeats, 'seed': args.seed},
+        'results': results
+    }
+    print_epoch_ranking(results)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    status = 0
+    if args.baseline.exists() and not args.update_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('settings') != report['settings']:
+            print(f"\n⚠️  Baseline was measured with {baseline.get('settings')}, comparing anyway")
+        if baseline.get('environment', {}).get('machine') != report['environment']['machine']:
+            print(f"⚠️  Baseline was measured on {baseline.get('environment', {}).get('machine')}; wall times may not compare")
+
+        regressions = compare_with_baseline(results, baseline.get('results', {}), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}:")
+            for line in regressions:
+                print(f"   {line}")
+            status = 1
+        else:
+            print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    else:
+        # Merge so a partial run (a few strategies or candle counts) does not drop the other entries
+        merged = {}
+        if args.baseline.exists():
+            with open(args.baseline, 'r') as f:
+                merged = json.load(f).get('results', {})
+        for name, by_rows in results.items():
+            merged.setdefault(name, {}).update(by_rows)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({**report, 'results': merged}, f, indent=2)
+        print(f"\n💾 Baseline written to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
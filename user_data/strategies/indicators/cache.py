@@ -0,0 +1,135 @@
+"""
+Per-pair memos for indicators that only depend on a pair's candles.
+
+IndicatorCache keeps one result per indicator name. FeatureBank keeps every parameter variant
+of an indicator, so hyperopt epochs that revisit a parameter combination reuse its columns.
+shared_feature_bank() hands out one FeatureBank per pair, timeframe and set of candles to every
+strategy in the process, so long/short twins compute a feature once between them.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Memory a FeatureBank may hold before it evicts its least recently used features
+FEATURE_BANK_MAX_BYTES = 128 * 1024 * 1024
+
+# Candle sets kept per (pair, timeframe). Freqtrade runs populate_indicators and entry/exit on the
+# same untrimmed candles (startup included) and trims to the timerange afterwards, so a run needs
+# one set; the spare keeps the previous set when a process moves between timeranges, e.g. the
+# in-process IS and OOS backtests of a walk
+SHARED_BANKS_PER_PAIR = 2
+_shared_banks = {}
+
+
+class IndicatorCache:
+    """
+    Remembers indicator results per (pair, timeframe, name) and reuses them while the candles
+    they were computed from are unchanged.
+
+    Candles are identified by their length and first/last dates, which changes whenever new
+    candles arrive (dry/live) or a different timerange is loaded (backtesting).
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def candles_signature(dataframe: pd.DataFrame):
+        if len(dataframe) == 0:
+            return (0,)
+        if 'date' in dataframe.columns:
+            return (len(dataframe), dataframe['date'].iloc[0], dataframe['date'].iloc[-1])
+        return (len(dataframe), dataframe.index[0], dataframe.index[-1])
+
+    def get(self, pair: str, timeframe: str, name: str, dataframe: pd.DataFrame, compute):
+        """Return the cached result for these candles, calling compute(dataframe) on a miss"""
+        key = (pair, timeframe, name)
+        signature = self.candles_signature(dataframe)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        result = compute(dataframe)
+        self._entries[key] = (signature, result)
+        return result
+
+    def clear(self):
+        self._entries.clear()
+
+
+class FeatureBank:
+    """
+    Memoized features of one pair's candles, keyed by (feature, parameters...).
+
+    Features are evicted least recently used first once they take more than max_bytes, so a
+    long hyperopt over a wide parameter space keeps a bounded footprint per pair.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame, max_bytes: int = FEATURE_BANK_MAX_BYTES):
+        columns = [column for column in ['date', 'open', 'high', 'low', 'close', 'volume'] if column in dataframe.columns]
+        self.candles = dataframe[columns].copy()
+        self.signature = IndicatorCache.candles_signature(dataframe)
+        self.max_bytes = max_bytes
+        self._features = OrderedDict()
+        self._bytes = 0
+
+    def matches(self, dataframe: pd.DataFrame) -> bool:
+        """Whether the bank was built from these candles"""
+        return self.signature == IndicatorCache.candles_signature(dataframe)
+
+    def get(self, key, compute) -> pd.Series:
+        """Return the feature for key, calling compute(candles) the first time"""
+        feature = self._features.get(key)
+        if feature is not None:
+            self._features.move_to_end(key)
+            return feature
+
+        result = compute(self.candles)
+        if isinstance(result, pd.DataFrame):
+            feature = result.astype(np.float64).set_axis(self.candles.index)
+        else:
+            feature = pd.Series(np.asarray(result, dtype=np.float64), index=self.candles.index)
+        self._features[key] = feature
+        self._bytes += feature_nbytes(feature)
+        while self._bytes > self.max_bytes and len(self._features) > 1:
+            _, evicted = self._features.popitem(last=False)
+            self._bytes -= feature_nbytes(evicted)
+        return feature
+
+    def __len__(self):
+        return len(self._features)
+
+
+def feature_nbytes(feature) -> int:
+    if isinstance(feature, pd.DataFrame):
+        return int(feature.memory_usage(index=False).sum())
+    return feature.nbytes
+
+
+def shared_feature_bank(pair: str, timeframe: str, dataframe: pd.DataFrame) -> FeatureBank:
+    """
+    The process-wide FeatureBank for these candles of a pair.
+
+    Every strategy asking for the same pair, timeframe and candles (length and first/last date)
+    gets the same bank, so feature keys must name everything besides the candles a feature
+    depends on, e.g. ('rsi', source, period). Banks live per process; hyperopt workers each
+    build their own.
+    """
+    banks = _shared_banks.setdefault((pair, timeframe), OrderedDict())
+    signature = IndicatorCache.candles_signature(dataframe)
+    bank = banks.get(signature)
+    if bank is None:
+        bank = FeatureBank(dataframe)
+        banks[signature] = bank
+        if len(banks) > SHARED_BANKS_PER_PAIR:
+            banks.popitem(last=False)
+    else:
+        banks.move_to_end(signature)
+    return bank
+
+
+def clear_shared_feature_banks():
+    _shared_banks.clear()
@@ -0,0 +1,52 @@
+"""
+Lean dataframes for backtesting and hyperopt.
+
+Strategies keep a number of columns that only exist for plot_config or debugging, and store
+every indicator as float64. Hyperopt holds one copy of every pair's dataframe per worker, so
+in backtesting and hyperopt those plot-only columns are dropped, and indicator columns that no
+entry/exit logic reads are stored as float32. Columns that feed a signal stay float64: a
+float32 copy compared against a float64 value flips near-ties, and signals would differ from
+dry/live. plot-dataframe, dry/live and the webserver keep the full dataframe.
+
+Set "lean_dataframes": true/false in the freqtrade config to override the run mode default.
+"""
+
+import numpy as np
+import pandas as pd
+
+LEAN_RUNMODES = ('backtest', 'hyperopt')
+LEAN_CONFIG_KEY = 'lean_dataframes'
+
+
+def lean_mode(config) -> bool:
+    """Whether the strategy runs for backtesting/hyperopt, where plot-only columns are not needed"""
+    if not config:
+        return False
+    override = config.get(LEAN_CONFIG_KEY)
+    if override is not None:
+        return bool(override)
+    runmode = config.get('runmode')
+    return getattr(runmode, 'value', runmode) in LEAN_RUNMODES
+
+
+def drop_plot_columns(dataframe: pd.DataFrame, columns, config) -> pd.DataFrame:
+    """Drop plot-only columns in lean mode"""
+    if not lean_mode(config):
+        return dataframe
+    present = [column for column in columns if column in dataframe.columns]
+    if present:
+        dataframe = dataframe.drop(columns=present)
+    return dataframe
+
+
+def downcast_indicators(dataframe: pd.DataFrame, config, columns) -> pd.DataFrame:
+    """Store the given float64 columns as float32 in lean mode; only pass columns no entry/exit logic reads"""
+    if not lean_mode(config):
+        return dataframe
+    columns = [
+        column for column in columns
+        if column in dataframe.columns and dataframe[column].dtype == np.float64
+    ]
+    if columns:
+        dataframe = dataframe.astype({column: np.float32 for column in columns})
+    return dataframe
@@ -0,0 +1,47 @@
+"""
+Ornstein-Uhlenbeck process parameter estimation.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def rolling_ou_parameters(log_prices: pd.Series, lookback: int, delta_t: float = 1) -> pd.DataFrame:
+    """
+    Estimate OU parameters (theta, mu, sigma) from the `lookback` values before each row.
+
+    Every window is handled in a single pass of rolling moments:
+      mu    = window mean
+      theta = -ln(lag-1 autocorrelation) / delta_t, NaN unless the autocorrelation is positive
+      sigma = window std * sqrt(2 * theta / delta_t), NaN unless theta is positive
+
+    Row i uses log_prices[i - lookback:i], so the first `lookback` rows are NaN.
+    """
+    if lookback < 2:
+        nan = np.full(len(log_prices), np.nan)
+        return pd.DataFrame({'theta': nan, 'mu': nan, 'sigma': nan}, index=log_prices.index)
+
+    # Rolling moments are computed from running sums; shifting the series towards zero first keeps
+    # them from cancelling out (std and autocorrelation do not depend on the offset). The first
+    # value is used as the offset so no row depends on later data.
+    offset = log_prices.iloc[0] if len(log_prices) else 0.0
+    centered = log_prices - offset
+
+    rolling = centered.rolling(window=lookback)
+    mu = rolling.mean().shift(1) + offset
+    std = rolling.std().shift(1)
+
+    # A window of `lookback` values holds lookback - 1 (x[t], x[t-1]) pairs
+    autocorr = centered.rolling(window=lookback - 1).corr(centered.shift(1)).shift(1).clip(-1, 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        theta = (-np.log(autocorr.where(autocorr > 0))) / delta_t
+        sigma = std * np.sqrt(2 * theta.where(theta > 0) / delta_t)
+
+    return pd.DataFrame({'theta': theta, 'mu': mu, 'sigma': sigma}, index=log_prices.index)
+
+
+def ou_parameters_variant(bank, lookback: int) -> pd.DataFrame:
+    """rolling_ou_parameters of a FeatureBank's log closes for this lookback, memoized in the bank"""
+    return bank.get(('ou_parameters', lookback),
+                    lambda candles: rolling_ou_parameters(np.log(candles['close']), lookback))
@@ -0,0 +1,85 @@
+"""
+QFL (Quickfingers Luc) base detection helpers.
+"""
+
+import numpy as np
+import pandas as pd
+import talib
+
+
+def bars_since(condition: pd.Series) -> pd.Series:
+    """
+    Number of bars since `condition` was last True (Pine: barssince), computed in O(n).
+
+    Distances are measured in index labels like the original row loop did, and rows before
+    the first True are 0.
+    """
+    flags = condition.to_numpy(dtype=bool)
+    positions = np.arange(len(flags))
+
+    # Position of the most recent True at or before each row (-1 before the first one)
+    last_true = np.maximum.accumulate(np.where(flags, positions, -1))
+
+    index_values = condition.index.to_numpy()
+    ages = np.zeros(len(flags), dtype=np.int64)
+    seen = last_true >= 0
+    ages[seen] = index_values[seen] - index_values[last_true[seen]]
+    return pd.Series(ages, index=condition.index)
+
+
+def shifted(values: np.ndarray, periods: int) -> np.ndarray:
+    """values[i - periods] at row i (Pine: values[periods]), NaN where it does not exist"""
+    result = np.full(len(values), np.nan)
+    if periods < len(values):
+        result[periods:] = values[:len(values) - periods]
+    return result
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value forward"""
+    positions = np.where(np.isnan(values), 0, np.arange(len(values)))
+    return values[np.maximum.accumulate(positions)] if len(values) else values
+
+
+def qfl_indicators(dataframe: pd.DataFrame, volume_ma_period: int) -> pd.DataFrame:
+    """
+    QFL fractals and bases (Pine: fractalupF/fractaldownF and barssince), added to dataframe.
+
+    Adds volume_ma, fractal_up_condition, fractal_down_condition, fractal_up, fractal_down,
+    base_changed and base_age. A fractal is confirmed three bars after its extreme, by a
+    volume above the volume MA on the extreme's bar; its level is carried forward until the next.
+    """
+    high = dataframe['high'].to_numpy(dtype=np.float64)
+    low = dataframe['low'].to_numpy(dtype=np.float64)
+    volume = dataframe['volume'].to_numpy(dtype=np.float64)
+
+    # Volume moving average for fractal validation
+    volume_ma = talib.SMA(volume, timeperiod=volume_ma_period)
+
+    # Comparisons with the NaN warm-up are False, like pandas
+    with np.errstate(invalid='ignore'):
+        volume_confirmed = shifted(volume, 3) > shifted(volume_ma, 3)
+
+        # Up fractal: high[3]>high[4] and high[4]>high[5] and high[2]<high[3] and high[1]<high[2] and volume[3]>vam[3]
+        high_1, high_2, high_3, high_4, high_5 = (shifted(high, periods) for periods in range(1, 6))
+        up_condition = (high_3 > high_4) & (high_4 > high_5) & (high_2 < high_3) & (high_1 < high_2) & volume_confirmed
+
+        # Down fractal: low[3]<low[4] and low[4]<low[5] and low[2]>low[3] and low[1]>low[2] and volume[3]>vam[3]
+        low_1, low_2, low_3, low_4, low_5 = (shifted(low, periods) for periods in range(1, 6))
+        down_condition = (low_3 < low_4) & (low_4 < low_5) & (low_2 > low_3) & (low_1 > low_2) & volume_confirmed
+
+    # Pine: fd := down ? low[3] : nz(fd[1])
+    fractal_up = forward_fill(np.where(up_condition, high_3, np.nan))
+    fractal_down = forward_fill(np.where(down_condition, low_3, np.nan))
+
+    # Pine: barssince(fdowntf != fdowntf[1]); NaN never equals itself, so the warm-up counts as a change
+    base_changed = fractal_down != shifted(fractal_down, 1)
+
+    dataframe['volume_ma'] = volume_ma
+    dataframe['fractal_up_condition'] = up_condition
+    dataframe['fractal_down_condition'] = down_condition
+    dataframe['fractal_up'] = fractal_up
+    dataframe['fractal_down'] = fractal_down
+    dataframe['base_changed'] = base_changed
+    dataframe['base_age'] = bars_since(pd.Series(base_changed, index=dataframe.index))
+    return dataframe
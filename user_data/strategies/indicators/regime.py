@@ -0,0 +1,55 @@
+"""
+Higher-timeframe regime features shared across hyperopt epochs.
+
+Regime strategies used to compute their higher-timeframe indicators with the parameter values
+of the first populate_indicators call and merge the result, which freezes those parameters
+during hyperopt. Instead, a RegimeFeatureBank keeps the higher-timeframe indicators for every
+parameter value of a pair, and only a row-number column is merged into the strategy timeframe.
+Each epoch then builds the regime for the current values on the short higher-timeframe arrays
+and maps it over with one gather.
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicators.cache import FeatureBank
+
+REGIME_ROW_COLUMN = 'regime_row'
+
+
+class RegimeFeatureBank(FeatureBank):
+    """Memoized higher-timeframe features of one pair, keyed by (feature, parameters...)"""
+
+    @property
+    def informative(self) -> pd.DataFrame:
+        return self.candles
+
+    def row_numbers(self) -> np.ndarray:
+        """Row positions to merge into the strategy timeframe alongside the informative columns"""
+        return np.arange(len(self.informative), dtype=np.int32)
+
+    @staticmethod
+    def to_timeframe(regime, rows) -> np.ndarray:
+        """
+        Map a higher-timeframe 0/1 regime onto the strategy timeframe through the merged row
+        numbers. Rows without a higher-timeframe candle (-1 or NaN) get 0, like the merged
+        column compared with `== 1` did.
+        """
+        regime = np.asarray(regime, dtype=np.int8)
+        rows = np.asarray(rows, dtype=np.float64)
+        mapped = np.zeros(len(rows), dtype=np.int8)
+        valid = ~np.isnan(rows) & (rows >= 0)
+        mapped[valid] = regime[rows[valid].astype(np.int64)]
+        return mapped
+
+
+def regime_row_column(timeframe: str) -> str:
+    """Name of the merged row-number column for a regime timeframe"""
+    return f'{REGIME_ROW_COLUMN}_{timeframe}'
+
+
+def compact_regime_rows(dataframe: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Store the merged row numbers as int32 (-1 where no higher-timeframe candle matched)"""
+    column = regime_row_column(timeframe)
+    dataframe[column] = dataframe[column].fillna(-1).astype(np.int32)
+    return dataframe
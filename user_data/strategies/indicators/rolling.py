@@ -0,0 +1,153 @@
+"""
+Rolling-window statistics over NumPy sliding windows.
+
+pandas' rolling().apply() builds a Python object per window; these kernels compare or sort
+whole blocks of windows at once and reproduce the pandas results exactly.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Windows processed per block, bounding the temporary (block x window) arrays
+CHUNK_ROWS = 8192
+
+# 'linear' matches pandas' rolling().quantile(), 'nearest_rank' Pine's ta.percentile_nearest_rank
+QUANTILE_INTERPOLATIONS = ('linear', 'nearest_rank')
+
+
+def rolling_percent_rank(series: pd.Series, window: int) -> pd.Series:
+    """
+    Percent of values in the trailing window that are >= the current value.
+
+    Identical to series.rolling(window, min_periods=window).apply(lambda x: (x.iloc[-1] <= x).sum() / len(x) * 100),
+    including NaN for windows that are incomplete or contain NaN.
+    """
+    values = series.to_numpy(dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return pd.Series(result, index=series.index)
+
+    windows = sliding_window_view(values, window)
+    valid = ~np.isnan(windows).any(axis=1)
+
+    for start in range(0, len(windows), CHUNK_ROWS):
+        block = windows[start:start + CHUNK_ROWS]
+        counts = (block >= block[:, -1:]).sum(axis=1)
+        result[window - 1 + start:window - 1 + start + len(block)] = counts / window * 100
+
+    result[window - 1:][~valid] = np.nan
+    return pd.Series(result, index=series.index)
+
+
+def nearest_rank(window: int, quantile: float) -> int:
+    """0-based rank read by Pine's ta.percentile_nearest_rank: ceil(quantile * window) - 1"""
+    # Rounding keeps e.g. 0.29 * 100 from landing just above 29 and skipping a rank
+    rank = math.ceil(round(quantile * window, 9)) - 1
+    return min(max(rank, 0), window - 1)
+
+
+def quantile_ranks(window: int, low: float, high: float, interpolation: str = 'linear') -> range:
+    """0-based ranks of the sorted window that any quantile in [low, high] reads"""
+    if interpolation == 'nearest_rank':
+        return range(nearest_rank(window, low), nearest_rank(window, high) + 1)
+    if interpolation != 'linear':
+        raise ValueError(f"Unknown interpolation '{interpolation}'. Choose from: {', '.join(QUANTILE_INTERPOLATIONS)}")
+    first = max(int(math.floor(low * (window - 1))), 0)
+    last = min(int(math.floor(high * (window - 1))) + 1, window - 1)
+    return range(first, last + 1)
+
+
+def quantile_from_ranks(statistics, window: int, quantile: float, interpolation: str = 'linear'):
+    """
+    Quantile of each window from its order statistics ({rank: values}, as returned by
+    rolling_order_statistics). Raises KeyError when a rank the quantile reads is missing.
+    """
+    if interpolation == 'nearest_rank':
+        return statistics[nearest_rank(window, quantile)]
+
+    position = quantile * (window - 1)
+    rank = int(position)
+    if rank == position:
+        # pandas skips the interpolation when the position is exact
+        return statistics[rank]
+    low = statistics[rank]
+    high = statistics[rank + 1]
+    return low + (high - low) * (position - rank)
+
+
+def rolling_order_statistics(series: pd.Series, window: int, quantile_ranges, interpolation: str = 'linear') -> dict:
+    """
+    Sorted-window values needed to answer any quantile within `quantile_ranges`.
+
+    Returns {rank: array} where array[i] is the rank-th smallest value (0-based) of the window
+    ending at row i, NaN for windows that are incomplete or contain NaN. Only the ranks that
+    `interpolation` can touch for the given (low, high) quantile ranges are kept.
+    """
+    ranks = set()
+    for low, high in quantile_ranges:
+        ranks.update(quantile_ranks(window, low, high, interpolation))
+    ranks = sorted(ranks)
+
+    values = series.to_numpy(dtype=np.float64)
+    statistics = {rank: np.full(len(values), np.nan) for rank in ranks}
+    if window <= 0 or len(values) < window or not ranks:
+        return statistics
+
+    windows = sliding_window_view(values, window)
+    valid = ~np.isnan(windows).any(axis=1)
+
+    for start in range(0, len(windows), CHUNK_ROWS):
+        block = np.sort(windows[start:start + CHUNK_ROWS], axis=1)
+        for rank in ranks:
+            statistics[rank][window - 1 + start:window - 1 + start + len(block)] = block[:, rank]
+
+    for rank in ranks:
+        statistics[rank][window - 1:][~valid] = np.nan
+    return statistics
+
+
+def rolling_quantiles(series: pd.Series, window: int, quantiles, interpolation: str = 'linear') -> dict:
+    """
+    Several rolling quantiles from a single sort of every window.
+
+    Returns {quantile: Series}. With 'linear' each Series equals
+    series.rolling(window, min_periods=window).quantile(quantile); with 'nearest_rank' it equals
+    Pine's ta.percentile_nearest_rank(series, window, quantile * 100) once the window is full.
+    """
+    statistics = rolling_order_statistics(series, window, [(q, q) for q in quantiles], interpolation)
+    if window <= 0:
+        return {q: pd.Series(np.nan, index=series.index) for q in quantiles}
+    return {
+        q: pd.Series(quantile_from_ranks(statistics, window, q, interpolation), index=series.index)
+        for q in quantiles
+    }
+
+
+def add_rolling_order_statistics(dataframe: pd.DataFrame, column: str, window: int, quantile_ranges,
+                                 prefix: str, interpolation: str = 'linear') -> pd.DataFrame:
+    """Store rolling_order_statistics of a column as `{prefix}_{rank}` columns"""
+    statistics = rolling_order_statistics(dataframe[column], window, quantile_ranges, interpolation)
+    for rank, values in statistics.items():
+        dataframe[f'{prefix}_{rank}'] = values
+    return dataframe
+
+
+def rolling_quantile_from_order_statistics(dataframe: pd.DataFrame, column: str, window: int, quantile: float,
+                                           prefix: str, interpolation: str = 'linear') -> pd.Series:
+    """
+    Same values as rolling_quantiles(dataframe[column], window, [quantile], interpolation), read
+    from the `{prefix}_{rank}` columns in O(n). Falls back to computing the quantile when it lies
+    outside the precomputed ranges.
+    """
+    statistics = {
+        rank: dataframe[f'{prefix}_{rank}']
+        for rank in quantile_ranks(window, quantile, quantile, interpolation)
+        if f'{prefix}_{rank}' in dataframe.columns
+    }
+    try:
+        return quantile_from_ranks(statistics, window, quantile, interpolation).copy()
+    except KeyError:
+        return rolling_quantiles(dataframe[column], window, [quantile], interpolation)[quantile]
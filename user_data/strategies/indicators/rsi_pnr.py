@@ -0,0 +1,87 @@
+"""
+RSI PNR (percentile nearest rank) components of the RPS strategies.
+
+rsidiffMIN is how far RSI sits below its recent high and rsidiffMAX how far it sits above its
+recent low; a signal fires when one crosses its rolling 99th percentile. The percentile is
+pandas' linear rolling quantile by default, as the strategies always computed it; 'nearest_rank'
+gives Pine's ta.percentile_nearest_rank the indicator is named after. The *_variant helpers
+memoize each parameter combination in a FeatureBank, keyed by everything besides the candles,
+so they can live in a shared_feature_bank() used by both twins of a strategy.
+"""
+
+import numpy as np
+import pandas as pd
+import talib
+
+from indicators.cache import FeatureBank
+from indicators.rolling import rolling_quantiles
+from indicators.vwma import vwma_from_sums
+
+RSI_PERIOD = 14
+# Period of the VWMA/EMA that the 'vwma'/'ema' RSI sources smooth the close with
+RSI_SOURCE_PERIOD = 20
+RSI_PNR_QUANTILE = 0.99
+
+
+def rsi_source(dataframe: pd.DataFrame, source_type: str) -> pd.Series:
+    """Series the RSI is computed from: 'close', 'vwma' or 'ema' (anything else falls back to close)"""
+    if source_type == 'vwma':
+        return vwma_from_sums(dataframe, RSI_SOURCE_PERIOD)
+    if source_type == 'ema':
+        close = dataframe['close'].to_numpy(dtype=np.float64)
+        return pd.Series(talib.EMA(close, timeperiod=RSI_SOURCE_PERIOD), index=dataframe.index)
+    return dataframe['close']
+
+
+def rsi(source: pd.Series, period: int = RSI_PERIOD) -> pd.Series:
+    return pd.Series(talib.RSI(source.to_numpy(dtype=np.float64), timeperiod=period), index=source.index)
+
+
+def rsi_pnr_threshold(rsidiff: pd.Series, percentile_window: int, interpolation: str = 'linear') -> pd.Series:
+    """
+    99th percentile of the last percentile_window values: rolling().quantile(0.99) with 'linear',
+    Pine's ta.percentile_nearest_rank with 'nearest_rank'
+    """
+    return rolling_quantiles(rsidiff, percentile_window, [RSI_PNR_QUANTILE],
+                             interpolation=interpolation)[RSI_PNR_QUANTILE]
+
+
+def rsi_pnr_buy(rsi_series: pd.Series, lookback: int, percentile_window: int,
+                interpolation: str = 'linear') -> tuple:
+    """(rsidiffMIN, threshold): how far RSI is below its `lookback` high, and that distance's 99th percentile"""
+    rsidiffMIN = rsi_series.rolling(window=lookback).max() - rsi_series
+    return rsidiffMIN, rsi_pnr_threshold(rsidiffMIN, percentile_window, interpolation)
+
+
+def rsi_pnr_sell(rsi_series: pd.Series, lookback: int, percentile_window: int,
+                 interpolation: str = 'linear') -> tuple:
+    """(rsidiffMAX, threshold): how far RSI is above its `lookback` low, and that distance's 99th percentile"""
+    rsidiffMAX = rsi_series - rsi_series.rolling(window=lookback).min()
+    return rsidiffMAX, rsi_pnr_threshold(rsidiffMAX, percentile_window, interpolation)
+
+
+def rsi_variant(bank: FeatureBank, source_type: str) -> pd.Series:
+    """RSI of the selected source, computed once per source"""
+    return bank.get(('rsi', source_type, RSI_PERIOD), lambda candles: rsi(rsi_source(candles, source_type)))
+
+
+def rsi_pnr_buy_variant(bank: FeatureBank, source_type: str, lookback: int, percentile_window: int,
+                        interpolation: str = 'linear') -> tuple:
+    """rsi_pnr_buy for these parameter values, memoized in the bank"""
+    rsi_series = rsi_variant(bank, source_type)
+    rsidiffMIN = bank.get(('rsidiffMIN', source_type, lookback),
+                          lambda candles: rsi_series.rolling(window=lookback).max() - rsi_series)
+    threshold = bank.get(('rsidiffMIN_threshold', source_type, lookback, percentile_window, interpolation),
+                         lambda candles: rsi_pnr_threshold(rsidiffMIN, percentile_window, interpolation))
+    return rsidiffMIN, threshold
+
+
+def rsi_pnr_sell_variant(bank: FeatureBank, source_type: str, lookback: int, percentile_window: int,
+                         interpolation: str = 'linear') -> tuple:
+    """rsi_pnr_sell for these parameter values, memoized in the bank"""
+    rsi_series = rsi_variant(bank, source_type)
+    rsidiffMAX = bank.get(('rsidiffMAX', source_type, lookback),
+                          lambda candles: rsi_series - rsi_series.rolling(window=lookback).min())
+    threshold = bank.get(('rsidiffMAX_threshold', source_type, lookback, percentile_window, interpolation),
+                         lambda candles: rsi_pnr_threshold(rsidiffMAX, percentile_window, interpolation))
+    return rsidiffMAX, threshold
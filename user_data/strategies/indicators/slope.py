@@ -0,0 +1,19 @@
+"""
+Moving average slope expressed as an angle.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def slope_angle(ma_series: pd.Series, slope_bars: int) -> pd.Series:
+    """
+    Slope of a moving average in degrees: atan((ma - ma[slope_bars]) / slope_bars) * 180 / pi
+
+    The first slope_bars rows are NaN.
+    """
+    values = ma_series.to_numpy(dtype=np.float64)
+    slope = np.full(len(values), np.nan)
+    if 0 < slope_bars < len(values):
+        slope[slope_bars:] = (values[slope_bars:] - values[:-slope_bars]) / slope_bars
+    return pd.Series(np.arctan(slope) * 180 / np.pi, index=ma_series.index)
@@ -0,0 +1,57 @@
+"""
+Last analyzed row per pair for trade callbacks.
+
+custom_stoploss, custom_stake_amount and friends run for every open trade on every candle (and
+on every throttle loop in dry/live), and each call used to fetch the analyzed dataframe and
+slice its last row. A LastRowSnapshots fetches that row once per pair per candle and hands
+out plain floats afterwards.
+"""
+
+from datetime import timezone
+
+
+class LastRowSnapshots:
+    """
+    Values of selected columns in the last analyzed row of each pair, refreshed once per candle.
+
+    A snapshot is only kept when its row is the last closed candle. In dry/live a callback can
+    run after a new candle opened but before it was analyzed; that row is returned but fetched
+    again on the next call.
+    """
+
+    def __init__(self, timeframe: str, timeframe_seconds: int, columns):
+        self.timeframe = timeframe
+        self.timeframe_seconds = int(timeframe_seconds)
+        self.columns = list(columns)
+        self._snapshots = {}
+
+    def get(self, dp, pair: str, current_time):
+        """
+        {column: float} for the pair's last analyzed row, or None when no dataframe is available.
+        Columns missing from the dataframe are left out.
+        """
+        if current_time.tzinfo is None:
+            # freqtrade times are UTC
+            current_time = current_time.replace(tzinfo=timezone.utc)
+        candle = int(current_time.timestamp()) // self.timeframe_seconds
+        snapshot = self._snapshots.get(pair)
+        if snapshot is not None and snapshot[0] == candle:
+            return snapshot[1]
+
+        dataframe, _ = dp.get_analyzed_dataframe(pair, self.timeframe)
+        if dataframe is None or len(dataframe) == 0:
+            return None
+
+        last_row = dataframe.iloc[-1]
+        values = {column: float(last_row[column]) for column in self.columns if column in dataframe.columns}
+
+        row_candle = None
+        if 'date' in dataframe.columns:
+            row_candle = int(last_row['date'].timestamp()) // self.timeframe_seconds
+        if row_candle is None or row_candle >= candle - 1:
+            self._snapshots[pair] = (candle, values)
+        return values
+
+    def clear(self):
+        self._snapshots.clear()
+
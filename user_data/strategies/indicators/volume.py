@@ -0,0 +1,26 @@
+"""
+Volume-based indicators.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def on_balance_volume(close: pd.Series, volume: pd.Series) -> pd.Series:
+    """
+    On-Balance Volume: running sum of volume signed by the direction of the close.
+
+    Starts at 0 on the first candle (talib's OBV starts at the first volume instead) and keeps
+    the previous value on unchanged or missing closes. The sequential cumsum adds the same
+    terms in the same order as a row loop, so the result is bit-identical to one.
+    """
+    close_values = close.to_numpy(dtype=np.float64)
+    volume_values = volume.to_numpy(dtype=np.float64)
+
+    signed_volume = np.zeros(len(close_values))
+    if len(close_values) > 1:
+        change = close_values[1:] - close_values[:-1]
+        signed_volume[1:] = np.where(change > 0, volume_values[1:],
+                                     np.where(change < 0, -volume_values[1:], 0.0))
+
+    return pd.Series(np.cumsum(signed_volume), index=close.index)
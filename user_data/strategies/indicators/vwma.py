@@ -0,0 +1,106 @@
+"""
+Volume Weighted Moving Average from cumulative sums.
+
+Running sums of close*volume and volume are built once per candle set (add_vwma_sums); any
+VWMA period is then two subtractions and a division per row instead of two rolling sums.
+vwma_variant keeps the sums and every period's result in a shared_feature_bank, one per
+(pair, timeframe, candles), so hyperopt epochs that revisit a period (every epoch does, the
+parameter ranges hold a few dozen periods) and long/short twins get a lookup.
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicators.slope import slope_angle
+
+VWMA_SUM_COLUMNS = ['vwma_cum_pv', 'vwma_cum_volume', 'vwma_cum_missing', 'vwma_price_offset']
+
+
+def add_vwma_sums(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Add the running sums vwma_from_sums() reads from"""
+    close = dataframe['close'].to_numpy(dtype=np.float64)
+    volume = dataframe['volume'].to_numpy(dtype=np.float64)
+
+    # Prices are summed relative to the first close; it keeps the running sum small enough that
+    # subtracting two of its values does not lose precision on long histories
+    valid_close = close[~np.isnan(close)]
+    offset = valid_close[0] if len(valid_close) else 0.0
+
+    missing = np.isnan(close) | np.isnan(volume)
+    price_volume = np.where(missing, 0.0, (close - offset) * volume)
+
+    dataframe['vwma_cum_pv'] = np.cumsum(price_volume)
+    dataframe['vwma_cum_volume'] = np.cumsum(np.where(missing, 0.0, volume))
+    dataframe['vwma_cum_missing'] = np.cumsum(missing)
+    dataframe['vwma_price_offset'] = offset
+    return dataframe
+
+
+def window_sum(cumulative: np.ndarray, period: int, before: float = 0.0) -> np.ndarray:
+    """
+    Trailing `period` sums of the values behind a running sum (NaN for the first period - 1 rows).
+    `before` is the running sum just before the first row; it is not 0 on a slice (df.iloc[k:]) of
+    a dataframe that carries the sums.
+    """
+    sums = np.full(len(cumulative), np.nan)
+    if 0 < period <= len(cumulative):
+        sums[period - 1] = cumulative[period - 1] - before
+        sums[period:] = cumulative[period:] - cumulative[:-period]
+    return sums
+
+
+def sums_before_first_row(dataframe: pd.DataFrame):
+    """Running sums (price*volume, volume, missing) just before the first row, recovered from that row's candle"""
+    if len(dataframe) == 0:
+        return 0.0, 0.0, 0.0
+    close = float(dataframe['close'].iat[0])
+    volume = float(dataframe['volume'].iat[0])
+    missing = np.isnan(close) or np.isnan(volume)
+    price_volume = 0.0 if missing else (close - dataframe['vwma_price_offset'].iat[0]) * volume
+    return (dataframe['vwma_cum_pv'].iat[0] - price_volume,
+            dataframe['vwma_cum_volume'].iat[0] - (0.0 if missing else volume),
+            float(dataframe['vwma_cum_missing'].iat[0]) - float(missing))
+
+
+def vwma_from_sums(dataframe: pd.DataFrame, period: int = 21) -> pd.Series:
+    """
+    VWMA = Sum(Close * Volume) / Sum(Volume) over period
+
+    Uses the sums from add_vwma_sums when present, otherwise computes them for this call.
+    Windows that are incomplete, contain NaN or have no volume are NaN, like the rolling version.
+    """
+    if not set(VWMA_SUM_COLUMNS).issubset(dataframe.columns):
+        dataframe = add_vwma_sums(dataframe[['close', 'volume']].copy())
+
+    return pd.Series(compute_vwma(dataframe, period), index=dataframe.index)
+
+
+def compute_vwma(dataframe: pd.DataFrame, period: int) -> np.ndarray:
+    """VWMA values for one period from the running sums"""
+    pv_before, volume_before, missing_before = sums_before_first_row(dataframe)
+    price_volume = window_sum(dataframe['vwma_cum_pv'].to_numpy(), period, pv_before)
+    volume = window_sum(dataframe['vwma_cum_volume'].to_numpy(), period, volume_before)
+    missing = window_sum(dataframe['vwma_cum_missing'].to_numpy(dtype=np.float64), period, missing_before)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = price_volume / volume + dataframe['vwma_price_offset'].to_numpy()
+    result[missing != 0] = np.nan
+    result[volume == 0] = np.nan
+    return result
+
+
+def vwma_sums_variant(bank) -> pd.DataFrame:
+    """add_vwma_sums of a FeatureBank's candles, built once per bank"""
+    return bank.get(('vwma_sums',), lambda candles: add_vwma_sums(candles[['close', 'volume']].copy()))
+
+
+def vwma_variant(bank, period: int) -> pd.Series:
+    """VWMA of a FeatureBank's candles for this period, memoized in the bank"""
+    sums = vwma_sums_variant(bank)
+    return bank.get(('vwma', period), lambda candles: vwma_from_sums(sums, period))
+
+
+def vwma_slope_variant(bank, period: int, slope_bars: int) -> pd.Series:
+    """Slope angle of vwma_variant(bank, period) over slope_bars, memoized in the bank"""
+    vwma = vwma_variant(bank, period)
+    return bank.get(('vwma_slope_angle', period, slope_bars), lambda candles: slope_angle(vwma, slope_bars))
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Walk Forward Chart Renderer
+Draws IS/OOS equity, drawdown and trade-marker charts for every walk of a session in one pass.
+
+Charts are built from the trade lists the walk forward test already holds (the best hyperopt
+epoch's IS trades and the OOS backtest trades) instead of one freqtrade plot-profit run per
+chart, which reloads OHLCV and the strategy and writes a multi-MB plotly page. Every chart is
+a small HTML page with an inline SVG; the styling lives in one stylesheet shared by all charts.
+"""
+
+import html
+import json
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+STYLESHEET_NAME = "walk_charts.css"
+
+STYLESHEET = """body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 24px; color: #212529; }
+h1 { font-size: 20px; margin: 0 0 4px; }
+.subtitle { color: #6c757d; margin: 0 0 12px; }
+.stats { display: flex; flex-wrap: wrap; gap: 24px; margin: 0 0 12px; padding: 0; list-style: none; }
+.stats b { display: block; font-size: 18px; }
+.stats .positive { color: #28a745; }
+.stats .negative { color: #dc3545; }
+svg { max-width: 100%; height: auto; background: white; border: 1px solid #e9ecef; border-radius: 8px; }
+.grid { stroke: #e9ecef; stroke-width: 1; }
+.zero { stroke: #adb5bd; stroke-width: 1; stroke-dasharray: 4 3; }
+.label { font-size: 11px; fill: #6c757d; }
+.panel-title { font-size: 12px; fill: #495057; font-weight: bold; }
+.equity { fill: none; stroke: #007bff; stroke-width: 1.5; }
+.drawdown { fill: rgba(220, 53, 69, 0.25); stroke: #dc3545; stroke-width: 1; }
+.win { fill: #28a745; }
+.loss { fill: #dc3545; }
+.empty { font-size: 14px; fill: #6c757d; }
+"""
+
+WIDTH = 960
+MARGIN_LEFT = 80
+MARGIN_RIGHT = 20
+EQUITY_TOP = 30
+EQUITY_HEIGHT = 260
+DRAWDOWN_TOP = EQUITY_TOP + EQUITY_HEIGHT + 40
+DRAWDOWN_HEIGHT = 100
+HEIGHT = DRAWDOWN_TOP + DRAWDOWN_HEIGHT + 30
+
+
+def parse_time(value) -> Optional[datetime]:
+    """Trade timestamp (epoch milliseconds or a freqtrade date string) as an aware datetime"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def equity_curve(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Closed trades in close order with the cumulative profit and drawdown after each one"""
+    points = []
+    for trade in trades:
+        close_time = parse_time(trade.get('close_timestamp')) or parse_time(trade.get('close_date'))
+        if close_time is not None:
+            points.append({'time': close_time, 'trade': trade, 'profit': float(trade.get('profit_abs') or 0)})
+    points.sort(key=lambda point: point['time'])
+
+    cumulative = 0.0
+    peak = 0.0
+    for point in points:
+        cumulative += point['profit']
+        peak = max(peak, cumulative)
+        point['equity'] = cumulative
+        point['drawdown'] = cumulative - peak
+    return points
+
+
+def curve_stats(points: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Headline numbers shown above a chart"""
+    wins = sum(1 for point in points if point['profit'] > 0)
+    return {
+        'trades': len(points),
+        'profit_abs': points[-1]['equity'] if points else 0.0,
+        'win_rate': wins / len(points) * 100 if points else 0.0,
+        'max_drawdown_abs': -min((point['drawdown'] for point in points), default=0.0)
+    }
+
+
+def nice_ticks(low: float, high: float, count: int = 5) -> List[float]:
+    """Round tick values covering [low, high]"""
+    if high <= low:
+        high = low + 1
+    raw_step = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(multiple * magnitude for multiple in (1, 2, 2.5, 5, 10) if multiple * magnitude >= raw_step)
+    first = math.floor(low / step)
+    last = math.ceil(high / step)
+    return [round(i * step, 10) for i in range(first, last + 1)]
+
+
+def format_amount(value: float) -> str:
+    return f"{value:,.2f}" if abs(value) < 1000 else f"{value:,.0f}"
+
+
+def render_svg(points: List[Dict[str, Any]], start: datetime, end: datetime, stake_currency: str) -> str:
+    """Equity panel with trade markers above an underwater (drawdown) panel"""
+    if points:
+        start = min(start, points[0]['time'])
+        end = max(end, points[-1]['time'])
+    span = max((end - start).total_seconds(), 1)
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+
+    def x(time):
+        return MARGIN_LEFT + (time - start).total_seconds() / span * plot_width
+
+    equity_ticks = nice_ticks(min([0.0] + [p['equity'] for p in points]), max([0.0] + [p['equity'] for p in points]))
+    drawdown_ticks = nice_ticks(min([0.0] + [p['drawdown'] for p in points]), 0.0, count=2)
+
+    def scale(ticks, top, height):
+        low, high = ticks[0], ticks[-1]
+        return lambda value: top + (high - value) / (high - low) * height
+
+    y_equity = scale(equity_ticks, EQUITY_TOP, EQUITY_HEIGHT)
+    y_drawdown = scale(drawdown_ticks, DRAWDOWN_TOP, DRAWDOWN_HEIGHT)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" width="{WIDTH}" height="{HEIGHT}">']
+    parts.append(f'<text class="panel-title" x="{MARGIN_LEFT}" y="{EQUITY_TOP - 10}">Cumulative profit ({html.escape(stake_currency)})</text>')
+    parts.append(f'<text class="panel-title" x="{MARGIN_LEFT}" y="{DRAWDOWN_TOP - 10}">Drawdown ({html.escape(stake_currency)})</text>')
+
+    # Grid lines and value labels
+    for ticks, y in ((equity_ticks, y_equity), (drawdown_ticks, y_drawdown)):
+        for tick in ticks:
+            parts.append(f'<line class="grid" x1="{MARGIN_LEFT}" x2="{WIDTH - MARGIN_RIGHT}" y1="{y(tick):.1f}" y2="{y(tick):.1f}"/>'
+                         f'<text class="label" x="{MARGIN_LEFT - 6}" y="{y(tick) + 4:.1f}" text-anchor="end">{format_amount(tick)}</text>')
+    parts.append(f'<line class="zero" x1="{MARGIN_LEFT}" x2="{WIDTH - MARGIN_RIGHT}" y1="{y_equity(0):.1f}" y2="{y_equity(0):.1f}"/>')
+
+    # Date labels
+    for i in range(5):
+        time = start + (end - start) * i / 4
+        anchor = "start" if i == 0 else "end" if i == 4 else "middle"
+        parts.append(f'<text class="label" x="{x(time):.1f}" y="{HEIGHT - 10}" text-anchor="{anchor}">{time.strftime("%Y-%m-%d")}</text>')
+
+    if not points:
+        parts.append(f'<text class="empty" x="{WIDTH / 2}" y="{EQUITY_TOP + EQUITY_HEIGHT / 2}" text-anchor="middle">No trades in this period</text>')
+        parts.append('</svg>')
+        return ''.join(parts)
+
+    # Step curves: values change when a trade closes
+    equity_path = [f"M{x(start):.1f},{y_equity(0):.1f}"]
+    drawdown_path = [f"M{x(start):.1f},{y_drawdown(0):.1f}"]
+    for point in points:
+        px = x(point['time'])
+        equity_path.append(f"H{px:.1f}V{y_equity(point['equity']):.1f}")
+        drawdown_path.append(f"H{px:.1f}V{y_drawdown(point['drawdown']):.1f}")
+    equity_path.append(f"H{x(end):.1f}")
+    drawdown_path.append(f"H{x(end):.1f}V{y_drawdown(0):.1f}Z")
+    parts.append(f'<path class="drawdown" d="{"".join(drawdown_path)}"/>')
+    parts.append(f'<path class="equity" d="{"".join(equity_path)}"/>')
+
+    # Trade markers with details on hover
+    for point in points:
+        trade = point['trade']
+        ratio = float(trade.get('profit_ratio') or 0) * 100
+        details = (f"{trade.get('pair', '')} {'short' if trade.get('is_short') else 'long'}: "
+                   f"{point['profit']:+.2f} {stake_currency} ({ratio:+.2f}%)\n"
+                   f"{trade.get('open_date', '')} → {trade.get('close_date', '')}\n"
+                   f"{trade.get('exit_reason', '')}")
+        css_class = "win" if point['profit'] > 0 else "loss"
+        parts.append(f'<circle class="{css_class}" cx="{x(point["time"]):.1f}" cy="{y_equity(point["equity"]):.1f}" r="3">'
+                     f'<title>{html.escape(details)}</title></circle>')
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def render_chart_page(title: str, subtitle: str, points: List[Dict[str, Any]], start: datetime, end: datetime,
+                      stake_currency: str) -> str:
+    """Standalone chart page using the shared stylesheet next to it"""
+    stats = curve_stats(points)
+    profit_class = "positive" if stats['profit_abs'] >= 0 else "negative"
+    stats_html = (
+        f'<li>Trades<b>{stats["trades"]}</b></li>'
+        f'<li>Profit<b class="{profit_class}">{stats["profit_abs"]:+,.2f} {html.escape(stake_currency)}</b></li>'
+        f'<li>Win rate<b>{stats["win_rate"]:.1f}%</b></li>'
+        f'<li>Max drawdown<b class="negative">{format_amount(stats["max_drawdown_abs"])} {html.escape(stake_currency)}</b></li>'
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        f'<title>{html.escape(title)}</title><link rel="stylesheet" href="{STYLESHEET_NAME}"></head>\n'
+        f'<body><h1>{html.escape(title)}</h1><p class="subtitle">{html.escape(subtitle)}</p>'
+        f'<ul class="stats">{stats_html}</ul>\n{render_svg(points, start, end, stake_currency)}\n</body></html>\n'
+    )
+
+
+def period_bounds(period: Dict[str, str]):
+    """
+    Start and end of a walk's is_period/oos_period as aware datetimes. The end is exclusive, midnight
+    at the start of period['end'], like the stop of the freqtrade timerange the period was run with.
+    """
+    start = datetime.strptime(period['start'], '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    end = datetime.strptime(period['end'], '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    return start, end
+
+
+def load_is_trades(hyperopt_data: Optional[Dict[str, Any]], results_dir: Path) -> Optional[List[Dict[str, Any]]]:
+    """
+    IS trades of a walk's hyperopt results: read from the session's is_trades_walk_N.json, or
+    held inline by sessions from before the trades moved to their own file. None when missing.
+    """
+    is_backtest = (hyperopt_data or {}).get('is_backtest')
+    if not is_backtest:
+        return None
+    if 'trades_file' not in is_backtest:
+        return is_backtest.get('trades')
+    try:
+        with open(Path(results_dir) / is_backtest['trades_file'], 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def walk_chart_trades(walk: Dict[str, Any], results_dir: Path) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+    """IS and OOS trade lists of a walk, None where the walk holds no trade list"""
+    oos_backtest = walk.get('backtest_results')
+    return {
+        'IS': load_is_trades(walk.get('hyperopt_results'), results_dir),
+        'OOS': oos_backtest.get('trades') if oos_backtest else None
+    }
+
+
+def render_walk_charts(walks: List[Dict[str, Any]], results_dir: Path, strategy: str, pair: str,
+                       stake_currency: str = "USDT") -> Dict[int, Dict[str, bool]]:
+    """
+    Write charts/walk_<n>_IS_chart.html / walk_<n>_OOS_chart.html of a session's results directory
+    for every walk with trade lists. Returns {walk_num: {'IS': rendered, 'OOS': rendered}}.
+    """
+    charts_dir = Path(results_dir) / "charts"
+    charts_dir.mkdir(parents=True, exist_ok=True)
+    (charts_dir / STYLESHEET_NAME).write_text(STYLESHEET)
+
+    rendered = {}
+    for walk in walks:
+        if walk.get('status', 'completed').startswith('failed'):
+            continue
+        walk_num = walk['walk_num']
+        rendered[walk_num] = {}
+        for period_type, trades in walk_chart_trades(walk, results_dir).items():
+            if trades is None:
+                rendered[walk_num][period_type] = False
+                continue
+            period = walk['is_period'] if period_type == 'IS' else walk['oos_period']
+            start, end = period_bounds(period)
+            page = render_chart_page(
+                f"Walk {walk_num} {period_type} - {strategy}",
+                f"{pair} · {'in-sample (best hyperopt epoch)' if period_type == 'IS' else 'out-of-sample backtest'} · "
+                f"{period['start']} to {period['end']}",
+                equity_curve(trades), start, end, stake_currency
+            )
+            (charts_dir / f"walk_{walk_num}_{period_type}_chart.html").write_text(page, encoding='utf-8')
+            rendered[walk_num][period_type] = True
+    return rendered
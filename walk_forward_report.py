@@ -960,7 +960,7 @@ def generate_enhanced_html_report(walk_forward_results: Dict[str, Any], output_f
                     <ul>
                         <li><strong>IS Charts:</strong> Performance during hyperopt optimization period - shows how the strategy performed during parameter tuning</li>
                         <li><strong>OOS Charts:</strong> Performance during validation period - shows real-world performance with optimized parameters</li>
-                        <li><strong>Interactive Features:</strong> Hover for trade details, zoom in/out, and detailed profit curves</li>
+                        <li><strong>Interactive Features:</strong> Hover trade markers for trade details; cumulative profit and drawdown curves</li>
                     </ul>
                 </div>
             </div>
@@ -12,16 +12,32 @@ import json
 import glob
 import zipfile
 import re
+import time
+import copy
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
+from freqtrade_runner import RUNNER_BACKENDS, create_runner, run_backtest_in_process
+from hyperopt_cache import HyperoptCache
+from walk_forward_charts import load_is_trades, render_walk_charts
+
+# Walks that may wait between two pipeline stages; keeps hyperopt at most a couple of walks ahead
+PIPELINE_QUEUE_SIZE = 1
+
+# Guards in_process_backtests, which the stage testers of a pipeline share across threads
+IN_PROCESS_RESULTS_LOCK = threading.Lock()
+
 
 class WalkForwardTester:
     def __init__(self, insample_days, outsample_days, num_walks, end_date=None,
                  pair="BTC/USDT:USDT", timeframe="1h", epochs=200, hyperopt_loss="SharpeHyperOptLoss",
                  strategy="QFLRSI_Strategy", config="user_data/config.json", generate_report=False,
-                 spaces=["buy", "sell"], original_command=None):
+                 spaces=["buy", "sell"], original_command=None, parallel_walks=1, pipeline=False, runner="docker",
+                 resume_dir=None, use_cache=True, extend_from=None, freqtrade_charts=False):
         self.insample_days = insample_days
         self.outsample_days = outsample_days
         self.num_walks = num_walks
@@ -35,12 +51,32 @@ class WalkForwardTester:
         self.generate_report = generate_report
         self.spaces = spaces
         self.original_command = original_command
+        self.parallel_walks = max(1, parallel_walks)
+        # Overlap the stages of consecutive walks when they are not run in parallel as a whole
+        self.pipeline = pipeline and self.parallel_walks == 1
+        self.runner = create_runner(runner)
+        # Plot every chart with freqtrade plot-profit instead of drawing them all at the end from the walks' trades
+        self.freqtrade_charts = freqtrade_charts
+        self.hyperopt_cache = HyperoptCache() if use_cache else None
+        # Previous session to reuse unchanged walks from ("auto" picks the latest matching session)
+        self.extend_from = extend_from
+        self.reusable_walks = {}
+        # Results of in-process backtests, keyed by walk number, waiting to be collected
+        self.in_process_backtests = {}
         self.backtest_results_dir = Path("user_data/backtest_results")
         
-        # Create walk forward results directory
-        self.session_timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-        self.wf_results_dir = Path(f"walk_forward_results/{self.session_timestamp}")
+        # Create walk forward results directory (or reuse it when resuming a session)
+        if resume_dir:
+            self.wf_results_dir = Path(resume_dir)
+            self.session_timestamp = self.wf_results_dir.name
+        else:
+            self.session_timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+            self.wf_results_dir = Path(f"walk_forward_results/{self.session_timestamp}")
         self.wf_results_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_dir = self.wf_results_dir / "checkpoints"
+        
+        # Per-walk freqtrade user data directories (only used when walks run in parallel or pipelined)
+        self.workspace_root = Path(f"user_data/walk_forward_workspaces/{self.session_timestamp}")
         
         # Initialize results storage
         self.walk_forward_results = {
@@ -55,7 +91,11 @@ class WalkForwardTester:
                 'hyperopt_loss': self.hyperopt_loss,
                 'config': self.config,
                 'session_timestamp': self.session_timestamp,
-                'original_command': self.original_command
+                'original_command': self.original_command,
+                'parallel_walks': self.parallel_walks,
+                'pipeline': self.pipeline,
+                'runner': self.runner.name,
+                'chart_renderer': 'freqtrade' if self.freqtrade_charts else 'builtin'
             },
             'walks': [],
             'combined_metrics': {},
@@ -66,6 +106,46 @@ class WalkForwardTester:
         """Format date for freqtrade timerange"""
         return date.strftime("%Y%m%d")
     
+    @property
+    def isolated_walks(self):
+        """Whether stages of different walks can run at the same time and need separate workspaces"""
+        return self.parallel_walks > 1 or self.pipeline
+    
+    def walk_user_data_dir(self, walk_num):
+        """Freqtrade user data directory used by a walk (its own workspace when walks run in parallel or pipelined)"""
+        if self.isolated_walks:
+            return self.workspace_root / f"walk_{walk_num}"
+        return Path("user_data")
+    
+    def get_data_dir(self):
+        """Resolve the OHLCV data directory so isolated walks keep reading the shared data"""
+        return get_data_dir(self.config)
+    
+    def prepare_walk_workspace(self, walk_num):
+        """Create an isolated user data directory for a walk running in parallel or pipelined"""
+        if not self.isolated_walks:
+            return
+        
+        workspace = self.walk_user_data_dir(walk_num)
+        for subdir in ["backtest_results", "hyperopt_results", "plot"]:
+            (workspace / subdir).mkdir(parents=True, exist_ok=True)
+        
+        # Hyperopt writes <strategy>.json next to the strategy file, so every walk needs its own copy
+        shutil.copytree("user_data/strategies", workspace / "strategies",
+                        ignore=shutil.ignore_patterns("__pycache__"), dirs_exist_ok=True)
+        print(f"Walk {walk_num}: using isolated workspace {workspace}")
+    
+    def freqtrade_cmd(self, subcommand, *args, walk_num=None):
+        """Build freqtrade arguments, pointing them at the walk's workspace when walks run in parallel or pipelined"""
+        cmd = [subcommand]
+        if walk_num is not None and self.isolated_walks:
+            cmd.extend([
+                "--userdir", str(self.walk_user_data_dir(walk_num)),
+                "--datadir", self.get_data_dir()
+            ])
+        cmd.extend(args)
+        return cmd
+    
     def calculate_windows(self):
         """Calculate all hyperopt and backtest windows"""
         windows = []
@@ -134,7 +214,7 @@ class WalkForwardTester:
         print(f"📥 Ensuring data availability for {self.pair} ({total_days} days)...")
         
         download_cmd = [
-            "docker-compose", "run", "--rm", "freqtrade", "download-data",
+            "download-data",
             "--exchange", "bybit",
             "--pairs", self.pair,
             "--timeframes", self.timeframe,
@@ -143,7 +223,7 @@ class WalkForwardTester:
         ]
         
         try:
-            result = subprocess.run(download_cmd, check=True, capture_output=True, text=True)
+            result = self.runner.run(download_cmd)
             print(f"✅ Data download completed for {self.pair}")
             return True
         except subprocess.CalledProcessError as e:
@@ -164,20 +244,63 @@ class WalkForwardTester:
         
         return True
     
-    def collect_hyperopt_results(self, walk_num):
-        """Collect hyperopt results using hyperopt-show command"""
+    def collect_hyperopt_results(self, walk_num, since=None):
+        """Collect hyperopt results using hyperopt-show command, plus the best epoch's IS trades"""
         print(f"Collecting hyperopt results for walk {walk_num}...")
         
-        cmd = [
-            "docker-compose", "run", "--rm", "freqtrade", "hyperopt-show",
-            "--best", "--print-json", "--no-header"
-        ]
+        cmd = self.freqtrade_cmd(
+            "hyperopt-show",
+            "--best", "--print-json", "--no-header",
+            walk_num=walk_num
+        )
         
         try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            
+            result = self.runner.run(cmd)
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to collect hyperopt results for walk {walk_num}: {e}")
+            return None
+        
+        return self.parse_hyperopt_output(walk_num, result.stdout, self.load_best_epoch_trades(walk_num, since))
+    
+    def load_best_epoch_trades(self, walk_num, since=None):
+        """
+        Trades of the best epoch in the walk's latest hyperopt results file (.fthypt), or None.
+        
+        Hyperopt already backtested the best params over the whole IS range, so these trades stand
+        in for a second IS backtest. Files older than `since` belong to earlier runs and are ignored.
+        """
+        results_dir = self.walk_user_data_dir(walk_num) / "hyperopt_results"
+        results_files = [path for path in results_dir.glob("*.fthypt") if since is None or path.stat().st_mtime >= since]
+        if not results_files:
+            return None
+        
+        results_file = max(results_files, key=lambda path: path.stat().st_mtime)
+        best_epoch = None
+        try:
+            with open(results_file, 'r') as f:
+                for line in f:
+                    # An epoch line can hold thousands of trades, so only best epochs are decoded
+                    if '"is_best":true' not in line and '"is_best": true' not in line:
+                        continue
+                    epoch = json.loads(line)
+                    if epoch.get('is_best'):
+                        best_epoch = epoch
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Could not read best epoch from {results_file}: {e}")
+            return None
+        
+        trades = (best_epoch or {}).get('results_metrics', {}).get('trades')
+        if trades is None:
+            print(f"No best-epoch trades in {results_file} - IS chart will use a separate backtest")
+            return None
+        print(f"Loaded {len(trades)} best-epoch IS trades from {results_file}")
+        return trades
+    
+    def parse_hyperopt_output(self, walk_num, output, is_trades=None):
+        """Parse hyperopt-show output (and the best epoch's IS trades) and save it as hyperopt_walk_N.json"""
+        try:
             # Extract JSON from output (it's at the end after the tables)
-            output_lines = result.stdout.strip().split('\n')
+            output_lines = output.strip().split('\n')
             json_line = None
             
             # Find the JSON line (starts with '{')
@@ -193,10 +316,16 @@ class WalkForwardTester:
                 # Add some metadata from the full output
                 full_data = {
                     'params': hyperopt_data,
-                    'results_metrics': {},  # Will be filled from backtest results
-                    'raw_output': result.stdout  # Keep full output for reference
+                    'results_metrics': {},  # Filled from the best epoch's IS trades when available
+                    'raw_output': output  # Keep full output for reference
                 }
                 
+                if is_trades is not None:
+                    # IS metrics in the same layout as the OOS backtest_results; the trades go to their own file
+                    is_backtest = self.build_backtest_data({'strategy': {self.strategy: {'trades': is_trades}}})
+                    full_data['is_backtest'] = self.store_is_backtest(walk_num, is_backtest)
+                    full_data['results_metrics'] = is_backtest['comprehensive_metrics']
+                
                 # Save to file
                 hyperopt_file = self.wf_results_dir / f"hyperopt_walk_{walk_num}.json"
                 with open(hyperopt_file, 'w') as f:
@@ -208,20 +337,36 @@ class WalkForwardTester:
                 print(f"No JSON found in hyperopt output for walk {walk_num}")
                 return None
             
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to collect hyperopt results for walk {walk_num}: {e}")
-            return None
         except json.JSONDecodeError as e:
             print(f"Failed to parse hyperopt JSON for walk {walk_num}: {e}")
             return None
     
-    def generate_charts_for_walk(self, walk_num, hyperopt_start, hyperopt_end, backtest_start, backtest_end, backtest_filename=None):
+    def store_is_backtest(self, walk_num, is_backtest):
+        """
+        Write IS trades to is_trades_walk_N.json and return is_backtest with the file name in place of the trades.
+        
+        Walk data is rewritten into every checkpoint and into combined_results.json, which should not
+        grow with the number of IS trades.
+        """
+        trades_file = f"is_trades_walk_{walk_num}.json"
+        write_json_atomic(self.wf_results_dir / trades_file, is_backtest['trades'])
+        stored = {key: value for key, value in is_backtest.items() if key != 'trades'}
+        stored['trades_file'] = trades_file
+        stored['total_trades'] = len(is_backtest['trades'])
+        return stored
+    
+    def load_is_trades(self, hyperopt_data):
+        """IS trades of a walk's hyperopt results, or None"""
+        return load_is_trades(hyperopt_data, self.wf_results_dir)
+    
+    def generate_charts_for_walk(self, walk_num, hyperopt_start, hyperopt_end, backtest_start, backtest_end, backtest_filename=None,
+                                 is_trades=None):
         """Generate profit charts for both IS and OOS periods"""
         print(f"Generating charts for walk {walk_num}...")
         
-        # Generate IS period chart (need to run backtest for IS period first)
+        # Generate IS period chart (from hyperopt's best-epoch trades, or a backtest of the IS period)
         is_timerange = f"{self.format_date(hyperopt_start)}-{self.format_date(hyperopt_end)}"
-        is_chart_success = self.generate_is_chart_for_period(walk_num, hyperopt_start, hyperopt_end, "IS")
+        is_chart_success = self.generate_is_chart_for_period(walk_num, hyperopt_start, hyperopt_end, "IS", is_trades)
         
         # Copy IS chart with specific naming
         if is_chart_success:
@@ -237,38 +382,48 @@ class WalkForwardTester:
         
         return is_chart_success, oos_chart_success
     
-    def generate_is_chart_for_period(self, walk_num, hyperopt_start, hyperopt_end, period_type):
-        """Generate IS chart by running backtest with optimized parameters for IS period"""
+    def generate_is_chart_for_period(self, walk_num, hyperopt_start, hyperopt_end, period_type, is_trades=None):
+        """Generate IS chart from hyperopt's best-epoch trades, or by backtesting the optimized parameters over the IS period"""
         try:
-            # First run a backtest for the IS period using the optimized parameters
             timerange = f"{self.format_date(hyperopt_start)}-{self.format_date(hyperopt_end)}"
             
-            backtest_cmd = [
-                "docker-compose", "run", "--rm", "freqtrade", "backtesting",
-                "--config", self.config,
-                "--strategy", self.strategy,
-                "--timeframe", self.timeframe,
-                "--timerange", timerange,
-                "--pairs", self.pair,
-                "--export", "trades"
-            ]
-            
-            print(f"Running backtest for {period_type} period chart in walk {walk_num}, timerange: {timerange}")
-            backtest_result = subprocess.run(backtest_cmd, check=True, capture_output=True, text=True)
-            print(f"Backtest for {period_type} period completed successfully")
+            if is_trades is not None:
+                # Hyperopt already backtested these params over this timerange; plot its trades
+                is_backtest_file = self.write_is_backtest_file(walk_num, is_trades)
+                print(f"Using hyperopt's best-epoch trades for {period_type} period chart in walk {walk_num} (no extra backtest)")
+            else:
+                # First run a backtest for the IS period using the optimized parameters
+                is_backtest_file = None
+                backtest_cmd = self.freqtrade_cmd(
+                    "backtesting",
+                    "--config", self.config,
+                    "--strategy", self.strategy,
+                    "--timeframe", self.timeframe,
+                    "--timerange", timerange,
+                    "--pairs", self.pair,
+                    "--export", "trades",
+                    walk_num=walk_num
+                )
+                
+                print(f"Running backtest for {period_type} period chart in walk {walk_num}, timerange: {timerange}")
+                backtest_result = self.runner.run(backtest_cmd)
+                print(f"Backtest for {period_type} period completed successfully")
             
             # Now generate the chart
-            chart_cmd = [
-                "docker-compose", "run", "--rm", "freqtrade", "plot-profit",
+            chart_cmd = self.freqtrade_cmd(
+                "plot-profit",
                 "--config", self.config,
                 "--strategy", self.strategy,
                 "--timeframe", self.timeframe,
                 "--timerange", timerange,
-                "--pairs", self.pair
-            ]
+                "--pairs", self.pair,
+                walk_num=walk_num
+            )
+            if is_backtest_file:
+                chart_cmd.extend(["--export-filename", is_backtest_file])
             
             print(f"Generating {period_type} chart for walk {walk_num}, timerange: {timerange}")
-            chart_result = subprocess.run(chart_cmd, check=True, capture_output=True, text=True)
+            chart_result = self.runner.run(chart_cmd)
             print(f"{period_type} chart generated successfully for walk {walk_num}")
             return True
             
@@ -284,21 +439,28 @@ class WalkForwardTester:
             print(f"Exception while generating {period_type} chart for walk {walk_num}: {e}")
             return False
     
+    def write_is_backtest_file(self, walk_num, is_trades):
+        """Write IS trades as a backtest result file that plot-profit can read"""
+        is_backtest_file = self.walk_user_data_dir(walk_num) / "backtest_results" / f"hyperopt-best-walk_{walk_num}.json"
+        write_json_atomic(is_backtest_file, {'strategy': {self.strategy: {'trades': is_trades}}, 'strategy_comparison': []})
+        return str(is_backtest_file)
+    
     def generate_oos_chart_from_existing_backtest(self, walk_num, timerange, period_type):
         """Generate OOS chart from existing backtest results"""
         try:
             # Use the existing backtest result to generate the chart for the specific timerange
-            chart_cmd = [
-                "docker-compose", "run", "--rm", "freqtrade", "plot-profit",
+            chart_cmd = self.freqtrade_cmd(
+                "plot-profit",
                 "--config", self.config,
                 "--strategy", self.strategy,
                 "--timeframe", self.timeframe,
                 "--timerange", timerange,
-                "--pairs", self.pair
-            ]
+                "--pairs", self.pair,
+                walk_num=walk_num
+            )
             
             print(f"Generating {period_type} chart for walk {walk_num} using existing backtest results")
-            chart_result = subprocess.run(chart_cmd, check=True, capture_output=True, text=True)
+            chart_result = self.runner.run(chart_cmd)
             print(f"{period_type} chart generated successfully for walk {walk_num}")
             return True
             
@@ -318,14 +480,15 @@ class WalkForwardTester:
         """Generate OOS chart from specific backtest file"""
         try:
             # Build the plot-profit command
-            chart_cmd = [
-                "docker-compose", "run", "--rm", "freqtrade", "plot-profit",
+            chart_cmd = self.freqtrade_cmd(
+                "plot-profit",
                 "--config", self.config,
                 "--strategy", self.strategy,
                 "--timeframe", self.timeframe,
                 "--timerange", timerange,
-                "--pairs", self.pair
-            ]
+                "--pairs", self.pair,
+                walk_num=walk_num
+            )
             
             # Add specific backtest file if available
             if backtest_filename:
@@ -334,7 +497,7 @@ class WalkForwardTester:
             else:
                 print(f"Generating {period_type} chart for walk {walk_num} using most recent backtest")
             
-            chart_result = subprocess.run(chart_cmd, check=True, capture_output=True, text=True)
+            chart_result = self.runner.run(chart_cmd)
             print(f"{period_type} chart generated successfully for walk {walk_num}")
             return True
             
@@ -353,17 +516,18 @@ class WalkForwardTester:
     def generate_chart_for_period(self, walk_num, timerange, period_type):
         """Generate a chart for a specific period (IS or OOS)"""
         try:
-            cmd = [
-                "docker-compose", "run", "--rm", "freqtrade", "plot-profit",
+            cmd = self.freqtrade_cmd(
+                "plot-profit",
                 "--config", self.config,
                 "--strategy", self.strategy,
                 "--timeframe", self.timeframe,
                 "--timerange", timerange,
-                "--pairs", self.pair
-            ]
+                "--pairs", self.pair,
+                walk_num=walk_num
+            )
             
             print(f"Generating {period_type} chart for walk {walk_num}, timerange: {timerange}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            result = self.runner.run(cmd)
             print(f"{period_type} chart generated successfully for walk {walk_num}")
             return True
             
@@ -382,9 +546,7 @@ class WalkForwardTester:
     def copy_chart_to_results_dir(self, walk_num, period_type):
         """Copy generated chart from plot/ to walk_forward_results directory with specific naming"""
         try:
-            import shutil
-            
-            plot_dir = Path("user_data/plot")
+            plot_dir = self.walk_user_data_dir(walk_num) / "plot"
             if not plot_dir.exists():
                 print(f"Plot directory {plot_dir} does not exist")
                 return
@@ -411,8 +573,16 @@ class WalkForwardTester:
         print(f"Collecting comprehensive backtest results for walk {walk_num}...")
         
         try:
-            # Extract comprehensive data directly from the ZIP files
-            backtest_data = self.extract_backtest_from_zip()
+            in_process_result = self.pop_in_process_backtest(walk_num)
+            if in_process_result:
+                # Results are already in memory, no need to read them back from the ZIP file
+                main_data, strategy_params = in_process_result
+                backtest_data = self.build_backtest_data(main_data, strategy_params)
+                source = "IN-PROCESS BACKTEST"
+            else:
+                # Extract comprehensive data directly from the ZIP files of this walk
+                backtest_data = self.extract_backtest_from_zip(self.walk_user_data_dir(walk_num) / "backtest_results")
+                source = "ZIP EXTRACTION"
             
             if not backtest_data:
                 print(f"No comprehensive data found for walk {walk_num}")
@@ -426,7 +596,7 @@ class WalkForwardTester:
             # Save analysis summary for reference
             analysis_file = self.wf_results_dir / f"analysis_walk_{walk_num}.txt"
             with open(analysis_file, 'w') as f:
-                f.write("=== ZIP EXTRACTION SUMMARY ===\n")
+                f.write(f"=== {source} SUMMARY ===\n")
                 f.write(f"Extracted {len(backtest_data.get('trades', []))} trades\n")
                 f.write(f"Comprehensive metrics: {backtest_data.get('comprehensive_metrics', {})}\n")
             
@@ -471,11 +641,12 @@ class WalkForwardTester:
         
         return result
     
-    def extract_backtest_from_zip(self):
+    def extract_backtest_from_zip(self, backtest_dir=None):
         """Extract comprehensive backtest data directly from ZIP files"""
+        backtest_dir = Path(backtest_dir) if backtest_dir else self.backtest_results_dir
         try:
             # Find the most recent ZIP file
-            zip_files = glob.glob(str(self.backtest_results_dir / "*.zip"))
+            zip_files = glob.glob(str(backtest_dir / "*.zip"))
             if not zip_files:
                 # Check current directory as fallback
                 zip_files = glob.glob("*.zip")
@@ -488,12 +659,8 @@ class WalkForwardTester:
             
             print(f"Extracting data from: {latest_zip}")
             
-            backtest_data = {
-                'trades': [],
-                'strategy_params': {},
-                'stats': {},
-                'comprehensive_metrics': {}
-            }
+            main_data = {}
+            strategy_params = None
             
             with zipfile.ZipFile(latest_zip, 'r') as z:
                 # Read main backtest results (contains trades)
@@ -506,49 +673,6 @@ class WalkForwardTester:
                 if main_file:
                     with z.open(main_file) as f:
                         main_data = json.load(f)
-                        
-                        # Extract strategy data
-                        strategy_data = main_data.get('strategy', {}).get(self.strategy, {})
-                        
-                        if strategy_data:
-                            trades = strategy_data.get('trades', [])
-                            backtest_data['trades'] = trades
-                            
-                            # Calculate comprehensive metrics from trades
-                            if trades:
-                                profits = [t.get('profit_abs', 0) for t in trades]
-                                profit_ratios = [t.get('profit_ratio', 0) for t in trades]
-                                durations = [t.get('trade_duration', 0) for t in trades]
-                                
-                                total_profit_abs = sum(profits)
-                                total_trades = len(trades)
-                                winning_trades = [p for p in profits if p > 0]
-                                losing_trades = [p for p in profits if p < 0]
-                                
-                                backtest_data['comprehensive_metrics'] = {
-                                    'total_profit_abs': total_profit_abs,
-                                    'total_profit_pct': sum(profit_ratios) * 100,
-                                    'total_trades': total_trades,
-                                    'winning_trades': len(winning_trades),
-                                    'losing_trades': len(losing_trades),
-                                    'win_rate': (len(winning_trades) / total_trades * 100) if total_trades > 0 else 0,
-                                    'profit_factor': (sum(winning_trades) / abs(sum(losing_trades))) if losing_trades else float('inf'),
-                                    'avg_profit_abs': total_profit_abs / total_trades if total_trades > 0 else 0,
-                                    'avg_duration_minutes': sum(durations) / total_trades if total_trades > 0 else 0,
-                                    'best_trade': max(profits) if profits else 0,
-                                    'worst_trade': min(profits) if profits else 0,
-                                    'avg_win': sum(winning_trades) / len(winning_trades) if winning_trades else 0,
-                                    'avg_loss': sum(losing_trades) / len(losing_trades) if losing_trades else 0
-                                }
-                                
-                                # Calculate Sharpe-like ratio (simplified)
-                                if len(profit_ratios) > 1:
-                                    import statistics
-                                    mean_return = statistics.mean(profit_ratios)
-                                    std_return = statistics.stdev(profit_ratios)
-                                    backtest_data['comprehensive_metrics']['sharpe_approx'] = mean_return / std_return if std_return > 0 else 0
-                                else:
-                                    backtest_data['comprehensive_metrics']['sharpe_approx'] = 0
                 
                 # Read strategy parameters
                 strategy_file = None
@@ -560,17 +684,75 @@ class WalkForwardTester:
                 if strategy_file:
                     with z.open(strategy_file) as f:
                         strategy_params = json.load(f)
-                        backtest_data['strategy_params'] = strategy_params
             
-            print(f"Extracted {len(backtest_data['trades'])} trades and comprehensive metrics")
-            return backtest_data
+            return self.build_backtest_data(main_data, strategy_params)
             
         except Exception as e:
             print(f"Failed to extract from ZIP: {e}")
             return None
     
+    def build_backtest_data(self, main_data, strategy_params=None):
+        """Build trades and comprehensive metrics from a freqtrade backtest results dict"""
+        backtest_data = {
+            'trades': [],
+            'strategy_params': {},
+            'stats': {},
+            'comprehensive_metrics': {}
+        }
+        
+        # Extract strategy data
+        strategy_data = main_data.get('strategy', {}).get(self.strategy, {})
+        
+        if strategy_data:
+            trades = strategy_data.get('trades', [])
+            backtest_data['trades'] = trades
+            
+            # Calculate comprehensive metrics from trades
+            if trades:
+                profits = [t.get('profit_abs', 0) for t in trades]
+                profit_ratios = [t.get('profit_ratio', 0) for t in trades]
+                durations = [t.get('trade_duration', 0) for t in trades]
+                
+                total_profit_abs = sum(profits)
+                total_trades = len(trades)
+                winning_trades = [p for p in profits if p > 0]
+                losing_trades = [p for p in profits if p < 0]
+                
+                backtest_data['comprehensive_metrics'] = {
+                    'total_profit_abs': total_profit_abs,
+                    'total_profit_pct': sum(profit_ratios) * 100,
+                    'total_trades': total_trades,
+                    'winning_trades': len(winning_trades),
+                    'losing_trades': len(losing_trades),
+                    'win_rate': (len(winning_trades) / total_trades * 100) if total_trades > 0 else 0,
+                    'profit_factor': (sum(winning_trades) / abs(sum(losing_trades))) if losing_trades else float('inf'),
+                    'avg_profit_abs': total_profit_abs / total_trades if total_trades > 0 else 0,
+                    'avg_duration_minutes': sum(durations) / total_trades if total_trades > 0 else 0,
+                    'best_trade': max(profits) if profits else 0,
+                    'worst_trade': min(profits) if profits else 0,
+                    'avg_win': sum(winning_trades) / len(winning_trades) if winning_trades else 0,
+                    'avg_loss': sum(losing_trades) / len(losing_trades) if losing_trades else 0
+                }
+                
+                # Calculate Sharpe-like ratio (simplified)
+                if len(profit_ratios) > 1:
+                    import statistics
+                    mean_return = statistics.mean(profit_ratios)
+                    std_return = statistics.stdev(profit_ratios)
+                    backtest_data['comprehensive_metrics']['sharpe_approx'] = mean_return / std_return if std_return > 0 else 0
+                else:
+                    backtest_data['comprehensive_metrics']['sharpe_approx'] = 0
+        
+        if strategy_params:
+            backtest_data['strategy_params'] = strategy_params
+        
+        print(f"Extracted {len(backtest_data['trades'])} trades and comprehensive metrics")
+        return backtest_data
+    
     def extract_hyperopt_profit(self, hyperopt_data):
-        """Extract profit from hyperopt raw output"""
+        """Extract IS profit from the best epoch's trades, falling back to hyperopt raw output"""
+        if hyperopt_data and hyperopt_data.get('results_metrics'):
+            return hyperopt_data['results_metrics'].get('total_profit_abs', 0)
         if not hyperopt_data or not hyperopt_data.get('raw_output'):
             return None
         
@@ -704,8 +886,8 @@ class WalkForwardTester:
         """Run hyperopt optimization"""
         timerange = f"{self.format_date(hyperopt_start)}-{self.format_date(hyperopt_end)}"
         
-        cmd = [
-            "docker-compose", "run", "--rm", "freqtrade", "hyperopt",
+        cmd = self.freqtrade_cmd(
+            "hyperopt",
             "--config", self.config,
             "--strategy", self.strategy,
             "--hyperopt-loss", self.hyperopt_loss,
@@ -714,14 +896,15 @@ class WalkForwardTester:
             "--timeframe", self.timeframe,
             "--timerange", timerange,
             "--pairs", self.pair,
-            "-j", "-1"
-        ]
+            "-j", "-1",
+            walk_num=walk_num
+        )
         
         print(f"Walk {walk_num}: Running hyperopt for {timerange}")
-        print(f"Command: {' '.join(cmd)}")
+        print(f"Command: {self.runner.describe(cmd)}")
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            self.runner.run(cmd)
             print(f"Hyperopt completed successfully for walk {walk_num}")
             return True
         except subprocess.CalledProcessError as e:
@@ -733,29 +916,34 @@ class WalkForwardTester:
         """Run backtest with optimized parameters"""
         timerange = f"{self.format_date(backtest_start)}-{self.format_date(backtest_end)}"
         
-        cmd = [
-            "docker-compose", "run", "--rm", "freqtrade", "backtesting",
+        cmd = self.freqtrade_cmd(
+            "backtesting",
             "--config", self.config,
             "--strategy", self.strategy,
             "--timeframe", self.timeframe,
             "--timerange", timerange,
             "--pairs", self.pair,
-            "--export", "trades"
-        ]
+            "--export", "trades",
+            walk_num=walk_num
+        )
+        
+        if self.runner.in_process_backtest:
+            return self.run_backtest_in_process(cmd, timerange, walk_num)
         
         print(f"Walk {walk_num}: Running backtest for {timerange}")
-        print(f"Command: {' '.join(cmd)}")
+        print(f"Command: {self.runner.describe(cmd)}")
         
         # Get timestamp before running backtest to find the created file
-        import time
         pre_backtest_time = time.time()
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            self.runner.run(cmd)
             print(f"Backtest completed successfully for walk {walk_num}")
             
             # Find the backtest file that was just created
-            backtest_file = self.find_latest_backtest_file(pre_backtest_time)
+            backtest_file = self.find_latest_backtest_file(
+                pre_backtest_time, self.walk_user_data_dir(walk_num) / "backtest_results"
+            )
             if backtest_file:
                 print(f"Backtest file created: {backtest_file}")
                 return backtest_file
@@ -768,13 +956,35 @@ class WalkForwardTester:
             print(f"Error output: {e.stderr}")
             return False
     
+    def run_backtest_in_process(self, cmd, timerange, walk_num):
+        """Run backtest through freqtrade's Backtesting API and keep the results in memory"""
+        print(f"Walk {walk_num}: Running in-process backtest for {timerange}")
+        
+        try:
+            # In-process backtests run on this process's single core, counted like any other backtest
+            with self.runner.cpu_budget.job(cmd) as cmd:
+                results, strategy_params, backtest_file = run_backtest_in_process(cmd)
+        except Exception as e:
+            print(f"Backtest failed for walk {walk_num}: {e}")
+            return False
+        
+        with IN_PROCESS_RESULTS_LOCK:
+            self.in_process_backtests[walk_num] = (results, strategy_params)
+        print(f"Backtest completed successfully for walk {walk_num}")
+        
+        if backtest_file:
+            print(f"Backtest file created: {backtest_file}")
+            return backtest_file
+        return True
+    
+    def pop_in_process_backtest(self, walk_num):
+        """Take the in-memory (results, strategy_params) of a walk's in-process backtest, or None"""
+        with IN_PROCESS_RESULTS_LOCK:
+            return self.in_process_backtests.pop(walk_num, None)
     
-    def find_latest_backtest_file(self, after_time):
+    def find_latest_backtest_file(self, after_time, backtest_dir=None):
         """Find the most recent backtest file created after the specified time"""
-        import os
-        import glob
-        
-        backtest_dir = Path("user_data/backtest_results")
+        backtest_dir = Path(backtest_dir) if backtest_dir else self.backtest_results_dir
         if not backtest_dir.exists():
             return None
             
@@ -798,105 +1008,313 @@ class WalkForwardTester:
         return max(recent_files, key=os.path.getmtime)
     
     
-    def run_walk_forward_test(self):
-        """Execute the complete walk forward test"""
-        print(f"Starting Walk Forward Test:")
-        print(f"- In-sample period: {self.insample_days} days")
-        print(f"- Out-of-sample period: {self.outsample_days} days")
-        print(f"- Number of walks: {self.num_walks}")
-        print(f"- End date: {self.end_date.strftime('%Y-%m-%d')}")
-        print(f"- Strategy: {self.strategy}")
-        print(f"- Pair: {self.pair}")
+    def session_settings(self):
+        """Settings needed to recreate this session with --resume"""
+        return {
+            'insample_days': self.insample_days,
+            'outsample_days': self.outsample_days,
+            'num_walks': self.num_walks,
+            'end_date': self.format_date(self.end_date),
+            'pair': self.pair,
+            'timeframe': self.timeframe,
+            'epochs': self.epochs,
+            'hyperopt_loss': self.hyperopt_loss,
+            'strategy': self.strategy,
+            'config': self.config,
+            'spaces': self.spaces,
+            'original_command': self.original_command
+        }
+    
+    def save_session_settings(self):
+        """Write session.json once so an interrupted session can be resumed"""
+        session_file = self.wf_results_dir / "session.json"
+        if not session_file.exists():
+            write_json_atomic(session_file, self.session_settings())
+    
+    def save_checkpoint(self, walk_data, stage, strategy_params=None):
+        """Atomically persist the state of a walk after each completed stage"""
+        checkpoint = {
+            'stage': stage,
+            'saved_at': datetime.now().isoformat(),
+            'walk_data': walk_data,
+            'strategy_params': strategy_params
+        }
+        write_json_atomic(self.checkpoint_dir / f"walk_{walk_data['walk_num']}.json", checkpoint)
+    
+    def load_checkpoint(self, walk_data):
+        """Load the checkpoint of a walk if it matches the walk's windows"""
+        checkpoint_file = self.checkpoint_dir / f"walk_{walk_data['walk_num']}.json"
+        if not checkpoint_file.exists():
+            return None
         
-        if not self.ensure_data_and_config():
-            print("Configuration validation or data download failed. Exiting.")
-            return False
+        try:
+            with open(checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable checkpoint {checkpoint_file}: {e}")
+            return None
         
-        self.clean_backtest_results()
+        saved_walk = checkpoint.get('walk_data', {})
+        if saved_walk.get('is_period') != walk_data['is_period'] or saved_walk.get('oos_period') != walk_data['oos_period']:
+            print(f"Ignoring checkpoint {checkpoint_file}: windows do not match this session")
+            return None
+        return checkpoint
+    
+    def read_strategy_params(self, walk_num):
+        """Read the params file hyperopt wrote next to the strategy"""
+        params_file = self.walk_user_data_dir(walk_num) / "strategies" / f"{self.strategy}.json"
+        try:
+            with open(params_file, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+    
+    def restore_strategy_params(self, walk_num, strategy_params):
+        """Put a walk's optimized params back next to the strategy before backtesting"""
+        params_file = self.walk_user_data_dir(walk_num) / "strategies" / f"{self.strategy}.json"
+        write_json_atomic(params_file, strategy_params)
+    
+    def hyperopt_cache_key(self, window):
+        """Fingerprint of the hyperopt run of a walk, or None when caching is disabled"""
+        if not self.hyperopt_cache:
+            return None
         
-        windows = list(self.calculate_windows())
+        timerange = f"{self.format_date(window['hyperopt_start'])}-{self.format_date(window['hyperopt_end'])}"
+        return self.hyperopt_cache.fingerprint(
+            self.strategy, self.spaces, self.hyperopt_loss, timerange, self.pair, self.timeframe,
+            self.epochs, self.config, output_kind="hyperopt-show",
+            strategies_dir=self.walk_user_data_dir(window['walk']) / "strategies"
+        )
+    
+    def find_extendable_session(self):
+        """Find the most recent earlier session with the same walk settings"""
+        settings = self.session_settings()
+        ignored = {'num_walks', 'end_date', 'original_command'}
+        
+        for session_file in sorted(Path("walk_forward_results").glob("*/session.json"), reverse=True):
+            if session_file.parent.resolve() == self.wf_results_dir.resolve():
+                continue
+            try:
+                with open(session_file, 'r') as f:
+                    previous = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            
+            if all(previous.get(key) == value for key, value in settings.items() if key not in ignored):
+                return session_file.parent
+        return None
+    
+    def load_reusable_walks(self):
+        """Index completed walks of the session being extended by their IS/OOS windows"""
+        session_dir = self.find_extendable_session() if self.extend_from == "auto" else Path(self.extend_from)
+        if not session_dir:
+            print("No earlier session with matching settings found - running all walks")
+            return
         
-        for window in windows:
-            print(f"\n{'='*60}")
-            print(f"Walk {window['walk']} of {self.num_walks}")
-            print(f"Hyperopt period: {window['hyperopt_start'].strftime('%Y-%m-%d')} to {window['hyperopt_end'].strftime('%Y-%m-%d')}")
-            print(f"Backtest period: {window['backtest_start'].strftime('%Y-%m-%d')} to {window['backtest_end'].strftime('%Y-%m-%d')}")
-            print(f"{'='*60}")
-            
-            # Initialize walk data
-            walk_data = {
-                'walk_num': window['walk'],
-                'is_period': {
-                    'start': window['hyperopt_start'].strftime('%Y-%m-%d'),
-                    'end': window['hyperopt_end'].strftime('%Y-%m-%d')
-                },
-                'oos_period': {
-                    'start': window['backtest_start'].strftime('%Y-%m-%d'),
-                    'end': window['backtest_end'].strftime('%Y-%m-%d')
-                },
-                'hyperopt_results': None,
-                'backtest_results': None,
-                'best_params': None,
-                'wfer': None,
-                'degradation': None,
-                'status': 'pending',
-                'failure_reason': None
-            }
-            
-            # Run hyperopt
-            hyperopt_success = self.run_hyperopt(window['hyperopt_start'], window['hyperopt_end'], window['walk'])
-            if not hyperopt_success:
-                print(f"🚨 Hyperopt failed for walk {window['walk']} - marking as failed and continuing with next walk")
-                walk_data['status'] = 'failed_hyperopt'
-                walk_data['failure_reason'] = 'Hyperopt optimization failed (possible NaN values or insufficient data)'
-                # Add failed walk to results and continue with next walk
-                self.walk_forward_results['walks'].append(walk_data)
+        for checkpoint_file in sorted((session_dir / "checkpoints").glob("walk_*.json")):
+            try:
+                with open(checkpoint_file, 'r') as f:
+                    checkpoint = json.load(f)
+            except (OSError, json.JSONDecodeError):
                 continue
             
-            # Collect hyperopt results
-            hyperopt_data = self.collect_hyperopt_results(window['walk'])
+            walk_data = checkpoint.get('walk_data', {})
+            if checkpoint.get('stage') == 'finished' and walk_data.get('status') == 'completed':
+                window_key = (walk_data['is_period']['start'], walk_data['is_period']['end'],
+                              walk_data['oos_period']['start'], walk_data['oos_period']['end'])
+                self.reusable_walks[window_key] = (session_dir, walk_data)
+        
+        self.walk_forward_results['metadata']['extended_from'] = str(session_dir)
+        print(f"📎 Extending session {session_dir}: {len(self.reusable_walks)} completed walks available for reuse")
+        
+        # Keep the report in sync with the session being extended
+        if (session_dir / "walk_forward_report.html").exists():
+            self.generate_report = True
+    
+    def reuse_previous_walk(self, walk_data):
+        """Copy a completed walk with identical windows from the extended session"""
+        window_key = (walk_data['is_period']['start'], walk_data['is_period']['end'],
+                      walk_data['oos_period']['start'], walk_data['oos_period']['end'])
+        if window_key not in self.reusable_walks:
+            return None
+        
+        session_dir, previous = self.reusable_walks[window_key]
+        old_num, new_num = previous['walk_num'], walk_data['walk_num']
+        
+        # Per-walk artifacts are named after the walk number, which shifts when the end date moves
+        for old_name, new_name in [
+            (f"hyperopt_walk_{old_num}.json", f"hyperopt_walk_{new_num}.json"),
+            (f"backtest_walk_{old_num}.json", f"backtest_walk_{new_num}.json"),
+            (f"analysis_walk_{old_num}.txt", f"analysis_walk_{new_num}.txt"),
+            (f"is_trades_walk_{old_num}.json", f"is_trades_walk_{new_num}.json"),
+            (f"charts/walk_{old_num}_IS_chart.html", f"charts/walk_{new_num}_IS_chart.html"),
+            (f"charts/walk_{old_num}_OOS_chart.html", f"charts/walk_{new_num}_OOS_chart.html")
+        ]:
+            source = session_dir / old_name
+            if source.exists():
+                destination = self.wf_results_dir / new_name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, destination)
+        
+        reused = dict(previous)
+        reused['walk_num'] = new_num
+        is_backtest = (previous.get('hyperopt_results') or {}).get('is_backtest')
+        if is_backtest and 'trades_file' in is_backtest:
+            reused['hyperopt_results'] = dict(previous['hyperopt_results'],
+                                              is_backtest=dict(is_backtest, trades_file=f"is_trades_walk_{new_num}.json"))
+        reused['reused_from'] = {'session': str(session_dir), 'walk_num': old_num}
+        print(f"♻️  Walk {new_num} has the same windows as walk {old_num} of {session_dir} - reusing it")
+        return self.finish_walk(reused)
+    
+    def finish_walk(self, walk_data):
+        """Checkpoint the final state of a walk and return it"""
+        self.save_checkpoint(walk_data, 'finished')
+        return walk_data
+    
+    def init_walk_data(self, window):
+        """Initialize the result record of a walk"""
+        return {
+            'walk_num': window['walk'],
+            'is_period': {
+                'start': window['hyperopt_start'].strftime('%Y-%m-%d'),
+                'end': window['hyperopt_end'].strftime('%Y-%m-%d')
+            },
+            'oos_period': {
+                'start': window['backtest_start'].strftime('%Y-%m-%d'),
+                'end': window['backtest_end'].strftime('%Y-%m-%d')
+            },
+            'hyperopt_results': None,
+            'backtest_results': None,
+            'best_params': None,
+            'wfer': None,
+            'degradation': None,
+            'status': 'pending',
+            'failure_reason': None
+        }
+    
+    def run_single_walk(self, window):
+        """Run hyperopt, backtest and chart generation for a single walk window"""
+        job = self.hyperopt_stage(window)
+        job = self.backtest_stage(job)
+        return self.post_process_stage(job)
+    
+    def hyperopt_stage(self, window):
+        """
+        First stage of a walk: reuse a checkpoint or earlier session, or run (or fetch cached) hyperopt.
+        Returns the walk's job for the next stage; job['done'] is set when the walk needs no further stages.
+        """
+        print(f"\n{'='*60}")
+        print(f"Walk {window['walk']} of {self.num_walks}")
+        print(f"Hyperopt period: {window['hyperopt_start'].strftime('%Y-%m-%d')} to {window['hyperopt_end'].strftime('%Y-%m-%d')}")
+        print(f"Backtest period: {window['backtest_start'].strftime('%Y-%m-%d')} to {window['backtest_end'].strftime('%Y-%m-%d')}")
+        print(f"{'='*60}")
+        
+        walk_data = self.init_walk_data(window)
+        job = {'window': window, 'walk_data': walk_data, 'hyperopt_data': None, 'backtest_filename': None, 'done': False}
+        
+        # Skip whatever a previous run of this session already finished
+        checkpoint = self.load_checkpoint(walk_data)
+        if checkpoint and checkpoint['stage'] == 'finished' and checkpoint['walk_data'].get('status') == 'completed':
+            print(f"⏭️  Walk {window['walk']} already completed - reusing checkpoint")
+            return dict(job, walk_data=checkpoint['walk_data'], done=True)
+        
+        reused = self.reuse_previous_walk(walk_data)
+        if reused:
+            return dict(job, walk_data=reused, done=True)
+        
+        self.prepare_walk_workspace(window['walk'])
+        
+        if checkpoint and checkpoint['stage'] == 'hyperopt_completed' and checkpoint.get('strategy_params'):
+            print(f"⏭️  Walk {window['walk']} hyperopt already completed - resuming from backtest")
+            self.restore_strategy_params(window['walk'], checkpoint['strategy_params'])
+            walk_data = checkpoint['walk_data']
+            hyperopt_data = walk_data.get('hyperopt_results')
+        else:
+            cache_key = self.hyperopt_cache_key(window)
+            cached = self.hyperopt_cache.get(cache_key) if cache_key else None
+            
+            if cached:
+                print(f"♻️  Walk {window['walk']}: reusing cached hyperopt result ({cache_key[:12]})")
+                self.restore_strategy_params(window['walk'], cached['strategy_params'])
+                hyperopt_data = self.parse_hyperopt_output(window['walk'], cached['output'], cached.get('is_trades'))
+            else:
+                # Run hyperopt
+                hyperopt_started = time.time()
+                hyperopt_success = self.run_hyperopt(window['hyperopt_start'], window['hyperopt_end'], window['walk'])
+                if not hyperopt_success:
+                    print(f"🚨 Hyperopt failed for walk {window['walk']} - marking as failed and continuing with next walk")
+                    walk_data['status'] = 'failed_hyperopt'
+                    walk_data['failure_reason'] = 'Hyperopt optimization failed (possible NaN values or insufficient data)'
+                    return dict(job, walk_data=self.finish_walk(walk_data), done=True)
+                
+                # Collect hyperopt results
+                hyperopt_data = self.collect_hyperopt_results(window['walk'], since=hyperopt_started)
+                if hyperopt_data and cache_key:
+                    is_trades = self.load_is_trades(hyperopt_data)
+                    self.hyperopt_cache.put(cache_key, self.read_strategy_params(window['walk']), hyperopt_data['raw_output'],
+                                            is_trades=is_trades)
+            
             if hyperopt_data:
                 walk_data['hyperopt_results'] = hyperopt_data
                 walk_data['best_params'] = hyperopt_data.get('params', {})
             
-            # Run backtest
-            backtest_result = self.run_backtest(window['backtest_start'], window['backtest_end'], window['walk'])
-            if not backtest_result:
-                print(f"🚨 Backtest failed for walk {window['walk']} - marking as failed and continuing with next walk")
-                walk_data['status'] = 'failed_backtest'
-                walk_data['failure_reason'] = 'Backtest execution failed'
-                # Add failed walk to results and continue with next walk
-                self.walk_forward_results['walks'].append(walk_data)
-                continue
+            self.save_checkpoint(walk_data, 'hyperopt_completed', self.read_strategy_params(window['walk']))
+        
+        return dict(job, walk_data=walk_data, hyperopt_data=hyperopt_data)
+    
+    def backtest_stage(self, job):
+        """Second stage of a walk: out-of-sample backtest with the optimized parameters"""
+        if job['done']:
+            return job
+        
+        window, walk_data = job['window'], job['walk_data']
+        
+        # Run backtest
+        backtest_result = self.run_backtest(window['backtest_start'], window['backtest_end'], window['walk'])
+        if not backtest_result:
+            print(f"🚨 Backtest failed for walk {window['walk']} - marking as failed and continuing with next walk")
+            walk_data['status'] = 'failed_backtest'
+            walk_data['failure_reason'] = 'Backtest execution failed'
+            return dict(job, walk_data=self.finish_walk(walk_data), done=True)
+        
+        # Store backtest filename if available
+        backtest_filename = backtest_result if isinstance(backtest_result, str) else None
+        walk_data['backtest_filename'] = backtest_filename
+        return dict(job, backtest_filename=backtest_filename)
+    
+    def post_process_stage(self, job):
+        """Last stage of a walk: metrics, per-walk result files and charts. Returns the finished walk data"""
+        if job['done']:
+            return job['walk_data']
+        
+        window, walk_data, hyperopt_data = job['window'], job['walk_data'], job['hyperopt_data']
+        is_backtest = (hyperopt_data or {}).get('is_backtest')
+        
+        # Collect backtest results
+        backtest_data = self.collect_backtest_results(window['walk'])
+        if backtest_data:
+            walk_data['backtest_results'] = backtest_data
             
-            # Store backtest filename if available
-            backtest_filename = backtest_result if isinstance(backtest_result, str) else None
-            walk_data['backtest_filename'] = backtest_filename
+            # Calculate comprehensive metrics using the rich data
+            walk_data['metrics'] = self.calculate_walk_metrics(hyperopt_data, backtest_data)
             
-            # Collect backtest results
-            backtest_data = self.collect_backtest_results(window['walk'])
-            if backtest_data:
-                walk_data['backtest_results'] = backtest_data
-                
-                # Calculate comprehensive metrics using the rich data
-                walk_data['metrics'] = self.calculate_walk_metrics(hyperopt_data, backtest_data)
-                
-                # Calculate WFER using profit_total_abs from comprehensive stats
-                is_return = self.extract_hyperopt_profit(hyperopt_data) if hyperopt_data else None
-                oos_return = self.extract_backtest_profit(backtest_data)
-                
-                if is_return and oos_return:
-                    walk_data['wfer'] = oos_return / is_return if is_return != 0 else 0
-                    walk_data['degradation'] = ((oos_return - is_return) / is_return * 100) if is_return != 0 else 0
-                elif oos_return:
-                    # If we have OOS data but no IS data, still record what we have
-                    walk_data['wfer'] = 0  # Can't calculate without IS data
-                    walk_data['degradation'] = 0
-                    walk_data['oos_profit'] = oos_return
-                else:
-                    walk_data['wfer'] = 0
-                    walk_data['degradation'] = 0
+            # Calculate WFER using profit_total_abs from comprehensive stats
+            is_return = self.extract_hyperopt_profit(hyperopt_data) if hyperopt_data else None
+            oos_return = self.extract_backtest_profit(backtest_data)
             
+            if is_return and oos_return:
+                walk_data['wfer'] = oos_return / is_return if is_return != 0 else 0
+                walk_data['degradation'] = ((oos_return - is_return) / is_return * 100) if is_return != 0 else 0
+            elif oos_return:
+                # If we have OOS data but no IS data, still record what we have
+                walk_data['wfer'] = 0  # Can't calculate without IS data
+                walk_data['degradation'] = 0
+                walk_data['oos_profit'] = oos_return
+            else:
+                walk_data['wfer'] = 0
+                walk_data['degradation'] = 0
+        
+        if self.freqtrade_charts:
             # Generate charts for this walk
             print(f"Generating charts for walk {window['walk']}...")
             is_chart_success, oos_chart_success = self.generate_charts_for_walk(
@@ -905,20 +1323,207 @@ class WalkForwardTester:
                 window['hyperopt_end'],
                 window['backtest_start'], 
                 window['backtest_end'],
-                backtest_filename
+                job['backtest_filename'],
+                is_trades=self.load_is_trades(hyperopt_data)
             )
+        else:
+            # Charts of all walks are drawn in one pass once every walk has finished (render_charts)
+            is_chart_success, oos_chart_success = False, False
+            if hyperopt_data and not is_backtest:
+                self.backtest_is_period(window['walk'], window['hyperopt_start'], window['hyperopt_end'], hyperopt_data)
+        
+        # Store chart generation status
+        walk_data['chart_generation'] = {
+            'is_chart_success': is_chart_success,
+            'oos_chart_success': oos_chart_success
+        }
+        
+        # Mark walk as successful
+        walk_data['status'] = 'completed'
+        
+        return self.finish_walk(walk_data)
+    
+    def backtest_is_period(self, walk_num, hyperopt_start, hyperopt_end, hyperopt_data):
+        """Backtest the optimized params over the IS period for walks without best-epoch trades; stores them as is_backtest"""
+        print(f"No best-epoch trades for walk {walk_num} - running an IS backtest for the IS chart")
+        if not self.run_backtest(hyperopt_start, hyperopt_end, walk_num):
+            return
+        
+        in_process_result = self.pop_in_process_backtest(walk_num)
+        if in_process_result:
+            is_backtest = self.build_backtest_data(*in_process_result)
+        else:
+            is_backtest = self.extract_backtest_from_zip(self.walk_user_data_dir(walk_num) / "backtest_results")
+        if is_backtest:
+            hyperopt_data['is_backtest'] = self.store_is_backtest(walk_num, is_backtest)
+    
+    def render_charts(self):
+        """Draw the IS/OOS equity charts of every walk in one pass from the trades the walks already hold"""
+        if self.freqtrade_charts:
+            return
+        
+        started = time.time()
+        charts_dir = self.wf_results_dir / "charts"
+        walks = self.walk_forward_results['walks']
+        rendered = render_walk_charts(walks, self.wf_results_dir, self.strategy, self.pair, self.stake_currency())
+        
+        for walk in walks:
+            if walk['walk_num'] not in rendered:
+                continue
+            # Walks reused from an earlier session may only have that session's copied chart files
+            charts = walk.setdefault('chart_generation', {'is_chart_success': False, 'oos_chart_success': False})
+            charts['is_chart_success'] = rendered[walk['walk_num']]['IS'] or charts['is_chart_success']
+            charts['oos_chart_success'] = rendered[walk['walk_num']]['OOS'] or charts['oos_chart_success']
+            # The walk was checkpointed as finished before its charts existed
+            self.save_checkpoint(walk, 'finished')
+        
+        count = sum(sum(charts.values()) for charts in rendered.values())
+        print(f"📈 Rendered {count} charts for {len(rendered)} walks in {time.time() - started:.1f}s ({charts_dir})")
+    
+    def stake_currency(self):
+        """Stake currency from the config, used to label chart profits"""
+        try:
+            with open(self.config, 'r') as f:
+                return json.load(f).get('stake_currency', 'USDT')
+        except (OSError, json.JSONDecodeError):
+            return 'USDT'
+    
+    def stage_tester(self):
+        """Copy of this tester with its own runner, so a pipeline stage never waits on another stage's worker"""
+        tester = copy.copy(self)
+        tester.runner = create_runner(self.runner.name, self.runner.cpu_budget)
+        return tester
+    
+    def run_walks_pipelined(self, windows):
+        """
+        Run walks through hyperopt, backtest and post-processing stages joined by bounded queues.
+        
+        Each stage runs in its own thread, so the multi-core hyperopt of walk k+1 overlaps the
+        single core backtests and charts of walk k. Walks use their own workspaces, so a later
+        hyperopt never overwrites the params an earlier walk is still backtesting with.
+        """
+        backtest_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        post_process_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        walk_results = []
+        stages = [self.stage_tester() for _ in range(3)]
+        
+        def failed_job(window, stage_name, error):
+            print(f"🚨 Walk {window['walk']} {stage_name} stage crashed: {error}")
+            walk_data = self.init_walk_data(window)
+            walk_data['status'] = 'failed_worker'
+            walk_data['failure_reason'] = f'{stage_name.capitalize()} stage crashed: {error}'
+            return {'window': window, 'walk_data': walk_data, 'done': True}
+        
+        def hyperopt_worker():
+            try:
+                for window in windows:
+                    try:
+                        job = stages[0].hyperopt_stage(window)
+                    except Exception as e:
+                        job = failed_job(window, "hyperopt", e)
+                    backtest_queue.put(job)
+            finally:
+                backtest_queue.put(None)
+        
+        def backtest_worker():
+            try:
+                while True:
+                    job = backtest_queue.get()
+                    if job is None:
+                        break
+                    try:
+                        job = stages[1].backtest_stage(job)
+                    except Exception as e:
+                        job = failed_job(job['window'], "backtest", e)
+                    post_process_queue.put(job)
+            finally:
+                post_process_queue.put(None)
+        
+        def post_process_worker():
+            while True:
+                job = post_process_queue.get()
+                if job is None:
+                    break
+                try:
+                    walk_results.append(stages[2].post_process_stage(job))
+                except Exception as e:
+                    walk_results.append(failed_job(job['window'], "post-processing", e)['walk_data'])
+        
+        threads = [threading.Thread(target=worker, name=f"walk-{name}", daemon=True)
+                   for name, worker in [("hyperopt", hyperopt_worker), ("backtest", backtest_worker),
+                                        ("post-process", post_process_worker)]]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for stage in stages:
+                stage.runner.close()
+        
+        return sorted(walk_results, key=lambda w: w['walk_num'])
+    
+    def run_walk_forward_test(self):
+        """Execute the complete walk forward test"""
+        print(f"Starting Walk Forward Test:")
+        print(f"- In-sample period: {self.insample_days} days")
+        print(f"- Out-of-sample period: {self.outsample_days} days")
+        print(f"- Number of walks: {self.num_walks}")
+        print(f"- End date: {self.end_date.strftime('%Y-%m-%d')}")
+        print(f"- Strategy: {self.strategy}")
+        print(f"- Pair: {self.pair}")
+        print(f"- Runner: {self.runner.name}")
+        
+        try:
+            return self.execute_walks()
+        finally:
+            self.runner.close()
+    
+    def execute_walks(self):
+        """Validate inputs, run all walks and save the combined results"""
+        if not self.ensure_data_and_config():
+            print("Configuration validation or data download failed. Exiting.")
+            return False
+        
+        self.clean_backtest_results()
+        self.save_session_settings()
+        
+        if self.extend_from:
+            self.load_reusable_walks()
+        
+        windows = list(self.calculate_windows())
+        
+        if self.parallel_walks > 1:
+            print(f"Running up to {self.parallel_walks} walks in parallel (workspaces in {self.workspace_root})")
+            walk_results = []
+            # Hyperopts of concurrent walks split the CPU budget; ones started when fewer are left get more
+            self.runner.cpu_budget.declare_slots(min(self.parallel_walks, len(windows)))
+            with ProcessPoolExecutor(max_workers=self.parallel_walks) as executor:
+                futures = {executor.submit(run_walk_in_subprocess, self, window): window for window in windows}
+                for future in as_completed(futures):
+                    window = futures[future]
+                    self.runner.cpu_budget.declare_slots(
+                        min(self.parallel_walks, len(windows) - len(walk_results) - 1))
+                    try:
+                        walk_results.append(future.result())
+                    except Exception as e:
+                        print(f"🚨 Walk {window['walk']} crashed: {e}")
+                        walk_data = self.init_walk_data(window)
+                        walk_data['status'] = 'failed_worker'
+                        walk_data['failure_reason'] = f'Walk process crashed: {e}'
+                        walk_results.append(walk_data)
+            self.runner.cpu_budget.declare_slots(0)
             
-            # Store chart generation status
-            walk_data['chart_generation'] = {
-                'is_chart_success': is_chart_success,
-                'oos_chart_success': oos_chart_success
-            }
-            
-            # Mark walk as successful
-            walk_data['status'] = 'completed'
-            
-            # Add walk data to results
-            self.walk_forward_results['walks'].append(walk_data)
+            # Keep walks in chronological order regardless of completion order
+            self.walk_forward_results['walks'].extend(sorted(walk_results, key=lambda w: w['walk_num']))
+        elif self.pipeline and len(windows) > 1:
+            print(f"Pipelining walk stages: hyperopt of the next walk overlaps backtest and charts of the previous one (workspaces in {self.workspace_root})")
+            self.walk_forward_results['walks'].extend(self.run_walks_pipelined(windows))
+        else:
+            for window in windows:
+                self.walk_forward_results['walks'].append(self.run_single_walk(window))
+        
+        self.render_charts()
         
         print(f"\n{'='*60}")
         print("Walk Forward Test completed successfully!")
@@ -932,19 +1537,59 @@ class WalkForwardTester:
         return True
 
 
+def get_data_dir(config_file):
+    """
+    OHLCV data directory of a freqtrade config: its datadir, or user_data/data/<exchange> as
+    freqtrade resolves it. Isolated walk and experiment workspaces pass it as --datadir.
+    """
+    try:
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        config = {}
+
+    if config.get('datadir'):
+        return config['datadir']
+    exchange = config.get('exchange', {}).get('name')
+    if not exchange:
+        raise ValueError(f"{config_file} sets neither datadir nor exchange.name; cannot locate the OHLCV data")
+    return f"user_data/data/{exchange.lower()}"
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temporary file and rename it so readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def run_walk_in_subprocess(tester, window):
+    """Process pool entry point for a single walk"""
+    try:
+        return tester.run_single_walk(window)
+    finally:
+        # The pickled tester started its own runner; stop its worker before the next task
+        tester.runner.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Walk Forward Testing for Freqtrade")
-    parser.add_argument("--insample-days", type=int, required=True,
+    parser.add_argument("--insample-days", type=int, default=None,
                         help="Length in days of in-sample hyperopt period")
-    parser.add_argument("--outsample-days", type=int, required=True,
+    parser.add_argument("--outsample-days", type=int, default=None,
                         help="Length in days of out-of-sample backtest period")
-    parser.add_argument("--num-walks", type=int, required=True,
+    parser.add_argument("--num-walks", type=int, default=None,
                         help="Number of walk forward iterations")
     parser.add_argument("--end-date", type=str, default=None,
                         help="End date in YYYYMMDD format (default: today)")
     parser.add_argument("--pair", type=str, default="BTC/USDT:USDT",
                         help="Trading pair (default: BTC/USDT:USDT)")
-    parser.add_argument("--timeframe", type=str, required=True,
+    parser.add_argument("--timeframe", type=str, default=None,
                         help="Timeframe for analysis (e.g., 1h, 4h, 1d)")
     parser.add_argument("--epochs", type=int, default=200,
                         help="Number of hyperopt epochs (default: 200)")
@@ -958,26 +1603,69 @@ def main():
                         help="Generate HTML analysis report after completion")
     parser.add_argument("--spaces", type=str, nargs='+', default=["buy", "sell"],
                         help="Hyperopt spaces to optimize (default: buy sell)")
+    parser.add_argument("--parallel-walks", type=int, default=1,
+                        help="Number of walks to run concurrently in isolated workspaces (default: 1)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Overlap the next walk's hyperopt with the previous walk's backtest and charts instead "
+                             "of running the stages of consecutive walks strictly one after another")
+    parser.add_argument("--freqtrade-charts", action="store_true",
+                        help="Plot each walk's charts with freqtrade plot-profit instead of drawing all charts "
+                             "at the end from the walks' trades")
+    parser.add_argument("--runner", type=str, choices=RUNNER_BACKENDS, default="docker",
+                        help="How freqtrade is executed: one container per command (docker), a local install (local), "
+                             "or a persistent worker started once per session (docker-worker, local-worker) (default: docker)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always run hyperopt instead of reusing cached results for identical windows")
+    parser.add_argument("--extend", type=str, nargs='?', const="auto", default=None, metavar="SESSION_DIR",
+                        help="Reuse completed walks with unchanged windows from an earlier session with the same settings "
+                             "(default: the latest matching session) and only run the new walks")
+    parser.add_argument("--resume", type=str, default=None, metavar="SESSION_DIR",
+                        help="Resume an interrupted session from walk_forward_results/<timestamp>, skipping completed walks")
     
     args = parser.parse_args()
     
     # Capture original command line for reproducibility
     original_command = f"python3 {' '.join(sys.argv)}"
     
+    settings = {
+        'insample_days': args.insample_days,
+        'outsample_days': args.outsample_days,
+        'num_walks': args.num_walks,
+        'end_date': args.end_date,
+        'pair': args.pair,
+        'timeframe': args.timeframe,
+        'epochs': args.epochs,
+        'hyperopt_loss': args.hyperopt_loss,
+        'strategy': args.strategy,
+        'config': args.config,
+        'spaces': args.spaces,
+        'original_command': original_command
+    }
+    
+    if args.resume:
+        # The walk definition comes from the interrupted session, only execution options can change
+        session_file = Path(args.resume) / "session.json"
+        if not session_file.exists():
+            parser.error(f"{session_file} not found - can only resume sessions started with checkpointing")
+        with open(session_file, 'r') as f:
+            settings.update(json.load(f))
+        print(f"🔄 Resuming session {args.resume}")
+    else:
+        missing = [flag for flag, value in [("--insample-days", args.insample_days), ("--outsample-days", args.outsample_days),
+                                            ("--num-walks", args.num_walks), ("--timeframe", args.timeframe)] if value is None]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+    
     tester = WalkForwardTester(
-        insample_days=args.insample_days,
-        outsample_days=args.outsample_days,
-        num_walks=args.num_walks,
-        end_date=args.end_date,
-        pair=args.pair,
-        timeframe=args.timeframe,
-        epochs=args.epochs,
-        hyperopt_loss=args.hyperopt_loss,
-        strategy=args.strategy,
-        config=args.config,
+        **settings,
         generate_report=args.generate_report,
-        spaces=args.spaces,
-        original_command=original_command
+        parallel_walks=args.parallel_walks,
+        pipeline=args.pipeline,
+        runner=args.runner,
+        resume_dir=args.resume,
+        use_cache=not args.no_cache,
+        extend_from=args.extend,
+        freqtrade_charts=args.freqtrade_charts
     )
     
     success = tester.run_walk_forward_test()